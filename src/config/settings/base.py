@@ -148,9 +148,77 @@ LOGGING = {
 RECEIPIENT_EMAIL_KEY = 'email'
 RECEIPIENT_SMS_KEY = 'phone'
 
+# Number of rows streamed from uploaded files at a time, 0 loads
+# the whole file up front through the parsed upload cache
+MESSENGER_CHUNKSIZE = config('MESSENGER_CHUNKSIZE', default=10000, cast=int)
+
+# Convert uploads that are slow to read, like xlsx, to csv on first read
+MESSENGER_CONVERT_UPLOADS = config(
+    'MESSENGER_CONVERT_UPLOADS', default=True, cast=bool)
+
+# Csv parsing engine, "c" or "pyarrow" for the multi-threaded
+# Arrow reader (needs pyarrow installed, falls back to "c")
+MESSENGER_CSV_ENGINE = config('MESSENGER_CSV_ENGINE', default='c')
+
+# Maximum number of messages sent at the same time
+MESSENGER_CONCURRENCY = config('MESSENGER_CONCURRENCY', default=8, cast=int)
+
+# Send from an asyncio event loop, http email managers then share one
+# aiohttp session and MESSENGER_ASYNC_CONCURRENCY requests are in flight
+MESSENGER_ASYNC = config('MESSENGER_ASYNC', default=False, cast=bool)
+MESSENGER_ASYNC_CONCURRENCY = config(
+    'MESSENGER_ASYNC_CONCURRENCY', default=100, cast=int)
+
+# Keep-alive connections kept open to the email apis, shared by the
+# campaigns of the same api key, and request timeouts in seconds
+EMAIL_API_POOL_SIZE = config(
+    'EMAIL_API_POOL_SIZE', default=MESSENGER_CONCURRENCY, cast=int)
+EMAIL_API_CONNECT_TIMEOUT = config(
+    'EMAIL_API_CONNECT_TIMEOUT', default=5, cast=float)
+EMAIL_API_READ_TIMEOUT = config(
+    'EMAIL_API_READ_TIMEOUT', default=30, cast=float)
+
+# Recipients sent in one email api request, capped at each
+# provider's limit, 1 sends one request per message
+EMAIL_API_BATCH_SIZE = config('EMAIL_API_BATCH_SIZE', default=1000, cast=int)
+
+# Authenticated sessions opened to an SMTP server account at the same
+# time, shared by the campaigns of the account
+SMTP_POOL_SIZE = config('SMTP_POOL_SIZE', default=4, cast=int)
+
+# Recipients of one SMTP transaction when a message without
+# placeholders is sent to many recipients, servers accept at least 100
+SMTP_MAX_RECIPIENTS = config('SMTP_MAX_RECIPIENTS', default=100, cast=int)
+
+# SMTP sessions are reopened after this many messages or seconds idle,
+# before servers drop them over their own limits, 0 for no limit
+SMTP_SESSION_MAX_MESSAGES = config(
+    'SMTP_SESSION_MAX_MESSAGES', default=100, cast=int)
+SMTP_SESSION_MAX_IDLE = config(
+    'SMTP_SESSION_MAX_IDLE', default=60, cast=float)
+
+# Cache of parsed uploads, keyed by file content hash, stored in
+# this directory under MEDIA_ROOT. Only used for uploads loaded whole,
+# when MESSENGER_CHUNKSIZE is 0 or the format cannot be streamed,
+# set the max size to 0 to disable it
+PARSED_UPLOAD_CACHE_DIR = "parsed_cache"
+PARSED_UPLOAD_CACHE_MAX_SIZE = config(
+    'PARSED_UPLOAD_CACHE_MAX_SIZE', default=1024 * 1024 * 1024, cast=int)
+
 TWILIO_SID = config('TWILIO_SID', default='test')
 TWILIO_TOKEN = config('TWILIO_TOKEN', default='test')
 
+# Twilio requests in flight at once for async SMS campaigns
+TWILIO_CONCURRENCY = config('TWILIO_CONCURRENCY', default=50, cast=int)
+
+# Segments per second sent from one number, shared by its campaigns,
+# e.g. 1 for a US long code, 0 leaves queueing to twilio
+TWILIO_NUMBER_RATE = config('TWILIO_NUMBER_RATE', default=0, cast=float)
+
+# Replace characters outside GSM-7, e.g. curly quotes and accented
+# letters, so a message is not sent as UCS-2 with 70 characters a segment
+SMS_TRANSLITERATE = config('SMS_TRANSLITERATE', default=False, cast=bool)
+
 
 QUILL_CONFIGS = {
     'default':{
@@ -1,6 +1,8 @@
 from unittest import TestCase
 
 import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
 
 
 @pytest.fixture
@@ -8,11 +10,30 @@ def testcase():
     return TestCase()
 
 
+def copy_test_file(settings, tmp_path, name):
+    # Readers store artifacts like row indexes next to the file,
+    # tests read a copy so the source tree stays untouched
+    path = tmp_path / name
+    path.write_bytes(
+        (settings.BASE_DIR / 'messenger/tests/files' / name).read_bytes())
+    return path
+
+
 @pytest.fixture
-def excel_test_csv_path(settings):
-    return settings.BASE_DIR / 'messenger/tests/files/test_excel.csv'
+def excel_test_csv_path(settings, tmp_path):
+    return copy_test_file(settings, tmp_path, 'test_excel.csv')
 
 
 @pytest.fixture
-def excel_test_csv_path_error(settings):
-    return settings.BASE_DIR / 'messenger/tests/files/test_csv_no_email.csv'
+def excel_test_csv_path_error(settings, tmp_path):
+    return copy_test_file(settings, tmp_path, 'test_csv_no_email.csv')
+
+
+@pytest.fixture(scope='session')
+def dkim_private_key():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
@@ -9,7 +9,9 @@ from .models import EmailManager, Uploads
 
 
 validator_file_ext = FileExtensionValidator(
-    allowed_extensions=["xls", "gz", "csv", "xlsx"]
+    allowed_extensions=[
+        "xls", "gz", "csv", "xlsx", "bz2", "xz", "zst", "jsonl", "parquet"
+    ]
 )
 validator_start_min = MinValueValidator(limit_value=1)
 validator_stop_min = MinValueValidator(limit_value=1)
@@ -1,7 +1,15 @@
 from django import forms
 import socket
 
-from messenger.email_manager import SendGridEmailManager, SmtpEmailManager, ZeptoEmailManager
+from messenger.dkim import load_private_key
+from messenger.email_manager import (
+    AsyncSendGridEmailManager,
+    AsyncSmtpEmailManager,
+    AsyncZeptoEmailManager,
+    SendGridEmailManager,
+    SmtpEmailManager,
+    ZeptoEmailManager,
+)
 
 
 class ManagerForm(forms.Form):
@@ -19,6 +27,16 @@ class SMTPForm(ManagerForm):
     password = forms.CharField(
         widget=forms.PasswordInput(attrs={"class": "form-control"})
     )
+    # Emails are DKIM signed when both are given
+    dkim_selector = forms.CharField(
+        required=False,
+        widget=forms.TextInput(attrs={"class": "form-control"}),
+    )
+    dkim_private_key = forms.CharField(
+        required=False,
+        strip=False,
+        widget=forms.Textarea(attrs={"class": "form-control", "rows": 4}),
+    )
 
     def clean_host(self):
         host = self.cleaned_data.get("host")
@@ -37,6 +55,25 @@ class SMTPForm(ManagerForm):
             raise forms.ValidationError("Port must be between 1 and 65535.")
         return port
 
+    def clean_dkim_private_key(self):
+        private_key = self.cleaned_data.get("dkim_private_key")
+        if private_key:
+            try:
+                load_private_key(private_key)
+            except TypeError as e:
+                raise forms.ValidationError(str(e))
+        return private_key
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if bool(cleaned_data.get("dkim_selector")) != bool(
+            cleaned_data.get("dkim_private_key")
+        ):
+            raise forms.ValidationError(
+                "DKIM signing needs both a selector and a private key."
+            )
+        return cleaned_data
+
 
 class ApiKeyForm(ManagerForm):
     api_key = forms.CharField(widget=forms.TextInput(attrs={"class": "form-control"}))
@@ -52,13 +89,16 @@ MANAGER_CONFIG = {
     "sendgrid": {
         "form": ApiKeyForm,
         "manager": SendGridEmailManager,
+        "async_manager": AsyncSendGridEmailManager,
     },
     "zepto": {
         "form": ApiKeyForm,
         "manager": ZeptoEmailManager,
+        "async_manager": AsyncZeptoEmailManager,
     },
     "smtp": {
         "form": SMTPForm,
-        "manager": SmtpEmailManager
+        "manager": SmtpEmailManager,
+        "async_manager": AsyncSmtpEmailManager,
     },
 }
@@ -37,10 +37,14 @@ class EmailManager(models.Model):
             }
         )
 
-    def get_email_manager(self, sender: str, email_domain: str, reply_to: str) -> BaseEmailManager:
-        email_manager: BaseEmailManager = MANAGER_CONFIG.get(self.mail_manager).get(
-            "manager"
-        )
+    def get_email_manager(
+        self, sender: str, email_domain: str, reply_to: str, use_async: bool = False
+    ) -> BaseEmailManager:
+        manager_config = MANAGER_CONFIG.get(self.mail_manager)
+        # Managers without an async version are run in threads
+        email_manager: BaseEmailManager = manager_config.get("manager")
+        if use_async:
+            email_manager = manager_config.get("async_manager", email_manager)
         return email_manager(
             **self.config,
             sender=f"{sender}@{email_domain}",
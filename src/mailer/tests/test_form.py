@@ -1,5 +1,6 @@
 import pytest
 from mailer.forms import MailForm
+from mailer.mail_manager import SMTPForm
 from mailer.models import Uploads
 
 
@@ -68,3 +69,37 @@ def test_save_files(mail_form_data: dict):
     assert valid is True
     obj = form.save()
     assert obj.file.name == 'test_file.csv'
+
+
+@pytest.fixture
+def smtp_form_data():
+    return {
+        'host': 'localhost',
+        'port': 587,
+        'username': 'user',
+        'password': 'password',
+    }
+
+
+def test_smtp_form_dkim(smtp_form_data, dkim_private_key):
+    form = SMTPForm(data={
+        **smtp_form_data,
+        'dkim_selector': 'mail',
+        'dkim_private_key': dkim_private_key,
+    })
+    assert form.is_valid(), form.errors
+    assert form.cleaned_data['dkim_private_key'] == dkim_private_key
+
+
+def test_smtp_form_without_dkim(smtp_form_data):
+    form = SMTPForm(data=smtp_form_data)
+    assert form.is_valid(), form.errors
+
+
+@pytest.mark.parametrize('dkim', [
+    {'dkim_selector': 'mail'},
+    {'dkim_selector': 'mail', 'dkim_private_key': 'not a key'},
+])
+def test_smtp_form_dkim_errors(smtp_form_data, dkim):
+    form = SMTPForm(data={**smtp_form_data, **dkim})
+    assert not form.is_valid()
@@ -1,8 +1,13 @@
+import json
+from pathlib import Path
 from typing import TypeVar
 
+import pandas as pd
 import pytest
 from django.test.client import Client
 from django.urls import reverse
+from mailer.views import Dashboard
+from messenger.email_manager import BaseEmailManager
 
 T = TypeVar('T', bound=Client)
 
@@ -48,3 +53,51 @@ def test_home_exception_handler(
     messages = list(response.context['messages'])
     assert len(messages) == 1
     assert str(messages[0]) == 'Email column not in file'
+
+
+@pytest.mark.parametrize('file_name', ['test_file.csv', 'test_file.xlsx'])
+@pytest.mark.parametrize('chunksize', [0, 1])
+def test_create_messenger_upload_cache(
+    rf, settings, monkeypatch, tmp_path, excel_test_csv_path, file_name,
+    chunksize
+):
+    settings.MEDIA_ROOT = tmp_path / 'media'
+    settings.MESSENGER_CHUNKSIZE = chunksize
+    data = pd.read_csv(excel_test_csv_path, dtype=str)
+    upload_path = tmp_path / file_name
+    if upload_path.suffix == '.xlsx':
+        data.to_excel(upload_path, index=False)
+    else:
+        data.to_csv(upload_path, index=False)
+    monkeypatch.setattr(
+        Dashboard, 'create_sender_manager',
+        lambda self, data: BaseEmailManager(sender='test@example.com'))
+    view = Dashboard()
+    view.setup(rf.post(reverse('mailer:home')))
+    messenger = view.create_messenger(upload_path, {
+        'start': 1,
+        'stop': 2,
+        'email_key': 'email',
+        'content': json.dumps({'html': 'hello _first_name_'}),
+    })
+    messenger.load_data()
+    assert messenger.is_streaming() == bool(chunksize)
+    assert messenger.get_row_count() == (2 if chunksize else 4)
+    chunks = list(messenger.iter_chunks())
+    usecols = ['first_name', 'email']
+    pd.testing.assert_frame_equal(
+        pd.concat(chunks), data[usecols].loc[0:1])
+    cache_dir = Path(settings.MEDIA_ROOT) / settings.PARSED_UPLOAD_CACHE_DIR
+    entries = list(cache_dir.glob('*.feather'))
+    if chunksize:
+        # Streamed uploads are never loaded whole
+        assert entries == []
+    else:
+        entry, = entries
+        pd.testing.assert_frame_equal(
+            pd.read_feather(entry), data[usecols])
+
+
+def test_create_upload_cache_disabled(settings):
+    settings.PARSED_UPLOAD_CACHE_MAX_SIZE = 0
+    assert Dashboard().create_upload_cache() is None
@@ -1,5 +1,6 @@
 import json
 import os
+from pathlib import Path
 from typing import Any
 from django.conf import settings
 
@@ -8,11 +9,13 @@ from django.shortcuts import redirect
 from django.views.generic import TemplateView, ListView
 from mailer.mail_manager import MANAGER_CONFIG
 from mailer.models import EmailManager
-from messenger.sms_manager import SmsManager
-from messenger.messager import ExcelMessenger
+from messenger.cache import ParsedUploadCache
+from messenger.sms_manager import AsyncSmsManager, SmsManager
+from messenger.messager import AsyncExcelMessenger, ExcelMessenger
 from messenger.messsage_manager import HtmlMessageManager
+from messenger.readers import delete_artifacts
 from utils.general import count_true_in_iter
-from utils.loggers import err_logger  # noqa
+from utils.loggers import err_logger, logger  # noqa
 
 from .forms import EmailManagerConfigForm, MailForm
 
@@ -35,6 +38,17 @@ class Dashboard(TemplateView):
         context["form"] = MailForm()
         return context
 
+    def get_message(self, data: dict) -> str:
+        """
+        Get message to be sent
+
+        :param data: form cleaned data
+        :type data: dict
+        :return: message
+        :rtype: str
+        """
+        return json.loads(data.get("content")).get("html")
+
     def get_message_context(self, data: dict):
         """
         Get message context
@@ -74,7 +88,23 @@ class Dashboard(TemplateView):
         reply_to = data.get("reply_to")
         email_domain = data.get("email_domain")
         mail_manager = data.get("mail_manager")
-        return mail_manager.get_email_manager(sender, email_domain, reply_to)
+        return mail_manager.get_email_manager(
+            sender, email_domain, reply_to, use_async=settings.MESSENGER_ASYNC
+        )
+
+    def create_upload_cache(self):
+        """
+        Create cache of parsed uploads, None when it is disabled
+
+        :return: parsed upload cache
+        :rtype: Optional[ParsedUploadCache]
+        """
+        if settings.PARSED_UPLOAD_CACHE_MAX_SIZE <= 0:
+            return None
+        return ParsedUploadCache(
+            directory=Path(settings.MEDIA_ROOT) / settings.PARSED_UPLOAD_CACHE_DIR,
+            max_size=settings.PARSED_UPLOAD_CACHE_MAX_SIZE,
+        )
 
     def create_messenger(self, file_path: str, data: dict):
         """
@@ -89,11 +119,22 @@ class Dashboard(TemplateView):
         """
         start = data.get("start")
         stop = data.get("stop")
-        messenger = ExcelMessenger(
+        messenger_class = ExcelMessenger
+        concurrency = settings.MESSENGER_CONCURRENCY
+        if settings.MESSENGER_ASYNC:
+            messenger_class = AsyncExcelMessenger
+            concurrency = settings.MESSENGER_ASYNC_CONCURRENCY
+        messenger = messenger_class(
             start=start,
             stop=stop,
             file_path=file_path,
             recipient_field=data.get("email_key"),
+            chunksize=settings.MESSENGER_CHUNKSIZE or None,
+            cache=self.create_upload_cache(),
+            message=self.get_message(data),
+            convert=settings.MESSENGER_CONVERT_UPLOADS,
+            engine=settings.MESSENGER_CSV_ENGINE,
+            concurrency=concurrency,
         )
         messenger.set_sender_manager(self.create_sender_manager(data))
         messenger.set_message_manager(self.create_message_manager(data))
@@ -109,7 +150,7 @@ class Dashboard(TemplateView):
             obj = form.save()
 
             subject = form.cleaned_data.get("subject")
-            message = json.loads(form.cleaned_data.get("content")).get("html")
+            message = self.get_message(form.cleaned_data)
             start = form.cleaned_data.get("start")
             stop = form.cleaned_data.get("stop")
 
@@ -150,6 +191,7 @@ class Dashboard(TemplateView):
 
             obj.delete()
             os.remove(file_path)
+            delete_artifacts(file_path)
             if completed:
                 return redirect(self.request.get_full_path())
 
@@ -174,6 +216,29 @@ class SmsDashboard(Dashboard):
             "subject": data.get("subject"),
         }
 
+    def create_messenger(self, file_path: str, data: dict):
+        """
+        Create messenger and report the billable segments of the
+        campaign and how long it takes to send them from the sender
+        number. Every row is rendered once more for the report.
+
+        :param file_path: path to excel file
+        :type file_path: str
+        :param data: form cleaned data
+        :type data: dict
+        :return: messenger
+        :rtype: ExcelMessenger
+        """
+        messenger = super().create_messenger(file_path, data)
+        report = messenger.plan_segments(
+            self.get_message(data),
+            transliterated=settings.SMS_TRANSLITERATE,
+            rate=settings.TWILIO_NUMBER_RATE,
+        )
+        logger.info(f"SMS campaign: {report}")
+        messages.info(self.request, str(report))
+        return messenger
+
     def create_sender_manager(self, data: dict):
         """
         Create sender manager
@@ -184,7 +249,11 @@ class SmsDashboard(Dashboard):
         :rtype: SmsManager
         """
         sender = data.get("sender")
-        return SmsManager(
+        # Managers without an async version are run in threads
+        sms_manager = SmsManager
+        if settings.MESSENGER_ASYNC:
+            sms_manager = AsyncSmsManager
+        return sms_manager(
             sid=settings.TWILIO_SID,
             token=settings.TWILIO_TOKEN,
             sender=sender,
@@ -0,0 +1,418 @@
+"""
+Asyncio SMTP client and session pool
+"""
+
+import asyncio
+import base64
+import re
+import smtplib
+import ssl
+import time
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Tuple
+
+from utils.loggers import logger
+
+from .smtp import is_disconnect
+
+CRLF = b'\r\n'
+PERIODS = re.compile(rb'(?m)^\.')
+
+
+class AsyncSmtpClient:
+    """
+    SMTP session driven by an asyncio event loop.
+
+    Supports implicit TLS on port 465, STARTTLS, AUTH PLAIN and LOGIN,
+    and sends MAIL, RCPT and DATA in one round trip when the server
+    supports PIPELINING. Errors are raised as the `smtplib` exceptions,
+    so they are handled the same way as for `EmailConnection`.
+    """
+
+    def __init__(
+        self, host: str, port: int, username: str, password: str,
+        use_tls: bool = True, timeout: float = 60,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self.context = ssl.create_default_context()
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.extensions: Dict[str, str] = {}
+        self.sent = 0
+        self.last_used = time.monotonic()
+
+    async def read_reply(self) -> Tuple[int, str]:
+        """
+        Read a possibly multiline reply
+
+        :raises smtplib.SMTPServerDisconnected: Connection closed
+        :return: reply code and text
+        :rtype: Tuple[int, str]
+        """
+        if self.reader is None:
+            raise smtplib.SMTPServerDisconnected('Not connected')
+        lines = []
+        while True:
+            line = await asyncio.wait_for(
+                self.reader.readline(), self.timeout)
+            if not line:
+                self.abort()
+                raise smtplib.SMTPServerDisconnected(
+                    'Connection unexpectedly closed')
+            lines.append(line[4:].strip().decode('utf-8', 'replace'))
+            if line[3:4] != b'-':
+                break
+        try:
+            code = int(line[:3])
+        except ValueError:
+            code = -1
+        return code, '\n'.join(lines)
+
+    async def write(self, data: bytes) -> None:
+        if self.writer is None:
+            raise smtplib.SMTPServerDisconnected('Not connected')
+        self.writer.write(data)
+        await self.writer.drain()
+
+    async def command(self, line: str) -> Tuple[int, str]:
+        """
+        Send a command and read its reply
+
+        :param line: command without the line ending
+        :type line: str
+        :return: reply code and text
+        :rtype: Tuple[int, str]
+        """
+        await self.write(line.encode('utf-8') + CRLF)
+        return await self.read_reply()
+
+    async def ehlo(self) -> None:
+        code, text = await self.command('EHLO localhost')
+        if code != 250:
+            raise smtplib.SMTPHeloError(code, text)
+        self.extensions = {}
+        for line in text.split('\n')[1:]:
+            name, _, params = line.partition(' ')
+            self.extensions[name.lower()] = params
+
+    async def connect(self) -> 'AsyncSmtpClient':
+        """
+        Open the session and log in
+
+        :return: connected client
+        :rtype: AsyncSmtpClient
+        """
+        logger.info("Connecting to the email server")
+        implicit_tls = self.port == 465
+        self.reader, self.writer = await asyncio.wait_for(
+            asyncio.open_connection(
+                self.host, self.port,
+                ssl=self.context if implicit_tls else None,
+            ),
+            self.timeout,
+        )
+        try:
+            code, text = await self.read_reply()
+            if code != 220:
+                raise smtplib.SMTPConnectError(code, text)
+            await self.ehlo()
+            if self.use_tls and not implicit_tls:
+                if 'starttls' not in self.extensions:
+                    raise smtplib.SMTPNotSupportedError(
+                        'STARTTLS extension not supported by server.')
+                code, text = await self.command('STARTTLS')
+                if code != 220:
+                    raise smtplib.SMTPResponseException(code, text)
+                await self.writer.start_tls(
+                    self.context, server_hostname=self.host)
+                await self.ehlo()
+            logger.info("Logging into the email server")
+            await self.login()
+        except BaseException:
+            # The session never got usable, do not leak its socket
+            self.abort()
+            raise
+        logger.info("Successfully logged in")
+        self.sent = 0
+        self.last_used = time.monotonic()
+        return self
+
+    async def login(self) -> None:
+        methods = self.extensions.get('auth', '').upper().split()
+        if 'PLAIN' in methods or 'LOGIN' not in methods:
+            token = base64.b64encode(
+                f'\0{self.username}\0{self.password}'.encode()).decode()
+            code, text = await self.command(f'AUTH PLAIN {token}')
+        else:
+            code, text = await self.command('AUTH LOGIN')
+            for value in (self.username, self.password):
+                if code != 334:
+                    break
+                code, text = await self.command(
+                    base64.b64encode(value.encode()).decode())
+        if code not in (235, 503):
+            raise smtplib.SMTPAuthenticationError(code, text)
+
+    async def sendmail(
+        self, sender: str, recipients: List[str], data: bytes
+    ) -> Dict[str, Tuple[int, str]]:
+        """
+        Send a serialized email, with CRLF line endings
+
+        :param sender: envelope sender
+        :type sender: str
+        :param recipients: envelope recipients
+        :type recipients: List[str]
+        :param data: email
+        :type data: bytes
+        :raises smtplib.SMTPSenderRefused: Sender refused
+        :raises smtplib.SMTPRecipientsRefused: All recipients refused
+        :raises smtplib.SMTPDataError: Email refused
+        :return: refused recipients, like `smtplib.SMTP.sendmail`
+        :rtype: Dict[str, Tuple[int, str]]
+        """
+        if isinstance(recipients, str):
+            recipients = [recipients]
+        commands = [f'MAIL FROM:<{sender}>'] + [
+            f'RCPT TO:<{recipient}>' for recipient in recipients
+        ] + ['DATA']
+        if 'pipelining' in self.extensions:
+            await self.write(b''.join(
+                command.encode('utf-8') + CRLF for command in commands))
+            replies = [await self.read_reply() for _ in commands]
+        else:
+            replies = []
+            for command in commands:
+                replies.append(await self.command(command))
+                if command != 'DATA' and replies[0][0] != 250:
+                    break
+        code, text = replies[0]
+        if code != 250:
+            if code == 421:
+                self.abort()
+            else:
+                await self.reset()
+            raise smtplib.SMTPSenderRefused(code, text, sender)
+        refused = {
+            recipient: reply
+            for recipient, reply in zip(recipients, replies[1:-1])
+            if reply[0] not in (250, 251)
+        }
+        code, text = replies[-1]
+        if len(refused) == len(recipients):
+            if code == 354:
+                # Nothing to deliver, end the empty message
+                await self.write(b'.' + CRLF)
+                await self.read_reply()
+            await self.reset()
+            raise smtplib.SMTPRecipientsRefused(refused)
+        if code != 354:
+            await self.reset()
+            raise smtplib.SMTPDataError(code, text)
+        data = PERIODS.sub(b'..', data)
+        if not data.endswith(CRLF):
+            data += CRLF
+        await self.write(data + b'.' + CRLF)
+        code, text = await self.read_reply()
+        if code != 250:
+            if code == 421:
+                self.abort()
+            else:
+                await self.reset()
+            raise smtplib.SMTPDataError(code, text)
+        self.sent += 1
+        self.last_used = time.monotonic()
+        return refused
+
+    async def reset(self) -> None:
+        try:
+            await self.command('RSET')
+        except smtplib.SMTPServerDisconnected:
+            pass
+
+    async def is_alive(self) -> bool:
+        """
+        Check the session with a NOOP command
+
+        :return: True if the server answered
+        :rtype: bool
+        """
+        if self.writer is None:
+            return False
+        try:
+            return (await self.command('NOOP'))[0] == 250
+        except (smtplib.SMTPException, OSError, asyncio.TimeoutError):
+            return False
+
+    def abort(self) -> None:
+        """
+        Close the socket without quitting the session
+        """
+        writer, self.writer, self.reader = self.writer, None, None
+        if writer is not None:
+            writer.close()
+
+    async def close(self) -> None:
+        """
+        Quit the session, the socket is closed even if the server
+        does not answer
+        """
+        if self.writer is None:
+            return
+        try:
+            await self.command('QUIT')
+        except (smtplib.SMTPException, OSError, asyncio.TimeoutError):
+            pass
+        self.abort()
+
+
+class AsyncSmtpPool:
+    """
+    Pool of `AsyncSmtpClient` sessions to one server account, the async
+    counterpart of `SmtpConnectionPool`. At most `size` sessions are
+    open at a time, sessions are recycled after `max_messages` messages
+    or `max_idle` seconds without use and checked with a NOOP when idle
+    for more than `check_after` seconds.
+
+    The sessions belong to the event loop they were opened in, the pool
+    is closed at the end of each run.
+    """
+
+    check_after = 5
+
+    def __init__(
+        self, host: str, port: int, username: str, password: str,
+        size: int = 1, use_tls: bool = True,
+        max_messages: int = None, max_idle: float = None,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.size = size
+        self.use_tls = use_tls
+        self.max_messages = max_messages
+        self.max_idle = max_idle
+        self.idle: List[AsyncSmtpClient] = []
+        self.slots: Optional[asyncio.Semaphore] = None
+
+    def is_expired(self, client: AsyncSmtpClient) -> bool:
+        if self.max_messages and client.sent >= self.max_messages:
+            return True
+        idle = time.monotonic() - client.last_used
+        return bool(self.max_idle) and idle >= self.max_idle
+
+    async def is_usable(self, client: AsyncSmtpClient) -> bool:
+        if client.writer is None or self.is_expired(client):
+            return False
+        if time.monotonic() - client.last_used < self.check_after:
+            return True
+        return await client.is_alive()
+
+    async def acquire(self) -> AsyncSmtpClient:
+        """
+        Check out a connected session, waits for one to be released
+        when `size` sessions are checked out
+
+        :return: connected session
+        :rtype: AsyncSmtpClient
+        """
+        if self.slots is None:
+            self.slots = asyncio.Semaphore(self.size)
+        await self.slots.acquire()
+        try:
+            while self.idle:
+                client = self.idle.pop()
+                if await self.is_usable(client):
+                    return client
+                await client.close()
+            client = AsyncSmtpClient(
+                self.host, self.port, self.username, self.password,
+                use_tls=self.use_tls,
+            )
+            return await client.connect()
+        except BaseException:
+            self.slots.release()
+            raise
+
+    async def release(self, client: AsyncSmtpClient) -> None:
+        if self.max_messages and client.sent >= self.max_messages:
+            await self.discard(client)
+            return
+        self.idle.append(client)
+        self.slots.release()
+
+    async def discard(self, client: AsyncSmtpClient) -> None:
+        try:
+            await client.close()
+        finally:
+            self.slots.release()
+
+    async def run(
+        self, func: Callable[[AsyncSmtpClient], Coroutine],
+        retries: int = 1,
+    ) -> Any:
+        """
+        Await func with a pooled session, when the server dropped the
+        session func is awaited again with a new session
+
+        :param func: coroutine function sending with the session
+        :type func: Callable[[AsyncSmtpClient], Coroutine]
+        :param retries: times func is awaited again after a dropped
+            session, defaults to 1
+        :type retries: int, optional
+        :return: result of func
+        :rtype: Any
+        """
+        for attempt in range(retries + 1):
+            client = await self.acquire()
+            try:
+                result = await func(client)
+            except Exception as e:
+                dropped = is_disconnect(e) or isinstance(
+                    e, asyncio.TimeoutError)
+                if dropped:
+                    await self.discard(client)
+                else:
+                    await self.release(client)
+                if attempt == retries or not dropped:
+                    raise
+                logger.info("Session dropped, sending again")
+                continue
+            except BaseException:
+                # Cancelled in the middle of a transaction, the session
+                # cannot be reused nor quit cleanly
+                client.abort()
+                self.slots.release()
+                raise
+            await self.release(client)
+            return result
+
+    async def sendmail(
+        self, sender: str, recipients: List[str], data: bytes,
+        retries: int = 1,
+    ) -> Dict[str, Tuple[int, str]]:
+        """
+        Send a serialized email with a pooled session,
+        see `AsyncSmtpClient.sendmail`
+
+        :return: refused recipients
+        :rtype: Dict[str, Tuple[int, str]]
+        """
+        return await self.run(
+            lambda client: client.sendmail(sender, recipients, data),
+            retries=retries,
+        )
+
+    async def close(self) -> None:
+        """
+        Close the idle sessions
+        """
+        idle, self.idle = self.idle, []
+        for client in idle:
+            await client.close()
+        self.slots = None
@@ -0,0 +1,138 @@
+"""
+Attachments encoded once per campaign
+"""
+
+import base64
+from email.mime.base import MIMEBase
+from typing import Iterable, Optional, Tuple, Union
+
+
+class PreparedAttachment:
+    """
+    Attachment base64 encoded once and shared by every message of a
+    campaign.
+
+    Only the base64 text is kept, api payloads embed it as it is and
+    smtp messages are serialized once per campaign from a MIME part
+    built on demand. The raw data is decoded on demand too, so a large
+    attachment is held once instead of in every form. The text is
+    never modified after, so one instance can be used by all the
+    sends, including sends from many threads.
+    """
+
+    __slots__ = ('__filename', '__mime_type', '__content', '__size')
+
+    def __init__(
+        self, filename: str, data: bytes,
+        mime_type: str = 'application/octet-stream'
+    ) -> None:
+        """
+        Encode the attachment
+
+        :param filename: file name
+        :type filename: str
+        :param data: file content
+        :type data: bytes
+        :param mime_type: mime type of the file,
+            defaults to 'application/octet-stream'
+        :type mime_type: str, optional
+        """
+        self.__filename = filename
+        self.__mime_type = mime_type
+        self.__size = len(data)
+        # Ascii str is stored one byte per character
+        self.__content = base64.b64encode(data).decode('ascii')
+
+    def create_part(self) -> MIMEBase:
+        """
+        Creates the MIME part of the attachment from the encoded content
+
+        :return: MIME part
+        :rtype: MIMEBase
+        """
+        part = MIMEBase('application', 'octet-stream')
+        part['Content-Transfer-Encoding'] = 'base64'
+        part.set_payload('\n'.join(
+            self.__content[index:index + 76]
+            for index in range(0, len(self.__content), 76)
+        ) + '\n')
+        part.add_header(
+            'Content-Disposition',
+            f'attachment; filename= {self.__filename}',
+        )
+        return part
+
+    def get_filename(self) -> str:
+        """
+        Returns the file name
+
+        :return: file name
+        :rtype: str
+        """
+        return self.__filename
+
+    def get_mime_type(self) -> str:
+        """
+        Returns the mime type
+
+        :return: mime type
+        :rtype: str
+        """
+        return self.__mime_type
+
+    def get_data(self) -> bytes:
+        """
+        Returns the file content, decoded from the base64 content
+
+        :return: file content
+        :rtype: bytes
+        """
+        return base64.b64decode(self.__content)
+
+    def get_content(self) -> str:
+        """
+        Returns the base64 encoded file content
+
+        :return: base64 content
+        :rtype: str
+        """
+        return self.__content
+
+    def get_part(self) -> MIMEBase:
+        """
+        Returns a new MIME part of the attachment
+
+        :return: MIME part
+        :rtype: MIMEBase
+        """
+        return self.create_part()
+
+    def __len__(self) -> int:
+        return self.__size
+
+
+def prepare_attachments(
+    attachments: Optional[Iterable[Union[dict, PreparedAttachment]]]
+) -> Tuple[PreparedAttachment, ...]:
+    """
+    Prepares attachments given as dictionaries of the form
+    {"filename": str, "data": bytes, "mime_type": str}, attachments
+    that are already prepared are kept as they are
+
+    :param attachments: attachments to prepare
+    :type attachments: Optional[Iterable[Union[dict, PreparedAttachment]]]
+    :return: prepared attachments
+    :rtype: Tuple[PreparedAttachment, ...]
+    """
+    if not attachments:
+        return ()
+    return tuple(
+        attachment if isinstance(attachment, PreparedAttachment)
+        else PreparedAttachment(
+            filename=attachment['filename'],
+            data=attachment['data'],
+            mime_type=attachment.get(
+                'mime_type', 'application/octet-stream'),
+        )
+        for attachment in attachments
+    )
@@ -0,0 +1,124 @@
+"""
+Cache of parsed upload files
+"""
+
+import os
+import uuid
+from pathlib import Path
+from typing import Optional, Type
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+
+class ParsedUploadCache:
+    """
+    Size bounded cache of parsed uploads keyed by file content hash.
+
+    Dataframes are stored as Arrow IPC (feather) files, a compact
+    columnar format that loads much faster than parsing the original
+    xlsx or csv file and is read without unpickling anything. Entries
+    are evicted least recently used first once the cache grows past
+    `max_size` bytes. Needs pyarrow installed.
+    """
+
+    suffix = '.feather'
+
+    def __init__(self, directory: Type[Path], max_size: int) -> None:
+        self.__directory = Path(directory)
+        self.__max_size = max_size
+
+    def get_directory(self) -> Type[Path]:
+        """
+        Returns the cache directory
+
+        :return: cache directory
+        :rtype: Type[Path]
+        """
+        return self.__directory
+
+    def get_max_size(self) -> int:
+        """
+        Returns the maximum size of the cache in bytes
+
+        :return: maximum size
+        :rtype: int
+        """
+        return self.__max_size
+
+    def get_path(self, key: str) -> Type[Path]:
+        """
+        Returns the path of a cache entry
+
+        :param key: cache key
+        :type key: str
+        :return: entry path
+        :rtype: Type[Path]
+        """
+        return self.get_directory() / f'{key}{self.suffix}'
+
+    def get(self, key: str) -> Optional[DataFrame]:
+        """
+        Returns the cached dataframe, None on a miss
+
+        :param key: cache key
+        :type key: str
+        :return: cached dataframe
+        :rtype: Optional[DataFrame]
+        """
+        path = self.get_path(key)
+        try:
+            data = pd.read_feather(path)
+            # Mark entry as recently used
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        # Arrow nulls are read back as None
+        return data.where(data.notna(), np.nan)
+
+    def set(self, key: str, data: DataFrame) -> None:
+        """
+        Stores the dataframe in the cache and evicts old entries.
+        Dataframes with column names that are not strings, e.g. from
+        a sheet with a numeric header, are not stored.
+
+        :param key: cache key
+        :type key: str
+        :param data: parsed dataframe
+        :type data: DataFrame
+        """
+        if not all(isinstance(column, str) for column in data.columns):
+            return
+        self.get_directory().mkdir(parents=True, exist_ok=True)
+        tmp_path = self.get_directory() / f'.{uuid.uuid4().hex}.tmp'
+        data.reset_index(drop=True).to_feather(tmp_path)
+        os.replace(tmp_path, self.get_path(key))
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Deletes the least recently used entries until the cache
+        is within its maximum size
+        """
+        entries = []
+        for path in self.get_directory().glob(f'*{self.suffix}'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        entries.sort()
+        size = sum(entry[1] for entry in entries)
+        for _, entry_size, path in entries:
+            if size <= self.get_max_size():
+                break
+            path.unlink(missing_ok=True)
+            size -= entry_size
+
+    def clear(self) -> None:
+        """
+        Deletes every entry in the cache
+        """
+        for path in self.get_directory().glob(f'*{self.suffix}'):
+            path.unlink(missing_ok=True)
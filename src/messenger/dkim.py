@@ -0,0 +1,210 @@
+"""
+DKIM signing of serialized emails
+"""
+
+import base64
+import hashlib
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+
+CRLF = b'\r\n'
+WSP = re.compile(rb'[ \t]+')
+FOLD = re.compile(rb'\r\n(?=[ \t])')
+SIGNED_HEADERS = (
+    'from', 'reply-to', 'subject', 'date', 'to', 'cc', 'message-id',
+    'mime-version', 'content-type',
+)
+
+
+def load_private_key(private_key: str | bytes) -> rsa.RSAPrivateKey:
+    """
+    Loads a PEM encoded RSA private key
+
+    :param private_key: PEM key, PKCS#1 or PKCS#8
+    :type private_key: str | bytes
+    :raises TypeError: Not an RSA private key
+    :return: private key
+    :rtype: rsa.RSAPrivateKey
+    """
+    if isinstance(private_key, str):
+        private_key = private_key.encode()
+    try:
+        key = serialization.load_pem_private_key(
+            private_key.strip(), password=None)
+    except ValueError as e:
+        raise TypeError(f'Invalid DKIM private key: {e}') from e
+    if not isinstance(key, rsa.RSAPrivateKey):
+        raise TypeError('DKIM private key must be an RSA key')
+    return key
+
+
+def relaxed_header(field: bytes) -> bytes:
+    """
+    Canonicalizes a header field with the relaxed algorithm of RFC 6376
+
+    :param field: raw header field, folded lines included
+    :type field: bytes
+    :return: canonical header field ending with CRLF
+    :rtype: bytes
+    """
+    name, _, value = field.partition(b':')
+    value = WSP.sub(b' ', FOLD.sub(b'', value.rstrip(CRLF)))
+    return name.strip().lower() + b':' + value.strip(b' ') + CRLF
+
+
+def simple_body(body: bytes) -> bytes:
+    """
+    Canonicalizes a CRLF body with the simple algorithm of RFC 6376
+
+    :param body: body
+    :type body: bytes
+    :return: body ending with a single CRLF
+    :rtype: bytes
+    """
+    return body.rstrip(CRLF) + CRLF
+
+
+def split_headers(header: bytes) -> List[bytes]:
+    """
+    Splits a CRLF header block into fields, continuation lines stay
+    with their field
+
+    :param header: header block
+    :type header: bytes
+    :return: header fields
+    :rtype: List[bytes]
+    """
+    fields = []
+    for line in header.split(CRLF):
+        if line[:1] in (b' ', b'\t') and fields:
+            fields[-1] += CRLF + line
+        elif line:
+            fields.append(line)
+    return fields
+
+
+class DkimSigner:
+    """
+    Signs emails with rsa-sha256 and relaxed/simple canonicalization.
+
+    The key is loaded once, canonical header fields are cached by their
+    raw bytes so the headers shared by the emails of a campaign are
+    canonicalized once, and the body hash of the last body is kept for
+    emails sent with the same body.
+    """
+
+    max_cached_headers = 1024
+
+    def __init__(
+        self, domain: str, selector: str, private_key: str | bytes,
+        signed_headers: Tuple[str, ...] = SIGNED_HEADERS,
+    ) -> None:
+        """
+        :param domain: signing domain, the d= tag
+        :type domain: str
+        :param selector: selector of the public key record, the s= tag
+        :type selector: str
+        :param private_key: PEM encoded RSA private key
+        :type private_key: str | bytes
+        :param signed_headers: names of the headers signed when
+            present, defaults to SIGNED_HEADERS
+        :type signed_headers: Tuple[str, ...], optional
+        """
+        self.__domain = domain
+        self.__selector = selector
+        self.__key = load_private_key(private_key)
+        self.__signed_headers = tuple(
+            name.lower() for name in signed_headers)
+        self.__headers: Dict[bytes, bytes] = {}
+        self.__body: Optional[Tuple[bytes, bytes]] = None
+
+    def get_domain(self) -> str:
+        return self.__domain
+
+    def get_selector(self) -> str:
+        return self.__selector
+
+    def canonical_header(self, field: bytes) -> bytes:
+        canonical = self.__headers.get(field)
+        if canonical is None:
+            if len(self.__headers) >= self.max_cached_headers:
+                self.__headers.clear()
+            canonical = self.__headers[field] = relaxed_header(field)
+        return canonical
+
+    def body_hash(self, body: bytes) -> bytes:
+        """
+        Returns the base64 sha256 hash of the canonical body
+
+        :param body: body
+        :type body: bytes
+        :return: body hash, the bh= tag
+        :rtype: bytes
+        """
+        if self.__body is not None and self.__body[0] == body:
+            return self.__body[1]
+        digest = base64.b64encode(
+            hashlib.sha256(simple_body(body)).digest())
+        self.__body = (body, digest)
+        return digest
+
+    def sign(self, data: bytes) -> bytes:
+        """
+        Adds a DKIM-Signature header to a serialized email
+
+        :param data: email with CRLF line endings
+        :type data: bytes
+        :return: signed email
+        :rtype: bytes
+        """
+        header, separator, body = data.partition(CRLF + CRLF)
+        if not separator:
+            header, body = data, b''
+        fields: Dict[str, List[bytes]] = {}
+        for field in split_headers(header):
+            name = field.split(b':', 1)[0].strip().lower().decode()
+            fields.setdefault(name, []).append(field)
+        names, signed = [], []
+        for name in self.__signed_headers:
+            # Repeated headers are signed from the bottom up
+            for field in reversed(fields.get(name, ())):
+                names.append(name)
+                signed.append(self.canonical_header(field))
+        signature = (
+            b'DKIM-Signature: v=1; a=rsa-sha256; c=relaxed/simple;\r\n'
+            b'\td=' + self.__domain.encode() +
+            b'; s=' + self.__selector.encode() + b';\r\n'
+            b'\th=' + ':'.join(names).encode() + b';\r\n'
+            b'\tbh=' + self.body_hash(body) + b';\r\n'
+            b'\tb='
+        )
+        signed.append(relaxed_header(signature).rstrip(CRLF))
+        value = base64.b64encode(self.__key.sign(
+            b''.join(signed), padding.PKCS1v15(), hashes.SHA256()))
+        folded = b'\r\n\t'.join(
+            value[i:i + 72] for i in range(0, len(value), 72))
+        return signature + folded + CRLF + data
+
+
+@lru_cache(maxsize=32)
+def get_signer(
+    domain: str, selector: str, private_key: str | bytes
+) -> DkimSigner:
+    """
+    Returns the signer of a DKIM config, the key of a config is
+    loaded once
+
+    :param domain: signing domain
+    :type domain: str
+    :param selector: selector of the public key record
+    :type selector: str
+    :param private_key: PEM encoded RSA private key
+    :type private_key: str | bytes
+    :return: signer
+    :rtype: DkimSigner
+    """
+    return DkimSigner(domain, selector, private_key)
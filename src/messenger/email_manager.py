@@ -2,15 +2,28 @@
 Managers for email sending
 """
 
-from typing import Dict, overload
+import json
+import re
+import smtplib
+import uuid
+from typing import Dict, List, Optional, Tuple, overload
 
+import aiohttp
 import requests
 from django.conf import settings
-from messenger.smtp import EmailConnection, get_connection
-from utils.general import bytes_to_base64_str, is_success
+from messenger.async_smtp import AsyncSmtpPool
+from messenger.dkim import DkimSigner, get_signer
+from messenger.mime import MimeTemplate
+from messenger.smtp import SmtpConnectionPool, get_pool
+from utils.general import is_success
 from utils.loggers import logger, err_logger
 
+from .attachments import prepare_attachments
 from .sender_manager import BaseSenderManager
+from .sessions import session_pool
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+UNDISCLOSED_RECIPIENTS = "undisclosed-recipients:;"
 
 
 class BaseEmailManager(BaseSenderManager):
@@ -33,10 +46,347 @@ class BaseEmailManager(BaseSenderManager):
         return self.__reply_email
 
 
-class SendGridEmailManager(BaseEmailManager):
+class HttpEmailManager(BaseEmailManager):
+    # Most recipients the api accepts in one request
+    max_batch_size = 1
+    # Key of the recipient list in the post data
+    recipients_key: str = None
+
+    def __init__(
+        self, *args, pool_size: int = None,
+        timeout: Tuple[float, float] = None, batch_size: int = None,
+        **kwargs
+    ) -> None:
+        """
+        Email manager sending through an http api, requests go through
+        a keep-alive session shared by the managers of the same api key
+
+        :param pool_size: connections kept open to the api, defaults to
+            the EMAIL_API_POOL_SIZE setting
+        :type pool_size: int, optional
+        :param timeout: connect and read timeouts in seconds, defaults
+            to the EMAIL_API_CONNECT_TIMEOUT and EMAIL_API_READ_TIMEOUT
+            settings
+        :type timeout: Tuple[float, float], optional
+        :param batch_size: recipients sent in one request, capped at
+            `max_batch_size`, defaults to the EMAIL_API_BATCH_SIZE setting
+        :type batch_size: int, optional
+        """
+        super().__init__(*args, **kwargs)
+        if batch_size is None:
+            batch_size = settings.EMAIL_API_BATCH_SIZE
+        if pool_size is None:
+            pool_size = settings.EMAIL_API_POOL_SIZE
+        if timeout is None:
+            timeout = (
+                settings.EMAIL_API_CONNECT_TIMEOUT,
+                settings.EMAIL_API_READ_TIMEOUT,
+            )
+        self.__pool_size = pool_size
+        self.__timeout = timeout
+        self.__batch_size = batch_size
+        self.__marker = uuid.uuid4().hex
+        self.__skeleton: Optional[tuple] = None
+        self.__encoded_message: Tuple[str, bytes] = ('', b'""')
+
+    def get_api_key(self) -> str:
+        raise NotImplementedError('No api key')
+
+    def get_headers(self) -> dict:
+        raise NotImplementedError('No headers')
+
+    def get_post_data(
+        self, email: str, subject: str, message: str, **kwargs
+    ) -> dict:
+        raise NotImplementedError('No post data')
+
+    def get_post_url(self) -> str:
+        raise NotImplementedError('No post url')
+
+    def get_batch_recipients(
+        self, recipients: List[str], substitutions: List[Dict[str, str]]
+    ) -> list:
+        raise NotImplementedError('No batch recipients')
+
+    def get_batch_post_data(
+        self, recipients: List[str], subject: str, message: str,
+        substitutions: List[Dict[str, str]], **kwargs
+    ) -> dict:
+        """
+        Get post data for sending the message to many recipients
+
+        :param recipients: emails of the receivers
+        :type recipients: List[str]
+        :param subject: subject of the email
+        :type subject: str
+        :param message: message of the email with substitution tags
+        :type message: str
+        :param substitutions: values by placeholder column,
+            of each receiver
+        :type substitutions: List[Dict[str, str]]
+        :return: post data
+        :rtype: dict
+        """
+        data = self.get_post_data(recipients[0], subject, message, **kwargs)
+        data[self.recipients_key] = self.get_batch_recipients(
+            recipients, substitutions)
+        return data
+
+    def get_batch_post_url(self) -> str:
+        """
+        Get post url for batches
+
+        :return: post url
+        :rtype: str
+        """
+        return self.get_post_url()
+
+    def get_batch_size(self) -> int:
+        return max(1, min(self.__batch_size, self.max_batch_size))
+
+    def get_pool_size(self) -> int:
+        """
+        Get number of connections kept open to the api
+
+        :return: pool size
+        :rtype: int
+        """
+        return self.__pool_size
+
+    def get_timeout(self) -> Tuple[float, float]:
+        """
+        Get connect and read timeouts in seconds
+
+        :return: timeouts
+        :rtype: Tuple[float, float]
+        """
+        return self.__timeout
+
+    def get_session(self) -> requests.Session:
+        """
+        Get the pooled session for the api key
+
+        :return: session
+        :rtype: requests.Session
+        """
+        return session_pool.get(
+            (self.get_post_url(), self.get_api_key()), self.get_pool_size()
+        )
+
+    def get_skeleton(self, subject: str, **kwargs) -> tuple:
+        """
+        Get the post data serialized once for the campaign, split around
+        the message and the recipient list. Pieces are json bytes, or
+        the name of the field spliced in for each request. The
+        skeleton is kept until the subject or the other arguments, e.g.
+        the attachments, change.
+
+        :param subject: subject of the email
+        :type subject: str
+        :return: skeleton pieces
+        :rtype: tuple
+        """
+        skeleton = self.__skeleton
+        if skeleton is not None and skeleton[0] == (subject, kwargs):
+            return skeleton[1]
+        marker = self.__marker
+        data = self.get_post_data(
+            marker, subject, marker + "message", **kwargs)
+        data[self.recipients_key] = marker + "recipients"
+        pieces = re.split(
+            f'"{marker}(message|recipients)"', json.dumps(data))
+        pieces = tuple(
+            piece if index % 2 else piece.encode()
+            for index, piece in enumerate(pieces)
+        )
+        self.__skeleton = ((subject, kwargs), pieces)
+        return pieces
+
+    def encode_message(self, message: str) -> bytes:
+        """
+        Json encodes the message, the last message is kept so a message
+        sent to every recipient is only encoded once
+
+        :param message: message of the email
+        :type message: str
+        :return: json encoded message
+        :rtype: bytes
+        """
+        last_message, encoded = self.__encoded_message
+        if message is not last_message:
+            encoded = json.dumps(message).encode()
+            self.__encoded_message = (message, encoded)
+        return encoded
+
+    def get_payload(
+        self, recipients: List[str], subject: str, message: str,
+        substitutions: List[Dict[str, str]] = None, **kwargs
+    ) -> bytes:
+        """
+        Get the json post body by splicing the message and recipients
+        into the campaign's skeleton, same as serializing
+        `get_batch_post_data`
+
+        :param recipients: emails of the receivers
+        :type recipients: List[str]
+        :param subject: subject of the email
+        :type subject: str
+        :param message: message of the email
+        :type message: str
+        :param substitutions: values by placeholder column,
+            of each receiver, defaults to None
+        :type substitutions: List[Dict[str, str]], optional
+        :return: json post body
+        :rtype: bytes
+        """
+        if substitutions is None:
+            substitutions = [{}] * len(recipients)
+        fields = {
+            "message": self.encode_message(message),
+            "recipients": json.dumps(
+                self.get_batch_recipients(recipients, substitutions)
+            ).encode(),
+        }
+        return b"".join(
+            fields[piece] if isinstance(piece, str) else piece
+            for piece in self.get_skeleton(subject, **kwargs)
+        )
+
+    def post(self, url: str, payload: bytes) -> bool:
+        """
+        Posts a json body with the pooled session
+
+        :param url: post url
+        :type url: str
+        :param payload: json post body
+        :type payload: bytes
+        :return: request succeeded
+        :rtype: bool
+        """
+        response = self.get_session().post(
+            url=url,
+            data=payload,
+            headers={**self.get_headers(), **JSON_HEADERS},
+            timeout=self.get_timeout(),
+        )
+        stat = is_success(response.status_code)
+        if not stat and self.get_debug():
+            logger.debug(response.content)
+            logger.debug(response.status_code)
+        return stat
+
+    def send(self, recipient: str, subject: str, message: str, **kwargs):
+        return self.post(
+            self.get_post_url(),
+            self.get_payload([recipient], subject, message, **kwargs),
+        )
+
+    def send_batch(
+        self, recipients: List[str], subject: str, message: str,
+        substitutions: List[Dict[str, str]], **kwargs
+    ) -> List[bool]:
+        # The api accepts or rejects the batch as a whole
+        stat = self.post(
+            self.get_batch_post_url(),
+            self.get_payload(
+                recipients, subject, message, substitutions, **kwargs),
+        )
+        return [stat] * len(recipients)
+
+
+class AsyncHttpMixin:
+    """
+    Shares one aiohttp session between the async sends of an http
+    email manager. The session is opened on the first send and closed
+    by `close_async` once the messenger is done, the number of
+    requests in flight is bounded by the messenger's semaphore.
+    """
+
+    connection_limit = 0
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.__session: Optional[aiohttp.ClientSession] = None
+
+    def get_async_session(self) -> aiohttp.ClientSession:
+        """
+        Returns the session shared by the async sends,
+        opens it if needed
+
+        :return: client session
+        :rtype: aiohttp.ClientSession
+        """
+        if self.__session is None or self.__session.closed:
+            connect_timeout, read_timeout = self.get_timeout()
+            self.__session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.connection_limit),
+                headers=self.get_headers(),
+                timeout=aiohttp.ClientTimeout(
+                    sock_connect=connect_timeout, sock_read=read_timeout),
+            )
+        return self.__session
+
+    async def post_async(self, url: str, payload: bytes) -> bool:
+        """
+        Posts a json body with the shared session
+
+        :param url: post url
+        :type url: str
+        :param payload: json post body
+        :type payload: bytes
+        :return: request succeeded
+        :rtype: bool
+        """
+        session = self.get_async_session()
+        async with session.post(
+            url, data=payload, headers=JSON_HEADERS
+        ) as response:
+            stat = is_success(response.status)
+            if not stat and self.get_debug():
+                logger.debug(await response.read())
+                logger.debug(response.status)
+            return stat
+
+    async def send_async(
+        self, recipient: str, subject: str, message: str, **kwargs
+    ) -> bool:
+        return await self.post_async(
+            self.get_post_url(),
+            self.get_payload([recipient], subject, message, **kwargs),
+        )
+
+    async def send_batch_async(
+        self, recipients: List[str], subject: str, message: str,
+        substitutions: List[Dict[str, str]], **kwargs
+    ) -> List[bool]:
+        stat = await self.post_async(
+            self.get_batch_post_url(),
+            self.get_payload(
+                recipients, subject, message, substitutions, **kwargs),
+        )
+        return [stat] * len(recipients)
+
+    async def close_async(self) -> None:
+        session, self.__session = self.__session, None
+        if session is not None:
+            await session.close()
+
+
+class SendGridEmailManager(HttpEmailManager):
+    max_batch_size = 1000
+    recipients_key = "personalizations"
+
     @overload
     def __init__(
-        self, api_key: str, sender: str, debug: bool, block_send: bool, reply_email: str
+        self,
+        api_key: str,
+        sender: str,
+        debug: bool,
+        block_send: bool,
+        reply_email: str,
+        pool_size: int,
+        timeout: Tuple[float, float],
+        batch_size: int,
     ) -> None: ...
 
     def __init__(self, api_key: str, *args, **kwargs) -> None:
@@ -78,7 +428,9 @@ class SendGridEmailManager(BaseEmailManager):
         """
         return self.__headers
 
-    def get_post_data(self, email: str, subject: str, message: str) -> Dict[str, str]:
+    def get_post_data(
+        self, email: str, subject: str, message: str, **kwargs
+    ) -> Dict[str, str]:
         """
         Get post data for sendgrid
 
@@ -109,23 +461,51 @@ class SendGridEmailManager(BaseEmailManager):
         """
         return "https://api.sendgrid.com/v3/mail/send"
 
-    def send(self, recipient: str, subject: str, message: str, **kwargs):
-        response = requests.post(
-            url=self.get_post_url(),
-            json=self.get_post_data(recipient, subject, message),
-            headers=self.get_headers(),
-        )
-        stat = is_success(response.status_code)
-        if not stat and self.get_debug():
-            logger.debug(response.content)
-            logger.debug(response.status_code)
-        return stat
+    def get_substitution_tag(self, key: str) -> str:
+        return f"-{key}-"
 
+    def get_batch_recipients(
+        self, recipients: List[str], substitutions: List[Dict[str, str]]
+    ) -> list:
+        """
+        Get personalizations for sending the message to many recipients,
+        each recipient has its own substitutions
+
+        :param recipients: emails of the receivers
+        :type recipients: List[str]
+        :param substitutions: values by placeholder column,
+            of each receiver
+        :type substitutions: List[Dict[str, str]]
+        :return: personalizations
+        :rtype: list
+        """
+        personalizations = []
+        for email, substitution in zip(recipients, substitutions):
+            personalization = {"to": [{"email": email}]}
+            if substitution:
+                personalization["substitutions"] = {
+                    self.get_substitution_tag(key): value
+                    for key, value in substitution.items()
+                }
+            personalizations.append(personalization)
+        return personalizations
+
+
+class ZeptoEmailManager(HttpEmailManager):
+    max_batch_size = 500
+    recipients_key = "to"
 
-class ZeptoEmailManager(BaseEmailManager):
     @overload
     def __init__(
-        self, api_key: str, sender: str, debug: bool, block_send: bool, reply_email: str
+        self,
+        api_key: str,
+        sender: str,
+        debug: bool,
+        block_send: bool,
+        reply_email: str,
+        pool_size: int,
+        timeout: Tuple[float, float],
+        batch_size: int,
     ) -> None: ...
 
     def __init__(self, api_key: str, *args, **kwargs) -> None:
@@ -182,7 +562,7 @@ class ZeptoEmailManager(BaseEmailManager):
         :return: post data
         :rtype: Dict[str, str]
         """
-        attachments = kwargs.get("attachments", [])
+        attachments = prepare_attachments(kwargs.get("attachments"))
         data = {
             "to": [{"email_address": {"address": email}}],
             "from": {"address": self.get_sender()},
@@ -190,9 +570,9 @@ class ZeptoEmailManager(BaseEmailManager):
             "htmlbody": message,
             "attachments": [
                 {
-                    "name": _["filename"],
-                    "content": bytes_to_base64_str(_["data"]),
-                    "mime_type": _["mime_type"],
+                    "name": _.get_filename(),
+                    "content": _.get_content(),
+                    "mime_type": _.get_mime_type(),
                 }
                 for _ in attachments
             ],
@@ -208,17 +588,52 @@ class ZeptoEmailManager(BaseEmailManager):
         """
         return "https://api.zeptomail.com/v1.1/email"
 
-    def send(self, recipient: str, subject: str, message: str, **kwargs):
-        response = requests.post(
-            url=self.get_post_url(),
-            json=self.get_post_data(recipient, subject, message, **kwargs),
-            headers=self.get_headers(),
-        )
-        stat = is_success(response.status_code)
-        if not stat and self.get_debug():
-            logger.debug(response.content)
-            logger.debug(response.status_code)
-        return stat
+    def get_batch_post_url(self) -> str:
+        """
+        Get batch post url for zepto
+
+        :return: post url
+        :rtype: str
+        """
+        return "https://api.zeptomail.com/v1.1/email/batch"
+
+    def get_substitution_tag(self, key: str) -> str:
+        return "{{%s}}" % key
+
+    def get_batch_recipients(
+        self, recipients: List[str], substitutions: List[Dict[str, str]]
+    ) -> list:
+        """
+        Get recipients for sending the message to many recipients,
+        each recipient has its own merge info
+
+        :param recipients: emails of the receivers
+        :type recipients: List[str]
+        :param substitutions: values by placeholder column,
+            of each receiver
+        :type substitutions: List[Dict[str, str]]
+        :return: recipients
+        :rtype: list
+        """
+        to = []
+        for email, substitution in zip(recipients, substitutions):
+            recipient = {"email_address": {"address": email}}
+            if substitution:
+                recipient["merge_info"] = substitution
+            to.append(recipient)
+        return to
+
+
+class AsyncSendGridEmailManager(AsyncHttpMixin, SendGridEmailManager):
+    """
+    SendGrid email manager sending with aiohttp
+    """
+
+
+class AsyncZeptoEmailManager(AsyncHttpMixin, ZeptoEmailManager):
+    """
+    Zepto email manager sending with aiohttp
+    """
 
 
 class SmtpEmailManager(BaseEmailManager):
@@ -233,10 +648,18 @@ class SmtpEmailManager(BaseEmailManager):
         debug: bool,
         block_send: bool,
         reply_email: str,
+        pool_size: int,
+        use_tls: bool,
+        max_recipients: int,
+        dkim_selector: str,
+        dkim_private_key: str,
     ) -> None: ...
 
     def __init__(
-        self, host: str, port: int, username: str, password: str, *args, **kwargs
+        self, host: str, port: int, username: str, password: str, *args,
+        pool_size: int = None, use_tls: bool = True,
+        max_recipients: int = None, dkim_selector: str = None,
+        dkim_private_key: str = None, **kwargs
     ) -> None:
         """
         SMTP email manager
@@ -249,38 +672,258 @@ class SmtpEmailManager(BaseEmailManager):
         :type username: str
         :param password: password
         :type password: str
+        :param pool_size: sessions opened to the server at the same time,
+            defaults to the SMTP_POOL_SIZE setting
+        :type pool_size: int, optional
+        :param use_tls: upgrade connections with STARTTLS, port 465
+            always uses TLS, defaults to True
+        :type use_tls: bool, optional
+        :param max_recipients: recipients of one transaction when the
+            same message is sent to many recipients, defaults to the
+            SMTP_MAX_RECIPIENTS setting
+        :type max_recipients: int, optional
+        :param dkim_selector: selector of the DKIM public key record of
+            the sender domain, emails are signed when given with
+            dkim_private_key, defaults to None
+        :type dkim_selector: str, optional
+        :param dkim_private_key: PEM encoded RSA key signing the emails,
+            defaults to None
+        :type dkim_private_key: str, optional
         """
         super().__init__(*args, **kwargs)
+        if pool_size is None:
+            pool_size = settings.SMTP_POOL_SIZE
+        if max_recipients is None:
+            max_recipients = settings.SMTP_MAX_RECIPIENTS
         self.__host = host
         self.__port = port
         self.__username = username
         self.__password = password
+        self.__pool_size = pool_size
+        self.__use_tls = use_tls
+        self.__max_recipients = max_recipients
+        self.__mime_template: Optional[MimeTemplate] = None
+        self.__signer: Optional[DkimSigner] = None
+        if dkim_selector and dkim_private_key:
+            # The key is loaded once per config
+            self.__signer = get_signer(
+                self.get_sender().rpartition("@")[2],
+                dkim_selector, dkim_private_key,
+            )
 
-    @property
-    def conn(self) -> EmailConnection:
+    def get_pool_size(self) -> int:
         """
-        Get SMTP connection
+        Get number of sessions opened to the server at the same time
+
+        :return: pool size
+        :rtype: int
         """
-        return get_connection(
-            host=self.__host,
-            port=self.__port,
-            username=self.__username,
-            password=self.__password,
+        return self.__pool_size
+
+    def get_fanout_size(self) -> int:
+        return max(1, self.__max_recipients)
+
+    def get_signer(self) -> Optional[DkimSigner]:
+        """
+        Get the DKIM signer of the emails
+
+        :return: signer, None when emails are not signed
+        :rtype: Optional[DkimSigner]
+        """
+        return self.__signer
+
+    def render(
+        self, recipient: str, subject: str, message: str, attachments=None
+    ) -> bytes:
+        """
+        Render the email from the campaign template, signed when
+        DKIM is configured
+
+        :param recipient: To header of the email
+        :type recipient: str
+        :param subject: subject of the email
+        :type subject: str
+        :param message: message of the email
+        :type message: str
+        :param attachments: attachments of the email, defaults to None
+        :type attachments: list, optional
+        :return: email ready for `sendmail`
+        :rtype: bytes
+        """
+        data = self.get_mime_template(subject, attachments).render(
+            recipient, text=message, html=message)
+        if self.__signer is not None:
+            data = self.__signer.sign(data)
+        return data
+
+    def get_server_kwargs(self) -> dict:
+        """
+        Get the server account the sessions log into
+
+        :return: host, port, username, password and use_tls
+        :rtype: dict
+        """
+        return {
+            "host": self.__host,
+            "port": self.__port,
+            "username": self.__username,
+            "password": self.__password,
+            "use_tls": self.__use_tls,
+        }
+
+    def get_pool(self) -> SmtpConnectionPool:
+        """
+        Get the connection pool shared by the managers of the
+        server account
+
+        :return: connection pool
+        :rtype: SmtpConnectionPool
+        """
+        return get_pool(
+            **self.get_server_kwargs(),
+            size=self.__pool_size,
+            max_messages=settings.SMTP_SESSION_MAX_MESSAGES,
+            max_idle=settings.SMTP_SESSION_MAX_IDLE,
         )
 
+    def get_mime_template(
+        self, subject: str, attachments=None
+    ) -> MimeTemplate:
+        """
+        Get the MIME template of the campaign, the template is built
+        again when the subject or attachments change
+
+        :param subject: subject of the email
+        :type subject: str
+        :param attachments: attachments of the email, defaults to None
+        :type attachments: list, optional
+        :return: MIME template
+        :rtype: MimeTemplate
+        """
+        key = (
+            subject, self.get_sender(), True,
+            prepare_attachments(attachments),
+        )
+        template = self.__mime_template
+        if template is None or template.get_key() != key:
+            template = MimeTemplate(
+                subject, self.get_sender(), attachments=key[3])
+            self.__mime_template = template
+        return template
+
     def send(
         self, recipient: str, subject: str, message: str, attachments=None, **kwargs
     ):
         try:
-            self.conn.send(
-                subject=subject,
-                recipient=recipient,
-                text=message,
-                sender=self.get_sender(),
-                html=message,
-                attachments=attachments,
+            data = self.render(recipient, subject, message, attachments)
+            self.get_pool().send_bytes(recipient, data)
+        except Exception as e:
+            err_logger.exception(e)
+            return False
+        return True
+
+    def send_batch(
+        self, recipients: List[str], subject: str, message: str,
+        substitutions: List[Dict[str, str]] = None, attachments=None,
+        **kwargs
+    ) -> List[bool]:
+        """
+        Send the same message to many recipients in one transaction,
+        with a RCPT TO command per recipient. Recipients only see
+        themselves as undisclosed recipients in the To header.
+
+        :param recipients: emails of the receivers
+        :type recipients: List[str]
+        :param subject: subject of the email
+        :type subject: str
+        :param message: message of the email
+        :type message: str
+        :param substitutions: must be empty, SMTP servers do not
+            personalize messages, defaults to None
+        :type substitutions: List[Dict[str, str]], optional
+        :raises TypeError: Substitutions given
+        :return: message sent, for each recipient
+        :rtype: List[bool]
+        """
+        if substitutions and any(substitutions):
+            raise TypeError('SMTP batches can not have substitutions')
+        try:
+            data = self.render(
+                UNDISCLOSED_RECIPIENTS, subject, message, attachments)
+            refused = self.get_pool().send_bytes(recipients, data)
+        except smtplib.SMTPRecipientsRefused as e:
+            refused = e.recipients
+        except Exception as e:
+            err_logger.exception(e)
+            return [False] * len(recipients)
+        if refused:
+            logger.info(f"{len(refused)} recipients refused: {refused}")
+        return [recipient not in refused for recipient in recipients]
+
+
+class AsyncSmtpEmailManager(SmtpEmailManager):
+    """
+    SMTP email manager sending with asyncio sessions, one event loop
+    drives up to `pool_size` sessions at once. The sessions are opened
+    on the first send and closed by `close_async` once the messenger
+    is done.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.__async_pool: Optional[AsyncSmtpPool] = None
+
+    def get_async_pool(self) -> AsyncSmtpPool:
+        """
+        Returns the session pool of the async sends, creates it if needed
+
+        :return: session pool
+        :rtype: AsyncSmtpPool
+        """
+        if self.__async_pool is None:
+            self.__async_pool = AsyncSmtpPool(
+                **self.get_server_kwargs(),
+                size=self.get_pool_size(),
+                max_messages=settings.SMTP_SESSION_MAX_MESSAGES,
+                max_idle=settings.SMTP_SESSION_MAX_IDLE,
             )
+        return self.__async_pool
+
+    async def send_async(
+        self, recipient: str, subject: str, message: str,
+        attachments=None, **kwargs
+    ) -> bool:
+        try:
+            data = self.render(recipient, subject, message, attachments)
+            await self.get_async_pool().sendmail(
+                self.get_server_kwargs()["username"], [recipient], data)
         except Exception as e:
             err_logger.exception(e)
             return False
         return True
+
+    async def send_batch_async(
+        self, recipients: List[str], subject: str, message: str,
+        substitutions: List[Dict[str, str]] = None, attachments=None,
+        **kwargs
+    ) -> List[bool]:
+        if substitutions and any(substitutions):
+            raise TypeError('SMTP batches can not have substitutions')
+        try:
+            data = self.render(
+                UNDISCLOSED_RECIPIENTS, subject, message, attachments)
+            refused = await self.get_async_pool().sendmail(
+                self.get_server_kwargs()["username"], recipients, data)
+        except smtplib.SMTPRecipientsRefused as e:
+            refused = e.recipients
+        except Exception as e:
+            err_logger.exception(e)
+            return [False] * len(recipients)
+        if refused:
+            logger.info(f"{len(refused)} recipients refused: {refused}")
+        return [recipient not in refused for recipient in recipients]
+
+    async def close_async(self) -> None:
+        pool, self.__async_pool = self.__async_pool, None
+        if pool is not None:
+            await pool.close()
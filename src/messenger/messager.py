@@ -2,15 +2,31 @@
 Module for email messenger
 """
 
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 import time
-from typing import Optional, Sequence, Type
+from typing import (
+    AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List,
+    Optional, Sequence, Tuple, Type
+)
 
-import pandas as pd
-from pandas import DataFrame
+import numpy as np
+from pandas import DataFrame, Series
 
+from .attachments import prepare_attachments
+from .cache import ParsedUploadCache
 from .messsage_manager import BaseMessageManager
+from .readers import (
+    BaseReader, CsvReader, ExcelReader, JsonLinesReader, ParquetReader,
+    XlsxReader
+)
+from .rows import Rows
+from .segments import SegmentReport, plan_segments
 from .sender_manager import BaseSenderManager
+from .template import MessageTemplate
 
 
 class Managers:
@@ -92,6 +108,17 @@ class BaseMessenger:
             return self.get_manager().sender_manager.get_recipient_field()
         return self.__recipient_field
 
+    def has_recipient_field(self) -> bool:
+        """
+        Returns True if the recipient field key can be resolved,
+        either given directly or by the sender manager
+
+        :return: recipient field is known
+        :rtype: bool
+        """
+        return self.__recipient_field is not None \
+            or self.get_manager().sender_manager is not None
+
     def run_checks(self) -> None:
         if not isinstance(self.__start, int):
             raise TypeError('Start value must be an integer')
@@ -140,10 +167,23 @@ class BaseMessenger:
         """
         if data is None:
             data = {}
-        for key, value in data.items():
-            replace_key = f'_{key}_'
-            message = message.replace(replace_key, str(value))
-        return message
+        return self.compile_message(message, data.keys()).render(data)
+
+    def compile_message(
+        self, message: str, columns: Iterable[str]
+    ) -> MessageTemplate:
+        """
+        Compiles the message once so it can be rendered for every
+        receiver without scanning the message again
+
+        :param message: message to be sent
+        :type message: str
+        :param columns: keys of the data the message is formatted with
+        :type columns: Iterable[str]
+        :return: compiled message
+        :rtype: MessageTemplate
+        """
+        return MessageTemplate(message, columns)
 
     def start_process(self, subject: str, message: str, **kwargs) -> None:
         """
@@ -157,6 +197,10 @@ class BaseMessenger:
         :rtype: None
         """
         self.__manager.run_checks()
+        if kwargs.get('attachments'):
+            # Encoded once here instead of once per message
+            kwargs['attachments'] = prepare_attachments(
+                kwargs['attachments'])
         return self.send_messages(subject, message, **kwargs)
 
     def send_messages(self, subject: str, message: str, **kwargs) -> None:
@@ -177,24 +221,56 @@ class ExcelMessenger(BaseMessenger):
     """
     CSV and Excel manager for loading and sending messages to
     receiver data placed in csv or excel files.
-    Files supported: xls, xlsx, csv, csv.gz
+    Files supported: xls, xlsx, csv, csv.gz, csv.bz2, csv.xz, csv.zst,
+    jsonl and parquet
     """
 
-    def __init__(self, file_path: str, **kwargs) -> None:
+    render_batch_size = 1000
+
+    def __init__(
+        self, file_path: str, chunksize: int = None,
+        cache: ParsedUploadCache = None, message: str = None,
+        convert: bool = False, engine: str = None, concurrency: int = 1,
+        **kwargs
+    ) -> None:
         """
         Set up excel manager with file path to the accepted readable file,
         This sets up the neccessary properties before calling parent class
         init setup to run checks.
 
         :param str file_path: path to file
+        :param int chunksize: stream the file in chunks of this many rows
+            instead of loading it in full, defaults to None
+        :param ParsedUploadCache cache: cache of parsed uploads to load
+            repeated uploads from, defaults to None
+        :param str message: message that will be sent, only the columns
+            it references and the recipient column are loaded,
+            defaults to None
+        :param bool convert: convert files that are slow to read,
+            like xlsx, to csv on first read, defaults to False
+        :param str engine: csv parsing engine, `c` or `pyarrow`,
+            defaults to None
+        :param int concurrency: maximum number of messages sent at the
+            same time, defaults to 1
         """
         self.__file_path = Path(file_path)
+        self.__chunksize = chunksize
+        self.__cache = cache
+        self.__convert = convert
+        self.__engine = engine
+        self.__concurrency = concurrency
+        self.__message = message
+        self.__usecols: Optional[List[str]] = None
+        self.__reader: Optional[BaseReader] = None
         self.__supported_read_map = {
-            'xls': pd.read_excel, 'xlsx': pd.read_excel,
-            'csv': pd.read_csv, 'gz': pd.read_csv
+            'xls': ExcelReader, 'xlsx': XlsxReader,
+            'csv': CsvReader, 'gz': CsvReader, 'bz2': CsvReader,
+            'xz': CsvReader, 'zst': CsvReader,
+            'jsonl': JsonLinesReader, 'parquet': ParquetReader
         }
-        self.__read_map = None
+        self.__read_map: Optional[Type[BaseReader]] = None
         self.__dataframe: Optional[DataFrame] = None
+        self.__rows: Optional[Rows] = None
         super().__init__(**kwargs)
         self.load_data()
         self.validate_data()
@@ -213,7 +289,7 @@ class ExcelMessenger(BaseMessenger):
 
     def set_ext_read_map(self, ext: str) -> None:
         """
-        Sets the read function to be used to read the file
+        Sets the reader to be used to read the file
         using the read map dict.
 
         :param ext: file extension
@@ -225,6 +301,7 @@ class ExcelMessenger(BaseMessenger):
             raise TypeError(f"File is not in correct format, \
 must be {self.get_supported_exts()}. Current format {ext}")
         self.__read_map = read_map
+        self.__reader = None
 
     def validate_ext(self) -> None:
         """
@@ -237,6 +314,48 @@ must be {self.get_supported_exts()}. Current format {ext}")
             raise TypeError('File does not have an extension')
         self.set_ext_read_map(ext)
 
+    def get_chunksize(self) -> Optional[int]:
+        """
+        Returns the number of rows loaded per chunk in streaming mode
+
+        :return: chunk size
+        :rtype: Optional[int]
+        """
+        return self.__chunksize
+
+    def is_streaming(self) -> bool:
+        """
+        Returns True if rows are streamed from the file in chunks
+        instead of being loaded in full
+
+        :return: streaming mode
+        :rtype: bool
+        """
+        return self.__chunksize is not None
+
+    def can_send_concurrently(self) -> bool:
+        """
+        Returns True if the sender manager can send many
+        messages at the same time
+
+        :return: concurrent sends supported
+        :rtype: bool
+        """
+        sender_manager = self.get_manager().sender_manager
+        return sender_manager is None or sender_manager.is_thread_safe()
+
+    def get_concurrency(self) -> int:
+        """
+        Returns the maximum number of messages sent at the same time,
+        1 when the sender manager cannot send concurrently
+
+        :return: concurrency
+        :rtype: int
+        """
+        if not self.can_send_concurrently():
+            return 1
+        return self.__concurrency
+
     def run_checks(self) -> None:
         """
         Runs checks on the file path provided to ensure it is a valid file
@@ -246,6 +365,15 @@ must be {self.get_supported_exts()}. Current format {ext}")
         :raises TypeError: Path provided is not a file
         """
         super().run_checks()
+        if self.is_streaming() and (
+            not isinstance(self.__chunksize, int) or self.__chunksize < 1
+        ):
+            raise TypeError('Chunk size must be a positive integer')
+        if not isinstance(self.__concurrency, int) or self.__concurrency < 1:
+            raise TypeError('Concurrency must be a positive integer')
+        if self.__engine is not None and self.__engine not in CsvReader.engines:
+            raise TypeError(
+                f"Csv engine must be one of {', '.join(CsvReader.engines)}")
         if not self.get_file_path().is_absolute():
             raise TypeError('File path is not absolute')
         if not self.get_file_path().exists():
@@ -263,6 +391,86 @@ must be {self.get_supported_exts()}. Current format {ext}")
         """
         return self.__file_path
 
+    def get_reader(self) -> Type[BaseReader]:
+        """
+        Returns the reader for the file
+
+        :return: file reader
+        :rtype: Type[BaseReader]
+        """
+        if self.__reader is None:
+            self.__reader = self.__read_map(
+                self.get_file_path(), cache=self.__cache,
+                usecols=self.__usecols, convert=self.__convert,
+                engine=self.__engine)
+        return self.__reader
+
+    def set_usecols(self) -> None:
+        """
+        Sets the columns to load from the file to the columns whose
+        placeholders are in the message, plus the recipient column.
+        Every column is loaded when there is no message or the
+        recipient column is not known yet.
+
+        :raises TypeError: Recipient column not in file
+        """
+        self.__usecols = None
+        self.__reader = None
+        if self.__message is None or not self.has_recipient_field():
+            return
+        recipient_field = self.get_recipient_field()
+        columns = self.get_reader().read_columns()
+        if recipient_field not in columns:
+            raise TypeError(f'{recipient_field.capitalize()} column not in file')
+        self.__usecols = [
+            column for column in columns
+            if column == recipient_field or f'_{column}_' in self.__message
+        ]
+        self.__reader = None
+
+    def set_message(self, message: str) -> None:
+        """
+        Sets the message that will be sent, the file is loaded again
+        when the message references columns that were not loaded for
+        the previous message
+
+        :param message: message to be sent
+        :type message: str
+        """
+        usecols = self.get_usecols()
+        if usecols is None or message == self.__message:
+            return
+        missing = [
+            column for column in self.get_reader().read_columns()
+            if column not in usecols and f'_{column}_' in message
+        ]
+        if not missing:
+            return
+        self.__message = message
+        self.load_data()
+
+    def get_usecols(self) -> Optional[List[str]]:
+        """
+        Returns the columns loaded from the file, None if every
+        column is loaded
+
+        :return: columns loaded
+        :rtype: Optional[List[str]]
+        """
+        return self.__usecols
+
+    def get_row_count(self) -> int:
+        """
+        Returns the number of rows in the file. In streaming mode rows
+        are only counted up to the stop index, without loading them.
+
+        :return: number of rows
+        :rtype: int
+        """
+        if self.is_streaming():
+            return self.get_reader().count_rows(limit=self.get_stop() + 1)
+        return self.data.shape[0]
+
     def validate_data(self):
         """
         Validates the data loaded from the file
@@ -270,7 +478,7 @@ must be {self.get_supported_exts()}. Current format {ext}")
         :raises TypeError: Start index is greater than file max index
         :raises TypeError: Stop index is greater than file max index
         """
-        row = self.data.shape[0] - 1
+        row = self.get_row_count() - 1
         if self.get_start() > row:
             raise TypeError('Start index is greater than file max index')
         if self.get_stop() > row:
@@ -278,21 +486,40 @@ must be {self.get_supported_exts()}. Current format {ext}")
 
     def load_data(self):
         """
-        Loads the data from the file into a pandas dataframe
+        Loads the data from the file into a pandas dataframe,
+        nothing is loaded up front in streaming mode.
         """
-        self.__dataframe: Type[DataFrame] = self.__read_map(
-            self.get_file_path(), dtype=str)
+        self.set_usecols()
+        self.__rows = None
+        if self.is_streaming():
+            return
+        self.__dataframe: Type[DataFrame] = self.get_reader().load()
 
     @property
-    def data(self) -> Type[DataFrame]:
+    def data(self) -> Optional[DataFrame]:
         """
-        Returns the data loaded from the file
+        Returns the data loaded from the file,
+        None in streaming mode.
 
         :return: data loaded from file
-        :rtype: Type[DataFrame]
+        :rtype: Optional[DataFrame]
         """
         return self.__dataframe
 
+    def iter_chunks(self) -> Iterator[DataFrame]:
+        """
+        Yields the rows in the start and stop range in chunks of
+        dataframes indexed by row position.
+
+        :return: chunks of rows
+        :rtype: Iterator[DataFrame]
+        """
+        if not self.is_streaming():
+            yield self.data.loc[self.get_start():self.get_stop()]
+            return
+        yield from self.get_reader().iter_chunks(
+            self.get_chunksize(), self.get_start(), self.get_stop())
+
     def get_range(self) -> Sequence[int]:
         """
         Returns a range of indexes to be used to get data from the file
@@ -311,7 +538,49 @@ must be {self.get_supported_exts()}. Current format {ext}")
         :return: data at index
         :rtype: dict
         """
-        return self.data.loc[index].to_dict()
+        if self.__rows is None:
+            self.__rows = Rows(self.data)
+        return self.__rows.get(index)
+
+    def iter_rows(self) -> Iterator[dict]:
+        """
+        Yields dictionaries of the data in the start and stop range
+
+        :return: data of each row
+        :rtype: Iterator[dict]
+        """
+        for chunk in self.iter_chunks():
+            yield from Rows(chunk)
+
+    def get_columns(self) -> List[str]:
+        """
+        Returns the names of the columns loaded from the file
+
+        :return: column names
+        :rtype: List[str]
+        """
+        if not self.is_streaming():
+            return list(self.data.columns)
+        if self.get_usecols() is not None:
+            return self.get_usecols()
+        return self.get_reader().read_columns()
+
+    def get_template(self, message: str) -> MessageTemplate:
+        """
+        Compiles the message against the columns of the file
+
+        :param message: message to be sent
+        :type message: str
+        :raises TypeError: Recipient column not in file
+        :return: compiled message
+        :rtype: MessageTemplate
+        """
+        self.set_message(message)
+        columns = self.get_columns()
+        key = self.get_recipient_field()
+        if key not in columns:
+            raise TypeError(f'{key.capitalize()} column not in file')
+        return self.compile_message(message, columns)
 
     def get_recipient_from_data(self, data: dict) -> str:
         key = self.get_recipient_field()
@@ -320,22 +589,389 @@ must be {self.get_supported_exts()}. Current format {ext}")
             raise TypeError(f'{key.capitalize()} column not in file')
         return value
 
+    def personalize_chunk(
+        self, template: MessageTemplate, chunk: DataFrame
+    ) -> List[str]:
+        """
+        Formats the message for every row in the chunk at once by
+        concatenating whole placeholder columns
+
+        :param template: compiled message
+        :type template: MessageTemplate
+        :param chunk: rows of the file
+        :type chunk: DataFrame
+        :return: formatted message of each row
+        :rtype: List[str]
+        """
+        if not template.is_personalized():
+            return [template.get_message()] * len(chunk)
+        messages = np.full(len(chunk), '', dtype=object)
+        for is_placeholder, value in template.get_segments():
+            if is_placeholder:
+                value = chunk[value].astype(str).to_numpy(dtype=object)
+            messages = messages + value
+        return messages.tolist()
+
+    def render_chunk(
+        self, template: MessageTemplate, chunk: DataFrame,
+        context: dict = None
+    ) -> Iterator[Tuple[str, str]]:
+        """
+        Renders the messages of the rows in the chunk in one batch
+
+        :param template: compiled message
+        :type template: MessageTemplate
+        :param chunk: rows of the file
+        :type chunk: DataFrame
+        :param context: message manager context, defaults to None
+        :type context: dict, optional
+        :return: pairs of recipient and rendered message
+        :rtype: Iterator[Tuple[str, str]]
+        """
+        messages = self.get_manager().message_manager.render_messages(
+            self.personalize_chunk(template, chunk), context)
+        recipients = chunk[self.get_recipient_field()].tolist()
+        return zip(recipients, messages)
+
+    def iter_batches(self) -> Iterator[DataFrame]:
+        """
+        Yields the rows to send in batches of at most
+        `render_batch_size` rows
+
+        :return: batches of rows
+        :rtype: Iterator[DataFrame]
+        """
+        size = self.render_batch_size
+        for chunk in self.iter_chunks():
+            for index in range(0, len(chunk), size):
+                yield chunk.iloc[index:index + size]
+
+    def iter_messages(
+        self, template: MessageTemplate, context: dict = None
+    ) -> Iterator[Tuple[str, str]]:
+        """
+        Yields the recipient and rendered message of every row
+        in the start and stop range
+
+        :param template: compiled message
+        :type template: MessageTemplate
+        :param context: message manager context, defaults to None
+        :type context: dict, optional
+        :return: pairs of recipient and rendered message
+        :rtype: Iterator[Tuple[str, str]]
+        """
+        for batch in self.iter_batches():
+            yield from self.render_chunk(template, batch, context)
+
+    def plan_segments(
+        self, message: str, context: dict = None,
+        transliterated: bool = False, rate: float = 0
+    ) -> SegmentReport:
+        """
+        Computes the SMS encoding and segments of every row in the start
+        and stop range from the rendered messages, without sending.
+        Every row is rendered a second time when the campaign is sent,
+        only the totals of each batch are kept.
+
+        :param message: message to be sent
+        :type message: str
+        :param context: message manager context, defaults to None
+        :type context: dict, optional
+        :param transliterated: count the messages after
+            transliterating them to GSM-7, defaults to False
+        :type transliterated: bool, optional
+        :param rate: segments sent per second, 0 for no limit,
+            defaults to 0
+        :type rate: float, optional
+        :return: segment report
+        :rtype: SegmentReport
+        """
+        template = self.get_template(message)
+        message_manager = self.get_manager().message_manager
+        report = SegmentReport(rate)
+        for batch in self.iter_batches():
+            messages = Series(
+                list(message_manager.render_messages(
+                    self.personalize_chunk(template, batch), context)),
+                index=batch.index, dtype=object,
+            )
+            report.add(plan_segments(messages, transliterated))
+        return report
+
+    def get_batch_size(self, template: MessageTemplate) -> int:
+        """
+        Returns the number of recipients sent in one request by the
+        sender manager, messages without placeholders are the same for
+        every recipient and can be fanned out to more recipients
+
+        :param template: compiled message
+        :type template: MessageTemplate
+        :return: batch size
+        :rtype: int
+        """
+        sender_manager = self.get_manager().sender_manager
+        size = sender_manager.get_batch_size()
+        if not template.is_personalized():
+            size = max(size, sender_manager.get_fanout_size())
+        return size
+
+    def get_batch_message(
+        self, template: MessageTemplate, context: dict = None
+    ) -> str:
+        """
+        Renders the message once for a batch, with the sender manager's
+        substitution tags in place of the placeholders
+
+        :param template: compiled message
+        :type template: MessageTemplate
+        :param context: message manager context, defaults to None
+        :type context: dict, optional
+        :return: rendered message
+        :rtype: str
+        """
+        sender_manager = self.get_manager().sender_manager
+        message = ''.join(
+            sender_manager.get_substitution_tag(value) if is_placeholder
+            else value
+            for is_placeholder, value in template.get_segments()
+        )
+        return next(iter(self.get_manager().message_manager.render_messages(
+            [message], context)))
+
+    def get_substitutions(
+        self, template: MessageTemplate, chunk: DataFrame
+    ) -> List[Dict[str, str]]:
+        """
+        Returns the placeholder values of every row in the chunk
+
+        :param template: compiled message
+        :type template: MessageTemplate
+        :param chunk: rows of the file
+        :type chunk: DataFrame
+        :return: values by placeholder column, of each row
+        :rtype: List[Dict[str, str]]
+        """
+        placeholders = template.get_placeholders()
+        if not placeholders:
+            return [{} for _ in range(len(chunk))]
+        columns = [chunk[key].astype(str).tolist() for key in placeholders]
+        return [dict(zip(placeholders, values)) for values in zip(*columns)]
+
+    def iter_recipient_batches(
+        self, template: MessageTemplate
+    ) -> Iterator[Tuple[List[str], List[Dict[str, str]]]]:
+        """
+        Yields the recipients and substitutions of the rows in batches
+        of at most `get_batch_size(template)` rows
+
+        :param template: compiled message
+        :type template: MessageTemplate
+        :return: pairs of recipients and their substitutions
+        :rtype: Iterator[Tuple[List[str], List[Dict[str, str]]]]
+        """
+        size = self.get_batch_size(template)
+        key = self.get_recipient_field()
+        for chunk in self.iter_chunks():
+            for index in range(0, len(chunk), size):
+                batch = chunk.iloc[index:index + size]
+                yield (
+                    batch[key].tolist(),
+                    self.get_substitutions(template, batch)
+                )
+
+    def map_concurrently(
+        self, func: Callable, jobs: Iterable[dict]
+    ) -> Iterator:
+        """
+        Calls func with the keyword arguments of each job from a thread
+        pool, keeping at most `get_concurrency()` calls in flight.
+        Results are yielded in the order of the jobs, and errors are
+        raised when their result is reached.
+
+        :param func: function to call
+        :type func: Callable
+        :param jobs: keyword arguments of each call
+        :type jobs: Iterable[dict]
+        :return: result of each call
+        :rtype: Iterator
+        """
+        concurrency = self.get_concurrency()
+        if concurrency == 1:
+            for job in jobs:
+                yield func(**job)
+            return
+        in_flight = deque()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for job in jobs:
+                if len(in_flight) >= concurrency:
+                    yield in_flight.popleft().result()
+                in_flight.append(executor.submit(func, **job))
+            while in_flight:
+                yield in_flight.popleft().result()
+
     def send_messages(
         self, subject: str, message: str,
         context: dict = None, **kwargs
     ):
-        if context is None:
-            context = {}
-        for index in self.get_range():
-            data = self.get_index_dict(index)
-            _message = self.get_message(message, data)
-            context['message'] = _message
-            _message = self.get_manager()\
-                .message_manager.render_message(context)
-            recipient = self.get_recipient_from_data(data)
-            sent = self.get_manager().sender_manager.send_message(
-                _message, subject=subject,
-                recipient=recipient,
-                **kwargs
+        sender_manager = self.get_manager().sender_manager
+        template = self.get_template(message)
+        if self.get_batch_size(template) > 1:
+            send = partial(
+                sender_manager.send_batch_message,
+                self.get_batch_message(template, context),
+                subject=subject, **kwargs
+            )
+            jobs = (
+                {'recipients': recipients, 'substitutions': substitutions}
+                for recipients, substitutions
+                in self.iter_recipient_batches(template)
+            )
+            for results in self.map_concurrently(send, jobs):
+                yield from results
+            return
+        send = partial(
+            sender_manager.send_message, subject=subject, **kwargs)
+        jobs = (
+            {'message': _message, 'recipient': recipient}
+            for recipient, _message in self.iter_messages(template, context)
+        )
+        yield from self.map_concurrently(send, jobs)
+
+
+class AsyncExcelMessenger(ExcelMessenger):
+    """
+    Excel messenger that sends from an asyncio event loop. Sends share
+    the sender manager's async transport, e.g. one aiohttp session for
+    the http email managers, and a semaphore keeps at most
+    `get_concurrency()` of them in flight.
+    """
+
+    def can_send_concurrently(self) -> bool:
+        """
+        Returns True if the sender manager can send many messages at
+        the same time, native async sends always can while sends run
+        in threads need a thread safe sender manager
+
+        :return: concurrent sends supported
+        :rtype: bool
+        """
+        sender_manager = self.get_manager().sender_manager
+        if sender_manager is not None and (
+            type(sender_manager).send_async is not BaseSenderManager.send_async
+        ):
+            return True
+        return super().can_send_concurrently()
+
+    async def map_async(
+        self, func: Callable[..., Awaitable], jobs: Iterable[dict]
+    ) -> AsyncIterator:
+        """
+        Awaits func with the keyword arguments of each job, a semaphore
+        keeps at most `get_concurrency()` calls in flight. Results are
+        yielded in the order of the jobs.
+
+        :param func: coroutine function to call
+        :type func: Callable[..., Awaitable]
+        :param jobs: keyword arguments of each call
+        :type jobs: Iterable[dict]
+        :return: result of each call
+        :rtype: AsyncIterator
+        """
+        concurrency = self.get_concurrency()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def call(job: dict):
+            async with semaphore:
+                return await func(**job)
+
+        # Tasks are created ahead of the semaphore so it stays full
+        # while the oldest call is awaited
+        in_flight = deque()
+        try:
+            for job in jobs:
+                if len(in_flight) >= 2 * concurrency:
+                    yield await in_flight.popleft()
+                in_flight.append(asyncio.ensure_future(call(job)))
+            while in_flight:
+                yield await in_flight.popleft()
+        finally:
+            for task in in_flight:
+                task.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+
+    async def send_messages_async(
+        self, subject: str, message: str,
+        context: dict = None, **kwargs
+    ) -> AsyncIterator[bool]:
+        """
+        Sends messages to receivers, results are yielded in the
+        order of the rows
+
+        :param subject: subject of the message
+        :type subject: str
+        :param message: message to be formatted and sent
+        :type message: str
+        :param context: message manager context, defaults to None
+        :type context: dict, optional
+        :return: result of each send
+        :rtype: AsyncIterator[bool]
+        """
+        sender_manager = self.get_manager().sender_manager
+        template = self.get_template(message)
+        try:
+            if self.get_batch_size(template) > 1:
+                send = partial(
+                    sender_manager.send_batch_message_async,
+                    self.get_batch_message(template, context),
+                    subject=subject, **kwargs
+                )
+                jobs = (
+                    {'recipients': recipients, 'substitutions': substitutions}
+                    for recipients, substitutions
+                    in self.iter_recipient_batches(template)
+                )
+                async for results in self.map_async(send, jobs):
+                    for sent in results:
+                        yield sent
+                return
+            send = partial(
+                sender_manager.send_message_async, subject=subject, **kwargs)
+            jobs = (
+                {'message': _message, 'recipient': recipient}
+                for recipient, _message
+                in self.iter_messages(template, context)
             )
-            yield sent
+            async for sent in self.map_async(send, jobs):
+                yield sent
+        finally:
+            await sender_manager.close_async()
+
+    def send_messages(
+        self, subject: str, message: str,
+        context: dict = None, **kwargs
+    ) -> Iterator[bool]:
+        """
+        Runs `send_messages_async` on a new event loop,
+        yielding each result as it is ready
+
+        :param subject: subject of the message
+        :type subject: str
+        :param message: message to be formatted and sent
+        :type message: str
+        :param context: message manager context, defaults to None
+        :type context: dict, optional
+        :return: result of each send
+        :rtype: Iterator[bool]
+        """
+        loop = asyncio.new_event_loop()
+        results = self.send_messages_async(
+            subject, message, context, **kwargs)
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(results.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            loop.run_until_complete(results.aclose())
+            loop.close()
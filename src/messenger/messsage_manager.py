@@ -1,4 +1,5 @@
-from typing import Any, Dict, Type
+import uuid
+from typing import Any, Dict, Iterable, Iterator, Type
 from django.http.request import HttpRequest
 from django.template.loader import get_template
 
@@ -10,6 +11,25 @@ class BaseMessageManager:
     def render_message(self):
         raise NotImplementedError
 
+    def render_messages(
+        self, messages: Iterable[str], context: dict = None
+    ) -> Iterator[str]:
+        """
+        Renders each message with the context
+
+        :param messages: messages to render
+        :type messages: Iterable[str]
+        :param context: context shared by the messages, defaults to None
+        :type context: dict, optional
+        :return: rendered messages
+        :rtype: Iterator[str]
+        """
+        if context is None:
+            context = {}
+        for message in messages:
+            context['message'] = message
+            yield self.render_message(context)
+
 
 class HtmlMessageManager(BaseMessageManager):
     def __init__(
@@ -34,3 +54,23 @@ class HtmlMessageManager(BaseMessageManager):
         extra_context.update(context)
         message = self.__template.render(extra_context, self.__request)
         return message
+
+    def render_messages(
+        self, messages: Iterable[str], context: dict = None
+    ) -> Iterator[str]:
+        """
+        Renders the template once with a marker in place of the
+        message and splices each message into the output. Falls back to
+        rendering every message when the template changes the marker,
+        e.g. when the message is escaped or passed through filters.
+        """
+        if context is None:
+            context = {}
+        marker = f'<"&\n{uuid.uuid4().hex}\n&">'
+        parts = self.render_message(
+            {**context, 'message': marker}).split(marker)
+        if len(parts) < 2:
+            yield from super().render_messages(messages, context)
+            return
+        for message in messages:
+            yield message.join(parts)
@@ -0,0 +1,225 @@
+"""
+MIME messages serialized once per campaign
+"""
+
+import base64
+import re
+import uuid
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Iterable, Optional, Tuple, Union
+
+from .attachments import PreparedAttachment, prepare_attachments
+
+NEWLINES = re.compile(r'\r\n|\r|\n')
+
+
+def to_crlf(text: str) -> str:
+    """
+    Ends every line with CRLF, as smtplib does with str messages
+
+    :param text: text
+    :type text: str
+    :return: text with CRLF line endings
+    :rtype: str
+    """
+    return NEWLINES.sub('\r\n', text)
+
+
+def create_message(
+    subject: str, sender: str, recipient: str, text: str,
+    html: str = None,
+    attachments: Iterable[Union[dict, PreparedAttachment]] = None,
+) -> MIMEMultipart:
+    """
+    Builds the email with the email package
+
+    :param subject: Email subject
+    :type subject: str
+    :param sender: Email sender
+    :type sender: str
+    :param recipient: Email recipient
+    :type recipient: str
+    :param text: Email text
+    :type text: str
+    :param html: Email html, defaults to None
+    :type html: str, optional
+    :param attachments: Email attachments, defaults to None
+    :type attachments: Iterable[Union[dict, PreparedAttachment]], optional
+    :return: email
+    :rtype: MIMEMultipart
+    """
+    message = MIMEMultipart("alternative")
+    message["Subject"] = subject
+    message["From"] = sender
+    message["To"] = recipient
+
+    message.attach(MIMEText(text, "plain"))
+    if html is not None:
+        message.attach(MIMEText(html, "html"))
+
+    # Parts are built from the base64 content prepared once
+    for attachment in prepare_attachments(attachments):
+        message.attach(attachment.get_part())
+    return message
+
+
+class MimeTemplate:
+    """
+    Email serialized once for a campaign, split around the recipient
+    and the text and html parts.
+
+    The headers, boundaries and attachment parts are kept as CRLF
+    bytes, ready for `sendmail`. Rendering an email only builds the
+    bytes of its own recipient and text parts, the output is the same
+    as serializing `create_message` and passing it to `sendmail` as a
+    str. Emails the template cannot render exactly, e.g. with a long
+    or non ascii recipient, are built with the email package.
+    """
+
+    max_recipient_length = 64
+
+    def __init__(
+        self, subject: str, sender: str, html: bool = True,
+        attachments: Iterable[Union[dict, PreparedAttachment]] = None,
+    ) -> None:
+        """
+        Serialize the parts of the email shared by the campaign
+
+        :param subject: Email subject
+        :type subject: str
+        :param sender: Email sender
+        :type sender: str
+        :param html: emails have an html part, defaults to True
+        :type html: bool, optional
+        :param attachments: Email attachments, defaults to None
+        :type attachments: Iterable[Union[dict, PreparedAttachment]],
+            optional
+        """
+        self.__subject = subject
+        self.__sender = sender
+        self.__html = html
+        self.__attachments = prepare_attachments(attachments)
+        marker = uuid.uuid4().hex
+        message = create_message(
+            subject, sender, marker + 'to', marker + 'text',
+            html=marker + 'html' if html else None,
+            attachments=self.__attachments,
+        )
+        serialized = message.as_string()
+        self.__boundary = message.get_boundary()
+        delimiter = f'\n--{self.__boundary}\n'
+        pieces = []
+        position = 0
+        for field in ('to', 'text', 'html') if html else ('to', 'text'):
+            index = serialized.index(marker + field, position)
+            if field == 'to':
+                pieces.append(serialized[position:index])
+            else:
+                # The whole part is rendered per email, its headers
+                # depend on the charset of the content
+                start = serialized.rindex(delimiter, 0, index)
+                pieces.append(serialized[position:start + len(delimiter)])
+            pieces.append(field)
+            position = index + len(marker + field)
+        pieces.append(serialized[position:])
+        self.__pieces: Tuple[Union[bytes, str], ...] = tuple(
+            piece if index % 2 else to_crlf(piece).encode('ascii')
+            for index, piece in enumerate(pieces)
+        )
+
+    def get_key(self) -> tuple:
+        """
+        Returns the arguments the template was built with
+
+        :return: subject, sender, html and attachments
+        :rtype: tuple
+        """
+        return (
+            self.__subject, self.__sender, self.__html, self.__attachments)
+
+    def encode_content(self, content: str) -> Tuple[str, str, bytes]:
+        """
+        Encodes the text of a part the way `MIMEText` does, ascii text
+        is sent as is and other text as base64 utf-8
+
+        :param content: text of the part
+        :type content: str
+        :return: charset, transfer encoding and encoded text
+        :rtype: Tuple[str, str, bytes]
+        """
+        if content.isascii():
+            return 'us-ascii', '7bit', to_crlf(content).encode('ascii')
+        return 'utf-8', 'base64', base64.encodebytes(
+            content.encode('utf-8')).replace(b'\n', b'\r\n')
+
+    def render_part(
+        self, subtype: str, encoded: Tuple[str, str, bytes]
+    ) -> bytes:
+        """
+        Serializes a text part
+
+        :param subtype: `plain` or `html`
+        :type subtype: str
+        :param encoded: charset, transfer encoding and encoded text
+        :type encoded: Tuple[str, str, bytes]
+        :return: serialized part
+        :rtype: bytes
+        """
+        charset, encoding, body = encoded
+        return (
+            f'Content-Type: text/{subtype}; charset="{charset}"\r\n'
+            'MIME-Version: 1.0\r\n'
+            f'Content-Transfer-Encoding: {encoding}\r\n\r\n'
+        ).encode('ascii') + body
+
+    def can_render(
+        self, recipient: str, text: str, html: Optional[str]
+    ) -> bool:
+        """
+        Check if the email can be rendered from the template
+
+        :return: True if the template renders the email exactly
+        :rtype: bool
+        """
+        if (html is not None) != self.__html:
+            return False
+        if len(recipient) > self.max_recipient_length or not (
+            recipient.isascii() and recipient.isprintable()
+        ):
+            return False
+        boundary = self.__boundary
+        return boundary not in text and (html is None or boundary not in html)
+
+    def render(self, recipient: str, text: str, html: str = None) -> bytes:
+        """
+        Render the email of a recipient
+
+        :param recipient: Email recipient
+        :type recipient: str
+        :param text: Email text
+        :type text: str
+        :param html: Email html, defaults to None
+        :type html: str, optional
+        :return: email ready for `sendmail`
+        :rtype: bytes
+        """
+        if not self.can_render(recipient, text, html):
+            message = create_message(
+                self.__subject, self.__sender, recipient, text, html=html,
+                attachments=self.__attachments,
+            )
+            return to_crlf(message.as_string()).encode('ascii')
+        encoded = self.encode_content(text)
+        fields = {
+            'to': recipient.encode('ascii'),
+            'text': self.render_part('plain', encoded),
+        }
+        if html is not None:
+            if html is not text:
+                encoded = self.encode_content(html)
+            fields['html'] = self.render_part('html', encoded)
+        return b''.join(
+            fields[piece] if isinstance(piece, str) else piece
+            for piece in self.__pieces
+        )
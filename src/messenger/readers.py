@@ -0,0 +1,981 @@
+"""
+Readers for loading receiver data from uploaded files
+"""
+
+import csv
+import hashlib
+import json
+import mmap
+import os
+import uuid
+from contextlib import closing
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Tuple, Type
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from utils.general import file_hash
+from utils.loggers import logger
+
+from .cache import ParsedUploadCache
+
+
+class RowIndex:
+    """
+    Byte offset index of the rows in a csv file.
+
+    The index is built in one pass over a memory map of the file and
+    stored next to it, so any window of rows can be read by seeking
+    straight to its byte range. Newlines inside quoted fields, lone CR
+    line endings and blank lines, spaces and tabs only, are handled
+    the same way as the csv parser.
+
+    The csv parser only opens a quoted field at the start of a field,
+    other quotes are kept as text. Files with such quotes cannot be
+    split by counting quotes, their index is stored empty and they
+    are read with the parser instead.
+    """
+
+    suffix = '.idx.npy'
+    block_size = 1 << 22
+    # Bytes the csv parser treats as blank space between rows
+    blank_bytes = b' \t\r\n'
+    # Bytes a quote opening a quoted field can follow, a quote follows
+    # another one in an escaped quote
+    field_start_bytes = b',\r\n"'
+
+    def __init__(self, file_path: Type[Path]) -> None:
+        self.__file_path = Path(file_path)
+        self.__offsets: Optional[np.ndarray] = None
+
+    def get_file_path(self) -> Type[Path]:
+        """
+        Returns the path of the indexed file
+
+        :return: file path
+        :rtype: Type[Path]
+        """
+        return self.__file_path
+
+    def get_index_path(self) -> Type[Path]:
+        """
+        Returns the path the index is stored at
+
+        :return: index path
+        :rtype: Type[Path]
+        """
+        path = self.get_file_path()
+        return path.with_name(path.name + self.suffix)
+
+    def is_stale(self) -> bool:
+        """
+        Returns True if there is no stored index for the current
+        version of the file
+
+        :return: stale index
+        :rtype: bool
+        """
+        index_path = self.get_index_path()
+        if not index_path.exists():
+            return True
+        return (
+            index_path.stat().st_mtime_ns
+            < self.get_file_path().stat().st_mtime_ns
+        )
+
+    def scan(self) -> np.ndarray:
+        """
+        Scans the file for row boundaries
+
+        :return: start offsets of the data rows followed by the file
+            size, empty when a quote is not at the start of a field
+        :rtype: np.ndarray
+        """
+        size = self.get_file_path().stat().st_size
+        if size == 0:
+            return np.zeros(1, dtype=np.int64)
+        ends = []
+        quotes = 0
+        field_start = np.frombuffer(self.field_start_bytes, dtype=np.uint8)
+        with self.get_file_path().open(mode='rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for pos in range(0, size, self.block_size):
+                count = min(self.block_size, size - pos)
+                block = np.frombuffer(
+                    mm, dtype=np.uint8, offset=pos, count=count)
+                cumulative = np.cumsum(block == ord('"'), dtype=np.int64)
+                # Quotes outside a quoted field must open one
+                positions = np.flatnonzero(block == ord('"'))
+                opening = positions[
+                    (quotes + np.arange(positions.size)) % 2 == 0]
+                previous = opening[opening > 0] - 1
+                if not np.isin(block[previous], field_start).all() or (
+                    opening.size and opening[0] == 0 and pos > 0
+                    and mm[pos - 1] not in self.field_start_bytes
+                ):
+                    del block
+                    return np.zeros(0, dtype=np.int64)
+                # Rows end at LF, CRLF or a lone CR like the csv parser
+                following = np.empty_like(block)
+                following[:-1] = block[1:]
+                following[-1] = mm[pos + count] if pos + count < size else 0
+                breaks = np.flatnonzero(
+                    (block == ord('\n'))
+                    | ((block == ord('\r')) & (following != ord('\n'))))
+                closed = (cumulative[breaks] + quotes) % 2 == 0
+                ends.append(breaks[closed] + pos)
+                quotes += int(cumulative[-1])
+                del block, following
+            ends = np.concatenate(ends)
+            if ends.size == 0 or ends[-1] != size - 1:
+                ends = np.append(ends, size)
+            starts = np.concatenate(([0], ends[:-1] + 1))
+            # Only lines starting with blank space can be blank, lines
+            # of spaces and tabs are skipped by the csv parser too
+            data = np.frombuffer(mm, dtype=np.uint8)
+            blank = starts == ends
+            spaced = np.flatnonzero(~blank)
+            spaced = spaced[np.isin(
+                data[starts[spaced]],
+                np.frombuffer(self.blank_bytes, dtype=np.uint8))]
+            for line in spaced:
+                blank[line] = not mm[
+                    starts[line]:ends[line]].strip(self.blank_bytes)
+            del data
+        starts = starts[~blank]
+        # First non blank line is the header
+        return np.append(starts[1:], size).astype(np.int64)
+
+    def build(self) -> np.ndarray:
+        """
+        Scans the file and stores the index next to it
+
+        :return: row offsets
+        :rtype: np.ndarray
+        """
+        offsets = self.scan()
+        with self.get_index_path().open(mode='wb') as f:
+            np.save(f, offsets)
+        self.__offsets = offsets
+        return offsets
+
+    def load(self) -> np.ndarray:
+        """
+        Loads the stored index, building it first if it is stale
+
+        :return: row offsets
+        :rtype: np.ndarray
+        """
+        if self.__offsets is None:
+            if self.is_stale():
+                return self.build()
+            self.__offsets = np.load(self.get_index_path())
+        return self.__offsets
+
+    def delete(self) -> None:
+        """
+        Deletes the stored index
+        """
+        self.__offsets = None
+        self.get_index_path().unlink(missing_ok=True)
+
+    def is_indexable(self) -> bool:
+        """
+        Returns True if the rows of the file can be read through
+        the index
+
+        :return: indexable file
+        :rtype: bool
+        """
+        return len(self.load()) > 0
+
+    def __len__(self) -> int:
+        return len(self.load()) - 1
+
+    def read_header(self) -> bytes:
+        """
+        Reads the header line of the file
+
+        :return: header bytes
+        :rtype: bytes
+        """
+        with self.get_file_path().open(mode='rb') as f:
+            return f.read(int(self.load()[0]))
+
+    def read_rows(self, start: int, stop: int) -> bytes:
+        """
+        Reads the raw bytes of the rows between start and stop
+        (both inclusive, zero based)
+
+        :param start: first row
+        :type start: int
+        :param stop: last row
+        :type stop: int
+        :return: row bytes
+        :rtype: bytes
+        """
+        offsets = self.load()
+        begin, end = int(offsets[start]), int(offsets[stop + 1])
+        with self.get_file_path().open(mode='rb') as f:
+            f.seek(begin)
+            return f.read(end - begin)
+
+
+class BaseReader:
+    """
+    Base reader for receiver data files.
+
+    Readers can either load the whole file into a dataframe with
+    `load` or stream a window of rows with `iter_chunks`, so memory
+    stays bounded by the chunk size.
+    """
+
+    def __init__(
+        self, file_path: Type[Path], cache: ParsedUploadCache = None,
+        usecols: List[str] = None, convert: bool = False,
+        engine: str = None
+    ) -> None:
+        """
+        :param file_path: path to file
+        :type file_path: Type[Path]
+        :param cache: parsed upload cache, defaults to None
+        :type cache: ParsedUploadCache, optional
+        :param usecols: columns to load, defaults to None
+        :type usecols: List[str], optional
+        :param convert: convert the file to csv on first read, for
+            readers of formats that are slow to read, defaults to False
+        :type convert: bool, optional
+        :param engine: parsing engine, for readers that support more
+            than one, defaults to None
+        :type engine: str, optional
+        """
+        self.__file_path = Path(file_path)
+        self.__cache = cache
+        self.__usecols = usecols
+        self.__convert = convert
+        self.__engine = engine
+        self.__data: Optional[DataFrame] = None
+
+    def get_file_path(self) -> Type[Path]:
+        """
+        Returns the file path
+
+        :return: file path
+        :rtype: Type[Path]
+        """
+        return self.__file_path
+
+    def get_usecols(self) -> Optional[List[str]]:
+        """
+        Returns the columns to load, None loads every column
+
+        :return: columns to load
+        :rtype: Optional[List[str]]
+        """
+        return self.__usecols
+
+    def get_convert(self) -> bool:
+        """
+        Returns True if the file is converted to csv on first read
+
+        :return: convert file
+        :rtype: bool
+        """
+        return self.__convert
+
+    def get_engine(self) -> Optional[str]:
+        """
+        Returns the parsing engine
+
+        :return: parsing engine
+        :rtype: Optional[str]
+        """
+        return self.__engine
+
+    def get_cache(self) -> Optional[ParsedUploadCache]:
+        """
+        Returns the parsed upload cache
+
+        :return: parsed upload cache
+        :rtype: Optional[ParsedUploadCache]
+        """
+        return self.__cache
+
+    def get_cache_key(self) -> str:
+        """
+        Returns the key of the file in the parsed upload cache
+
+        :return: cache key
+        :rtype: str
+        """
+        key = file_hash(self.get_file_path())
+        usecols = self.get_usecols()
+        if usecols is not None:
+            columns = '\x00'.join(sorted(usecols)).encode()
+            key = f'{key}-{hashlib.sha256(columns).hexdigest()[:16]}'
+        return key
+
+    def load(self) -> DataFrame:
+        """
+        Returns the whole file as a dataframe, from the parsed
+        upload cache when the same content was read before. The
+        dataframe is kept by the reader, later calls return it as is.
+
+        :return: file data
+        :rtype: DataFrame
+        """
+        if self.__data is not None:
+            return self.__data
+        cache = self.get_cache()
+        if cache is None:
+            self.__data = self.read()
+            return self.__data
+        key = self.get_cache_key()
+        data = cache.get(key)
+        if data is None:
+            data = self.read()
+            cache.set(key, data)
+        self.__data = data
+        return data
+
+    def iter_loaded_chunks(
+        self, chunksize: int, start: int, stop: int
+    ) -> Iterator[DataFrame]:
+        """
+        Yields chunks sliced from the whole file returned by `load`,
+        for readers that cannot stream the file
+
+        :param chunksize: rows per chunk
+        :type chunksize: int
+        :param start: first row
+        :type start: int
+        :param stop: last row
+        :type stop: int
+        :return: chunks of rows
+        :rtype: Iterator[DataFrame]
+        """
+        data = self.load()
+        for index in range(start, stop + 1, chunksize):
+            yield data.iloc[index:min(index + chunksize, stop + 1)]
+
+    def count_loaded_rows(self, limit: int = None) -> int:
+        """
+        Counts the rows of the whole file returned by `load`
+
+        :param limit: maximum number of rows to count, defaults to None
+        :type limit: int, optional
+        :return: number of rows
+        :rtype: int
+        """
+        rows = self.load().shape[0]
+        if limit is not None:
+            return min(rows, limit)
+        return rows
+
+    def read_columns(self) -> List[str]:
+        """
+        Reads the column names from the header of the file
+
+        :raises NotImplementedError: No read_columns method implemented
+        """
+        raise NotImplementedError('No read_columns method implemented')
+
+    def read(self) -> DataFrame:
+        """
+        Reads the whole file into a dataframe
+
+        :raises NotImplementedError: No read method implemented
+        """
+        raise NotImplementedError('No read method implemented')
+
+    def iter_chunks(
+        self, chunksize: int, start: int, stop: int
+    ) -> Iterator[DataFrame]:
+        """
+        Yields dataframes of at most `chunksize` rows for the rows
+        between start and stop (both inclusive, zero based).
+        Chunks are indexed by the row position in the file.
+
+        :raises NotImplementedError: No iter_chunks method implemented
+        """
+        raise NotImplementedError('No iter_chunks method implemented')
+
+    def count_rows(self, limit: int = None) -> int:
+        """
+        Counts the data rows in the file
+
+        :raises NotImplementedError: No count_rows method implemented
+        """
+        raise NotImplementedError('No count_rows method implemented')
+
+
+class CsvReader(BaseReader):
+    """
+    Reader for csv and compressed csv files.
+    Uncompressed csv files are streamed through a row index.
+
+    Supported engines are `c`, the default pandas parser, and
+    `pyarrow`, the multi-threaded Arrow csv reader, which falls back
+    to `c` when pyarrow is not installed or cannot open the
+    compression.
+    """
+
+    engines = ('c', 'pyarrow')
+    # Compressions the Arrow reader can open
+    arrow_suffixes = ('.csv', '.gz', '.bz2', '.zst')
+    # Values pandas reads as NaN
+    na_values = [
+        '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN',
+        '-nan', '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN',
+        'n/a', 'nan', 'null',
+    ]
+
+    def get_engine(self) -> str:
+        """
+        Returns the parsing engine that will be used
+
+        :raises TypeError: Engine not supported
+        :return: parsing engine
+        :rtype: str
+        """
+        engine = super().get_engine() or 'c'
+        if engine not in self.engines:
+            raise TypeError(
+                f"Csv engine must be one of {', '.join(self.engines)}")
+        suffix = self.get_file_path().suffix.lower()
+        if engine == 'pyarrow' and suffix not in self.arrow_suffixes:
+            return 'c'
+        if engine == 'pyarrow':
+            try:
+                import pyarrow  # noqa
+            except ImportError:
+                logger.warning('pyarrow is not installed, using c engine')
+                return 'c'
+        return engine
+
+    def get_row_index(self) -> Optional[RowIndex]:
+        """
+        Returns the row index of the file, None when the file
+        is compressed and cannot be seeked into, or has quotes
+        the index cannot split rows around
+
+        :return: row index
+        :rtype: Optional[RowIndex]
+        """
+        if self.get_file_path().suffix.lower() != '.csv':
+            return None
+        row_index = RowIndex(self.get_file_path())
+        if not row_index.is_indexable():
+            return None
+        return row_index
+
+    def parse(self, source: Any, columns: List[str]) -> DataFrame:
+        """
+        Parses csv data into a dataframe of strings with the engine
+
+        :param source: file path or file object
+        :type source: Any
+        :param columns: column names in the header of the data
+        :type columns: List[str]
+        :return: parsed data
+        :rtype: DataFrame
+        """
+        usecols = self.get_usecols()
+        if self.get_engine() == 'c':
+            return pd.read_csv(source, dtype=str, usecols=usecols)
+
+        from pyarrow import csv as arrow_csv, string
+
+        if usecols is not None:
+            usecols = [column for column in columns if column in usecols]
+        table = arrow_csv.read_csv(
+            source,
+            read_options=arrow_csv.ReadOptions(use_threads=True),
+            convert_options=arrow_csv.ConvertOptions(
+                column_types={column: string() for column in columns},
+                null_values=self.na_values,
+                strings_can_be_null=True,
+                include_columns=usecols,
+            ),
+        )
+        data = table.to_pandas()
+        return data.where(data.notna(), np.nan)
+
+    def read_columns(self) -> List[str]:
+        return list(pd.read_csv(self.get_file_path(), nrows=0).columns)
+
+    def read(self) -> DataFrame:
+        return self.parse(self.get_file_path(), self.read_columns())
+
+    def iter_chunks(
+        self, chunksize: int, start: int, stop: int
+    ) -> Iterator[DataFrame]:
+        row_index = self.get_row_index()
+        if row_index is not None:
+            yield from self.iter_index_chunks(
+                row_index, chunksize, start, stop)
+            return
+        reader = pd.read_csv(
+            self.get_file_path(), dtype=str, chunksize=chunksize,
+            skiprows=range(1, start + 1), nrows=stop - start + 1,
+            usecols=self.get_usecols()
+        )
+        with reader:
+            for chunk in reader:
+                chunk.index = chunk.index + start
+                yield chunk
+
+    def iter_index_chunks(
+        self, row_index: RowIndex, chunksize: int, start: int, stop: int
+    ) -> Iterator[DataFrame]:
+        """
+        Yields chunks by parsing only the byte range of each chunk
+
+        :param row_index: row index of the file
+        :type row_index: RowIndex
+        """
+        header = row_index.read_header()
+        columns = self.read_columns()
+        for index in range(start, stop + 1, chunksize):
+            last = min(index + chunksize, stop + 1) - 1
+            body = row_index.read_rows(index, last)
+            chunk = self.parse(BytesIO(header + body), columns)
+            chunk.index = chunk.index + index
+            yield chunk
+
+    def count_rows(self, limit: int = None) -> int:
+        """
+        Counts the data rows in the file, using the row index when
+        available, otherwise by parsing only the first column.
+        Counting stops once `limit` rows have been seen.
+
+        :param limit: maximum number of rows to count, defaults to None
+        :type limit: int, optional
+        :return: number of rows
+        :rtype: int
+        """
+        row_index = self.get_row_index()
+        if row_index is not None:
+            rows = len(row_index)
+            return rows if limit is None else min(rows, limit)
+        reader = pd.read_csv(
+            self.get_file_path(), dtype=str, usecols=[0],
+            chunksize=100000, nrows=limit
+        )
+        with reader:
+            return sum(len(chunk) for chunk in reader)
+
+
+class ExcelReader(BaseReader):
+    """
+    Reader for xls and xlsx files, the workbook is loaded in full
+    and sliced into chunks.
+    """
+
+    def read_columns(self) -> List[str]:
+        return list(pd.read_excel(self.get_file_path(), nrows=0).columns)
+
+    def read(self) -> DataFrame:
+        return pd.read_excel(
+            self.get_file_path(), dtype=str, usecols=self.get_usecols())
+
+    def iter_chunks(
+        self, chunksize: int, start: int, stop: int
+    ) -> Iterator[DataFrame]:
+        yield from self.iter_loaded_chunks(chunksize, start, stop)
+
+    def count_rows(self, limit: int = None) -> int:
+        if self.get_cache() is not None:
+            return self.count_loaded_rows(limit=limit)
+        rows = pd.read_excel(
+            self.get_file_path(), dtype=str, usecols=[0]).shape[0]
+        if limit is not None:
+            return min(rows, limit)
+        return rows
+
+
+class XlsxReader(ExcelReader):
+    """
+    Reader for xlsx files that streams rows from the workbook in
+    read only mode, one row at a time. The sheet can be converted to
+    a csv file next to the upload on first read, later reads then go
+    through the csv reader and its row index.
+    """
+
+    converted_suffix = '.csv'
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.__columns: Optional[List[Any]] = None
+
+    @staticmethod
+    def to_str(value: Any) -> Any:
+        """
+        Converts a cell value to a string the same way
+        `pd.read_excel(dtype=str)` does, empty cells become NaN
+        """
+        if value is None:
+            return np.nan
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        return str(value)
+
+    def get_converted_path(self) -> Type[Path]:
+        """
+        Returns the path of the converted csv file
+
+        :return: converted file path
+        :rtype: Type[Path]
+        """
+        path = self.get_file_path()
+        return path.with_name(path.name + self.converted_suffix)
+
+    @staticmethod
+    def get_column_names(header: tuple) -> List[Any]:
+        """
+        Names the columns from the header row the way pandas does,
+        empty header cells are unnamed and duplicates are numbered
+
+        :param header: header row values
+        :type header: tuple
+        :return: column names
+        :rtype: List[Any]
+        """
+        names = []
+        counts = {}
+        for index, value in enumerate(header):
+            name = f'Unnamed: {index}' if value is None else value
+            if name in counts:
+                counts[name] += 1
+                name = f'{name}.{counts[name]}'
+            counts.setdefault(name, 0)
+            names.append(name)
+        return names
+
+    def read_sheet(self) -> Tuple[List[Any], Iterator[Tuple[int, list]]]:
+        """
+        Opens the first sheet in read only mode
+
+        :return: column names and an iterator of the position and
+            string values of each data row. Trailing blank rows are
+            dropped like pandas does.
+        :rtype: Tuple[List[Any], Iterator[Tuple[int, list]]]
+        """
+        # Imported here, openpyxl is only needed for xlsx uploads
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(
+            self.get_file_path(), read_only=True, data_only=True)
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        columns = self.get_column_names(next(rows, ()))
+        self.__columns = columns
+
+        def iter_rows():
+            width = len(columns)
+            blank_row = [np.nan] * width
+            position = 0
+            blanks = 0
+            try:
+                for row in rows:
+                    if all(value is None for value in row):
+                        blanks += 1
+                        continue
+                    for _ in range(blanks):
+                        yield position, list(blank_row)
+                        position += 1
+                    blanks = 0
+                    values = [self.to_str(value) for value in row[:width]]
+                    yield position, values + blank_row[len(values):]
+                    position += 1
+            finally:
+                workbook.close()
+
+        return columns, iter_rows()
+
+    def read_columns(self) -> List[Any]:
+        if self.get_convert():
+            return self.get_converted_reader().read_columns()
+        if self.__columns is None:
+            _, rows = self.read_sheet()
+            rows.close()
+        return self.__columns
+
+    def get_converted_reader(self) -> CsvReader:
+        """
+        Returns a csv reader of the converted sheet, converting
+        the sheet first when it was not converted yet
+
+        :return: converted file reader
+        :rtype: CsvReader
+        """
+        path = self.get_converted_path()
+        if not path.exists() or (
+            path.stat().st_mtime_ns < self.get_file_path().stat().st_mtime_ns
+        ):
+            tmp_path = path.with_name(f'.{uuid.uuid4().hex}.tmp')
+            columns, rows = self.read_sheet()
+            with tmp_path.open(mode='w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                for _, values in rows:
+                    writer.writerow(
+                        '' if value is np.nan else value for value in values)
+            os.replace(tmp_path, path)
+        return CsvReader(
+            path, cache=self.get_cache(), usecols=self.get_usecols(),
+            engine=self.get_engine())
+
+    def read(self) -> DataFrame:
+        if self.get_convert():
+            return self.get_converted_reader().read()
+        return super().read()
+
+    def iter_chunks(
+        self, chunksize: int, start: int, stop: int
+    ) -> Iterator[DataFrame]:
+        if self.get_convert():
+            yield from self.get_converted_reader().iter_chunks(
+                chunksize, start, stop)
+            return
+        columns, rows = self.read_sheet()
+        usecols = self.get_usecols()
+        positions = list(range(len(columns)))
+        if usecols is not None:
+            positions = [
+                index for index, column in enumerate(columns)
+                if column in usecols
+            ]
+            columns = [columns[index] for index in positions]
+        batch = []
+        first = start
+        with closing(rows):
+            for position, values in rows:
+                if position < start:
+                    continue
+                if position > stop:
+                    break
+                batch.append([values[index] for index in positions])
+                if len(batch) == chunksize:
+                    yield DataFrame(
+                        batch, columns=columns,
+                        index=range(first, first + len(batch)))
+                    first += len(batch)
+                    batch = []
+        if batch:
+            yield DataFrame(
+                batch, columns=columns,
+                index=range(first, first + len(batch)))
+
+    def count_rows(self, limit: int = None) -> int:
+        if self.get_convert():
+            return self.get_converted_reader().count_rows(limit=limit)
+        _, rows = self.read_sheet()
+        count = 0
+        with closing(rows):
+            for position, _ in rows:
+                count = position + 1
+                if limit is not None and count >= limit:
+                    break
+        return count
+
+
+def to_str_frame(data: DataFrame) -> DataFrame:
+    """
+    Converts the values of a dataframe to strings, keeping
+    missing values as NaN
+
+    :param data: dataframe of any value types
+    :type data: DataFrame
+    :return: dataframe of strings
+    :rtype: DataFrame
+    """
+    data = data.astype(object)
+    for column in data.columns:
+        data[column] = data[column].map(str, na_action='ignore')
+    return data.where(data.notna(), np.nan)
+
+
+class JsonLinesReader(BaseReader):
+    """
+    Reader for json lines files, one json object per line.
+    The columns are the keys of the first object.
+    """
+
+    def read_columns(self) -> List[str]:
+        for record in self.iter_records():
+            return list(record.keys())
+        return []
+
+    def iter_records(self) -> Iterator[dict]:
+        """
+        Yields the object on each non blank line
+
+        :return: records
+        :rtype: Iterator[dict]
+        """
+        with self.get_file_path().open(mode='rb') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def to_frame(self, records: List[dict], index: int) -> DataFrame:
+        """
+        Builds a dataframe of strings from records
+
+        :param records: records
+        :type records: List[dict]
+        :param index: row position of the first record
+        :type index: int
+        :return: dataframe of the records
+        :rtype: DataFrame
+        """
+        columns = self.get_usecols()
+        if columns is None:
+            columns = self.read_columns()
+        data = DataFrame(
+            {
+                column: pd.Series(
+                    [record.get(column) for record in records], dtype=object)
+                for column in columns
+            },
+            columns=columns,
+        )
+        data.index = range(index, index + len(records))
+        return to_str_frame(data)
+
+    def read(self) -> DataFrame:
+        return self.to_frame(list(self.iter_records()), 0)
+
+    def iter_chunks(
+        self, chunksize: int, start: int, stop: int
+    ) -> Iterator[DataFrame]:
+        batch = []
+        first = start
+        for position, record in enumerate(self.iter_records()):
+            if position < start:
+                continue
+            if position > stop:
+                break
+            batch.append(record)
+            if len(batch) == chunksize:
+                yield self.to_frame(batch, first)
+                first += len(batch)
+                batch = []
+        if batch:
+            yield self.to_frame(batch, first)
+
+    def count_rows(self, limit: int = None) -> int:
+        rows = 0
+        with self.get_file_path().open(mode='rb') as f:
+            for line in f:
+                if line.strip():
+                    rows += 1
+                    if limit is not None and rows >= limit:
+                        break
+        return rows
+
+
+class ParquetReader(BaseReader):
+    """
+    Reader for parquet files, needs pyarrow installed. Only the
+    projected columns are read, and chunks are streamed in record
+    batches skipping row groups before the start row.
+    """
+
+    def get_parquet_file(self):
+        """
+        Opens the parquet file
+
+        :raises TypeError: pyarrow is not installed
+        :return: parquet file
+        :rtype: pyarrow.parquet.ParquetFile
+        """
+        try:
+            from pyarrow.parquet import ParquetFile
+        except ImportError:
+            raise TypeError('pyarrow must be installed to read parquet files')
+        return ParquetFile(self.get_file_path())
+
+    @staticmethod
+    def to_frame(table, index: int) -> DataFrame:
+        """
+        Converts an arrow table or record batch to a dataframe
+        of strings
+
+        :param index: row position of the first row
+        :type index: int
+        :return: dataframe of the rows
+        :rtype: DataFrame
+        """
+        data = table.to_pandas(
+            integer_object_nulls=True, date_as_object=True,
+            timestamp_as_object=True)
+        data.index = range(index, index + len(data))
+        return to_str_frame(data)
+
+    def read_columns(self) -> List[str]:
+        return list(self.get_parquet_file().schema_arrow.names)
+
+    def read(self) -> DataFrame:
+        return self.to_frame(
+            self.get_parquet_file().read(columns=self.get_usecols()), 0)
+
+    def iter_chunks(
+        self, chunksize: int, start: int, stop: int
+    ) -> Iterator[DataFrame]:
+        parquet_file = self.get_parquet_file()
+        metadata = parquet_file.metadata
+        row_groups = []
+        position = None
+        offset = 0
+        for group in range(metadata.num_row_groups):
+            rows = metadata.row_group(group).num_rows
+            if offset + rows > start and offset <= stop:
+                row_groups.append(group)
+                if position is None:
+                    position = offset
+            offset += rows
+        if not row_groups:
+            return
+        batches = parquet_file.iter_batches(
+            batch_size=chunksize, row_groups=row_groups,
+            columns=self.get_usecols())
+        pending = []
+        for batch in batches:
+            first, position = position, position + batch.num_rows
+            if position <= start:
+                continue
+            batch = batch.slice(
+                max(start - first, 0),
+                min(position, stop + 1) - max(first, start))
+            pending.append(self.to_frame(batch, max(first, start)))
+            data = pd.concat(pending)
+            while len(data) >= chunksize:
+                yield data.iloc[:chunksize]
+                data = data.iloc[chunksize:]
+            pending = [data] if len(data) else []
+            if position > stop:
+                break
+        if pending:
+            yield pending[0]
+
+    def count_rows(self, limit: int = None) -> int:
+        rows = self.get_parquet_file().metadata.num_rows
+        if limit is not None:
+            return min(rows, limit)
+        return rows
+
+
+def delete_artifacts(file_path: Type[Path]) -> None:
+    """
+    Deletes the files readers store next to an upload
+
+    :param file_path: path to the upload
+    :type file_path: Type[Path]
+    """
+    converted_path = XlsxReader(file_path).get_converted_path()
+    for path in [file_path, converted_path]:
+        RowIndex(path).delete()
+    converted_path.unlink(missing_ok=True)
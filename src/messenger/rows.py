@@ -0,0 +1,59 @@
+"""
+Row access over receiver data
+"""
+
+from typing import Iterator, List
+
+from pandas import DataFrame
+
+
+class Rows:
+    """
+    Rows of a dataframe read straight from its raw column arrays.
+
+    Building a dict per row this way skips the Series that
+    `DataFrame.loc[index].to_dict()` creates for every row.
+    Rows are addressed by the index labels of the dataframe.
+    """
+
+    __slots__ = ('__columns', '__arrays', '__index')
+
+    def __init__(self, data: DataFrame) -> None:
+        self.__columns: List[str] = list(data.columns)
+        self.__arrays = [
+            data[column].to_numpy(dtype=object) for column in self.__columns
+        ]
+        self.__index = data.index
+
+    def get_columns(self) -> List[str]:
+        """
+        Returns the column names
+
+        :return: column names
+        :rtype: List[str]
+        """
+        return self.__columns
+
+    def get(self, index: int) -> dict:
+        """
+        Returns a dictionary of the row at the index label
+
+        :param index: index label of the row
+        :type index: int
+        :raises KeyError: Index not in data
+        :return: row data
+        :rtype: dict
+        """
+        position = self.__index.get_loc(index)
+        return {
+            column: array[position]
+            for column, array in zip(self.__columns, self.__arrays)
+        }
+
+    def __iter__(self) -> Iterator[dict]:
+        columns = self.__columns
+        for values in zip(*self.__arrays):
+            yield dict(zip(columns, values))
+
+    def __len__(self) -> int:
+        return len(self.__index)
@@ -0,0 +1,239 @@
+"""
+SMS encoding and segment counts
+"""
+
+import math
+import re
+import unicodedata
+from typing import Optional, Tuple
+
+import numpy as np
+from pandas import DataFrame, Series
+
+GSM_7 = 'GSM-7'
+UCS_2 = 'UCS-2'
+
+# GSM 03.38 basic character set and extension table, extension
+# characters take two septets
+GSM_BASIC = (
+    '@£$¥èéùìòÇ\nØø\rÅåΔ_ΦΓΛΩΠΨΣΘΞÆæßÉ !"#¤%&\'()*+,-./0123456789:;<=>?'
+    '¡ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÑÜ§¿abcdefghijklmnopqrstuvwxyzäöñüà'
+)
+GSM_EXTENSION = '\f^{}\\[~]|€'
+
+# Class of every code point of the basic multilingual plane, the
+# code points above it are looked up as U+FFFF, outside GSM-7
+BASIC, EXTENSION, NON_GSM = 0, 1, 2
+CHAR_CLASSES = np.full(0x10000, NON_GSM, dtype=np.uint8)
+CHAR_CLASSES[[0] + [ord(char) for char in GSM_BASIC]] = BASIC
+CHAR_CLASSES[[ord(char) for char in GSM_EXTENSION]] = EXTENSION
+# Messages classified at once, bounds the code point arrays
+PLAN_BLOCK_SIZE = 1000
+
+GSM_PATTERN = '[%s]*' % re.escape(GSM_BASIC + GSM_EXTENSION)
+EXTENSION_PATTERN = '[%s]' % re.escape(GSM_EXTENSION)
+# Characters outside the basic multilingual plane, e.g. most emojis,
+# take two UCS-2 code units
+ASTRAL_PATTERN = '[\U00010000-\U0010FFFF]'
+
+# Single segment limits and the limits of each part of a
+# concatenated message, which carries a header
+SEGMENT_LIMITS = {GSM_7: (160, 153), UCS_2: (70, 67)}
+
+
+def create_transliteration() -> dict:
+    """
+    Builds the `str.translate` table replacing characters outside GSM-7
+    with GSM-7 look-alikes
+
+    :return: translation table
+    :rtype: dict
+    """
+    table = {
+        ord(char): replacement
+        for chars, replacement in (
+            ('\u2018\u2019\u201a\u201b\u2032\u2039\u203a`\u00b4', "'"),
+            ('\u201c\u201d\u201e\u201f\u2033\u00ab\u00bb', '"'),
+            ('\u2010\u2011\u2012\u2013\u2014\u2015\u2212', '-'),
+            ('\t\u00a0\u2002\u2003\u2009\u202f', ' '),
+            ('\u200b\u200c\u200d\u2060\ufeff', ''),
+            ('\u2026', '...'),
+            ('\u2022\u00b7', '*'),
+            ('\u2122', 'TM'),
+            ('\u00a9', '(C)'),
+            ('\u00ae', '(R)'),
+        )
+        for char in chars
+    }
+    # Latin letters without a decomposition
+    table.update({
+        ord(char): replacement for char, replacement in (
+            ('Ł', 'L'), ('ł', 'l'), ('Đ', 'D'), ('đ', 'd'), ('Ð', 'D'),
+            ('ð', 'd'), ('Þ', 'Th'), ('þ', 'th'), ('Œ', 'OE'),
+            ('œ', 'oe'), ('ı', 'i'),
+        )
+    })
+    for code in range(0xC0, 0x250):
+        # Accented latin letters outside GSM-7 lose their accents
+        char = chr(code)
+        if char in GSM_BASIC:
+            continue
+        base = ''.join(
+            part for part in unicodedata.normalize('NFKD', char)
+            if not unicodedata.combining(part))
+        if base != char and base.isascii() and base.isalpha():
+            table[code] = base
+    return table
+
+
+TRANSLITERATION = create_transliteration()
+
+
+def transliterate(messages: Series) -> Series:
+    """
+    Replaces characters outside GSM-7 with GSM-7 look-alikes, e.g.
+    curly quotes, dashes and accented letters. Characters without a
+    look-alike, like emojis, are kept.
+
+    :param messages: messages
+    :type messages: Series
+    :return: transliterated messages
+    :rtype: Series
+    """
+    return messages.str.translate(TRANSLITERATION)
+
+
+def plan_segments(
+    messages: Series, transliterated: bool = False
+) -> DataFrame:
+    """
+    Computes the encoding, length and billable segments of every
+    message at once. Blocks of messages are viewed as arrays of code
+    points and classified with lookup tables, without a python loop
+    over the messages or their characters.
+
+    :param messages: messages as they are sent
+    :type messages: Series
+    :param transliterated: count the messages after `transliterate`,
+        defaults to False
+    :type transliterated: bool, optional
+    :return: encoding, length in septets or code units and segments,
+        indexed like messages
+    :rtype: DataFrame
+    """
+    messages = messages.astype(str)
+    if transliterated:
+        messages = transliterate(messages)
+    values = messages.tolist()
+    lengths, is_gsm, extension, astral = (
+        np.zeros(len(values), dtype=dtype)
+        for dtype in (np.int64, bool, np.int64, np.int64)
+    )
+    for start in range(0, len(values), PLAN_BLOCK_SIZE):
+        block = slice(start, start + PLAN_BLOCK_SIZE)
+        # Shorter messages are padded with 0 code points
+        points = np.array(values[block], dtype=str)
+        points = points.view(np.uint32).reshape(len(points), -1)
+        classes = CHAR_CLASSES[np.minimum(points, 0xFFFF)]
+        lengths[block] = np.count_nonzero(points, axis=1)
+        is_gsm[block] = ~(classes == NON_GSM).any(axis=1)
+        extension[block] = np.count_nonzero(classes == EXTENSION, axis=1)
+        astral[block] = np.count_nonzero(points > 0xFFFF, axis=1)
+    length = np.where(is_gsm, lengths + extension, lengths + astral)
+    single, part = np.where(
+        is_gsm[:, None], SEGMENT_LIMITS[GSM_7], SEGMENT_LIMITS[UCS_2]).T
+    segments = np.where(length <= single, 1, -(-length // part))
+    return DataFrame({
+        'encoding': np.where(is_gsm, GSM_7, UCS_2),
+        'length': length,
+        'segments': segments,
+    }, index=messages.index)
+
+
+def count_segments(message: str) -> Tuple[str, int]:
+    """
+    Returns the encoding and billable segments of one message
+
+    :param message: message as it is sent
+    :type message: str
+    :return: encoding and segments
+    :rtype: Tuple[str, int]
+    """
+    if re.fullmatch(GSM_PATTERN, message):
+        encoding = GSM_7
+        length = len(message) + len(re.findall(EXTENSION_PATTERN, message))
+    else:
+        encoding = UCS_2
+        length = len(message) + len(re.findall(ASTRAL_PATTERN, message))
+    single, part = SEGMENT_LIMITS[encoding]
+    if length <= single:
+        return encoding, 1
+    return encoding, math.ceil(length / part)
+
+
+class SegmentReport:
+    """
+    Summary of a campaign's segment plan. Plans are added a batch at a
+    time and only their totals are kept, so the report of a large
+    campaign takes constant memory.
+    """
+
+    def __init__(self, rate: float = 0) -> None:
+        """
+        :param rate: segments sent per second, 0 for no limit,
+            defaults to 0
+        :type rate: float, optional
+        """
+        self.__rate = rate
+        self.__rows = 0
+        self.__segments = 0
+        self.__ucs2_rows = 0
+
+    def add(self, plan: DataFrame) -> None:
+        """
+        Adds the totals of a batch's segment plan to the report
+
+        :param plan: segment plan of a batch of rows
+        :type plan: DataFrame
+        """
+        self.__rows += len(plan)
+        self.__segments += int(plan['segments'].sum())
+        self.__ucs2_rows += int((plan['encoding'] == UCS_2).sum())
+
+    def get_rows(self) -> int:
+        return self.__rows
+
+    def get_total_segments(self) -> int:
+        return self.__segments
+
+    def get_ucs2_rows(self) -> int:
+        """
+        Returns the number of rows sent as UCS-2
+
+        :return: UCS-2 rows
+        :rtype: int
+        """
+        return self.__ucs2_rows
+
+    def get_duration(self) -> Optional[float]:
+        """
+        Returns the expected send duration in seconds at the segment
+        rate, None when the rate is not limited
+
+        :return: duration
+        :rtype: Optional[float]
+        """
+        if self.__rate <= 0:
+            return None
+        return self.get_total_segments() / self.__rate
+
+    def __str__(self) -> str:
+        summary = (
+            f'{self.get_rows()} messages, '
+            f'{self.get_total_segments()} segments, '
+            f'{self.get_ucs2_rows()} sent as {UCS_2}'
+        )
+        duration = self.get_duration()
+        if duration is not None:
+            summary += f', about {math.ceil(duration)} seconds to send'
+        return summary
@@ -2,7 +2,9 @@
 Managers for email sending
 """
 
-from typing import Optional
+import asyncio
+from functools import partial
+from typing import Dict, List, Optional
 
 
 class BaseSenderManager:
@@ -20,6 +22,49 @@ class BaseSenderManager:
         """
         raise NotImplementedError('No recipient key')
 
+    def is_thread_safe(self) -> bool:
+        """
+        Returns True if messages can be sent from many threads at once
+
+        :return: thread safe
+        :rtype: bool
+        """
+        return True
+
+    def get_batch_size(self) -> int:
+        """
+        Returns the maximum number of recipients sent in one request,
+        1 when the sender manager cannot send batches
+
+        :return: batch size
+        :rtype: int
+        """
+        return 1
+
+    def get_fanout_size(self) -> int:
+        """
+        Returns the maximum number of recipients an identical message
+        is sent to at once, 1 when the sender manager cannot send
+        batches
+
+        :return: fan-out size
+        :rtype: int
+        """
+        return self.get_batch_size()
+
+    def get_substitution_tag(self, key: str) -> str:
+        """
+        Returns the tag put in a batch message in place of a
+        placeholder, it is replaced with the recipient's value
+        when the batch is sent
+
+        :param key: placeholder column
+        :type key: str
+        :return: substitution tag
+        :rtype: str
+        """
+        raise NotImplementedError('No substitution tag')
+
     def set_debug(self) -> None:
         self.__debug = True
 
@@ -71,3 +116,139 @@ class BaseSenderManager:
             if not fail:
                 raise e
         return False
+
+    def send_batch(self, **kwargs) -> List[bool]:
+        raise NotImplementedError('No send_batch function')
+
+    def send_batch_message(
+        self, message: str, recipients: List[str],
+        substitutions: List[Dict[str, str]], fail: bool = False,
+        **kwargs
+    ) -> List[bool]:
+        """
+        Sends one message to many recipients, the substitution tags in
+        the message are replaced with each recipient's values
+
+        :param message: message with substitution tags
+        :type message: str
+        :param recipients: recipients of the batch
+        :type recipients: List[str]
+        :param substitutions: values by placeholder column,
+            of each recipient
+        :type substitutions: List[Dict[str, str]]
+        :param fail: return False instead of raising errors,
+            defaults to False
+        :type fail: bool, optional
+        :return: message sent, for each recipient
+        :rtype: List[bool]
+        """
+        self.print_message(message)
+
+        if self.__block_send:
+            return [True] * len(recipients)
+
+        try:
+            kwargs.update(
+                message=message, recipients=recipients,
+                substitutions=substitutions
+            )
+            return self.send_batch(**kwargs)
+        except Exception as e:
+            if not fail:
+                raise e
+        return [False] * len(recipients)
+
+    async def send_async(self, **kwargs) -> bool:
+        """
+        Sends a message from a coroutine, runs `send` in the event
+        loop's default executor unless overridden with a native
+        async implementation
+
+        :return: message sent
+        :rtype: bool
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(self.send, **kwargs))
+
+    async def send_message_async(
+        self, message: str, fail: bool = False,
+        **kwargs
+    ) -> bool:
+        """
+        Async version of `send_message`
+
+        :param message: message to be sent
+        :type message: str
+        :param fail: return False instead of raising errors,
+            defaults to False
+        :type fail: bool, optional
+        :return: message sent
+        :rtype: bool
+        """
+        self.print_message(message)
+
+        if self.__block_send:
+            return True
+
+        try:
+            kwargs['message'] = message
+            return await self.send_async(**kwargs)
+        except Exception as e:
+            if not fail:
+                raise e
+        return False
+
+    async def send_batch_async(self, **kwargs) -> List[bool]:
+        """
+        Sends a batch from a coroutine, runs `send_batch` in the event
+        loop's default executor unless overridden with a native
+        async implementation
+
+        :return: message sent, for each recipient
+        :rtype: List[bool]
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, partial(self.send_batch, **kwargs))
+
+    async def send_batch_message_async(
+        self, message: str, recipients: List[str],
+        substitutions: List[Dict[str, str]], fail: bool = False,
+        **kwargs
+    ) -> List[bool]:
+        """
+        Async version of `send_batch_message`
+
+        :param message: message with substitution tags
+        :type message: str
+        :param recipients: recipients of the batch
+        :type recipients: List[str]
+        :param substitutions: values by placeholder column,
+            of each recipient
+        :type substitutions: List[Dict[str, str]]
+        :param fail: return False instead of raising errors,
+            defaults to False
+        :type fail: bool, optional
+        :return: message sent, for each recipient
+        :rtype: List[bool]
+        """
+        self.print_message(message)
+
+        if self.__block_send:
+            return [True] * len(recipients)
+
+        try:
+            kwargs.update(
+                message=message, recipients=recipients,
+                substitutions=substitutions
+            )
+            return await self.send_batch_async(**kwargs)
+        except Exception as e:
+            if not fail:
+                raise e
+        return [False] * len(recipients)
+
+    async def close_async(self) -> None:
+        """
+        Releases resources opened for async sending
+        """
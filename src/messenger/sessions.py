@@ -0,0 +1,74 @@
+"""
+Pooled http sessions shared between email managers
+"""
+
+import threading
+from typing import Dict, Hashable
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class SessionPool:
+    """
+    Registry of keep-alive requests sessions.
+
+    Managers created for the same api credentials get the same session,
+    so the connections a campaign opens are reused by the campaigns
+    after it instead of paying a new TCP and TLS handshake per message.
+    """
+
+    def __init__(self) -> None:
+        self.__sessions: Dict[Hashable, requests.Session] = {}
+        self.__lock = threading.Lock()
+
+    def create_session(self, pool_size: int) -> requests.Session:
+        """
+        Creates a session keeping up to `pool_size` connections
+        open per host
+
+        :param pool_size: connections kept open per host
+        :type pool_size: int
+        :return: session
+        :rtype: requests.Session
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def get(self, key: Hashable, pool_size: int) -> requests.Session:
+        """
+        Returns the session for the key, creates it if needed
+
+        :param key: key of the credentials using the session
+        :type key: Hashable
+        :param pool_size: connections kept open per host
+        :type pool_size: int
+        :return: session
+        :rtype: requests.Session
+        """
+        key = (key, pool_size)
+        with self.__lock:
+            session = self.__sessions.get(key)
+            if session is None:
+                session = self.create_session(pool_size)
+                self.__sessions[key] = session
+            return session
+
+    def clear(self) -> None:
+        """
+        Closes all the sessions
+        """
+        with self.__lock:
+            sessions = list(self.__sessions.values())
+            self.__sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def __len__(self) -> int:
+        return len(self.__sessions)
+
+
+session_pool = SessionPool()
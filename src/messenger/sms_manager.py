@@ -2,26 +2,121 @@
 Managers for email sending
 """
 
-from typing import overload
+import asyncio
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Optional, Tuple, overload
 
 from django.conf import settings
+from twilio.http.async_http_client import AsyncTwilioHttpClient
 from twilio.rest import Client
 
+from .segments import TRANSLITERATION, count_segments
 from .sender_manager import BaseSenderManager
 
 
+@lru_cache(maxsize=None)
+def get_client(sid: str, token: str) -> Client:
+    """
+    Returns the twilio client of an account, shared by its campaigns so
+    they reuse the client's keep-alive connections
+
+    :param sid: twilio sid
+    :type sid: str
+    :param token: twilio token
+    :type token: str
+    :return: twilio client
+    :rtype: Client
+    """
+    return Client(sid, token)
+
+
+class RateLimiter:
+    """
+    Spaces out the messages sent from one number to `rate` segments
+    per second. Send slots are reserved under a lock, so one limiter
+    is shared by threads and event loops alike.
+    """
+
+    def __init__(self, rate: float) -> None:
+        """
+        :param rate: segments per second, 0 for no limit
+        :type rate: float
+        """
+        self.__rate = rate
+        self.__interval = 1 / rate if rate > 0 else 0
+        self.__next = 0.0
+        self.__lock = threading.Lock()
+
+    def get_rate(self) -> float:
+        return self.__rate
+
+    def reserve(self, weight: int = 1) -> float:
+        """
+        Reserves the next send slot
+
+        :param weight: messages, or segments, sent in the slot,
+            defaults to 1
+        :type weight: int, optional
+        :return: seconds to wait before sending
+        :rtype: float
+        """
+        if not self.__interval:
+            return 0
+        with self.__lock:
+            now = time.monotonic()
+            slot = max(now, self.__next)
+            self.__next = slot + self.__interval * weight
+        return slot - now
+
+    def wait(self, weight: int = 1) -> None:
+        delay = self.reserve(weight)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self, weight: int = 1) -> None:
+        delay = self.reserve(weight)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+_limiters: Dict[Tuple[str, float], RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(number: str, rate: float) -> RateLimiter:
+    """
+    Returns the rate limiter of a sender number, shared by the
+    campaigns sending from the number
+
+    :param number: sender number
+    :type number: str
+    :param rate: segments per second, 0 for no limit
+    :type rate: float
+    :return: rate limiter
+    :rtype: RateLimiter
+    """
+    key = (number, rate)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = _limiters[key] = RateLimiter(rate)
+        return limiter
+
+
 class SmsManager(BaseSenderManager):
 
     @overload
     def __init__(
         self, sid: str, token: str, sender: str,
-        debug: bool, block_send: bool
+        debug: bool, block_send: bool, rate: float, transliterated: bool
     ) -> None:
         ...
 
     def __init__(
         self, sid: str, token: str,
-        *args, **kwargs
+        *args, rate: float = None, transliterated: bool = None, **kwargs
     ) -> None:
         """
         Twilio SMS manager
@@ -32,13 +127,41 @@ class SmsManager(BaseSenderManager):
         :type token: str
         :param sender: sender phone number for twilio (e.g. +1234567890)
         :type sender: str
+        :param rate: segments per second sent from the sender number,
+            0 for no limit, defaults to the TWILIO_NUMBER_RATE setting
+        :type rate: float, optional
+        :param transliterated: replace characters outside GSM-7 with
+            look-alikes before sending, defaults to the
+            SMS_TRANSLITERATE setting
+        :type transliterated: bool, optional
         """
         super().__init__(*args, **kwargs)
-        self.client = Client(sid, token)
+        if rate is None:
+            rate = settings.TWILIO_NUMBER_RATE
+        if transliterated is None:
+            transliterated = settings.SMS_TRANSLITERATE
+        self.transliterated = transliterated
+        self.sid = sid
+        self.token = token
+        self.client = get_client(sid, token)
+        self.limiter = get_rate_limiter(self.get_sender(), rate)
 
     def get_recipient_field(self) -> str:
         return settings.RECEIPIENT_SMS_KEY
 
+    def prepare_message(self, message: str) -> Tuple[str, int]:
+        """
+        Transliterates the message if enabled and counts its segments
+
+        :param message: message to send
+        :type message: str
+        :return: message as it is sent and its segments
+        :rtype: Tuple[str, int]
+        """
+        if self.transliterated:
+            message = message.translate(TRANSLITERATION)
+        return message, count_segments(message)[1]
+
     def send(
         self, recipient: str, message: str, **kwargs
     ) -> bool:
@@ -52,9 +175,79 @@ class SmsManager(BaseSenderManager):
         :return: success of sending message
         :rtype: bool
         """
+        message, segments = self.prepare_message(message)
+        self.limiter.wait(segments)
         message = self.client.messages.create(
             body=message,
             from_=self.get_sender(),
             to=recipient
         )
         return True
+
+
+class AsyncSmsManager(SmsManager):
+    """
+    Twilio SMS manager sending with twilio's aiohttp client. The client
+    is opened on the first send and closed by `close_async` once the
+    messenger is done, at most `concurrency` requests are in flight.
+    """
+
+    @overload
+    def __init__(
+        self, sid: str, token: str, sender: str,
+        debug: bool, block_send: bool, rate: float,
+        transliterated: bool, concurrency: int
+    ) -> None:
+        ...
+
+    def __init__(
+        self, *args, concurrency: int = None, **kwargs
+    ) -> None:
+        """
+        :param concurrency: requests in flight at once, defaults to
+            the TWILIO_CONCURRENCY setting
+        :type concurrency: int, optional
+        """
+        super().__init__(*args, **kwargs)
+        if concurrency is None:
+            concurrency = settings.TWILIO_CONCURRENCY
+        self.__concurrency = concurrency
+        self.__client: Optional[Client] = None
+        self.__semaphore: Optional[asyncio.Semaphore] = None
+
+    def get_concurrency(self) -> int:
+        return self.__concurrency
+
+    def get_async_client(self) -> Client:
+        """
+        Returns the twilio client of the async sends, opens it if
+        needed. Its aiohttp session belongs to the running event loop.
+
+        :return: twilio client
+        :rtype: Client
+        """
+        if self.__client is None:
+            self.__client = Client(
+                self.sid, self.token, http_client=AsyncTwilioHttpClient())
+            self.__semaphore = asyncio.Semaphore(self.__concurrency)
+        return self.__client
+
+    async def send_async(
+        self, recipient: str, message: str, **kwargs
+    ) -> bool:
+        client = self.get_async_client()
+        message, segments = self.prepare_message(message)
+        await self.limiter.wait_async(segments)
+        async with self.__semaphore:
+            await client.messages.create_async(
+                body=message,
+                from_=self.get_sender(),
+                to=recipient
+            )
+        return True
+
+    async def close_async(self) -> None:
+        client, self.__client = self.__client, None
+        self.__semaphore = None
+        if client is not None:
+            await client.http_client.close()
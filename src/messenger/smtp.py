@@ -1,39 +1,35 @@
+import queue
 import smtplib
 import ssl
-from contextlib import ContextDecorator
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email import encoders
-from email.mime.base import MIMEBase
+import threading
+import time
+from contextlib import ContextDecorator, contextmanager
+from typing import Any, Callable, Dict, Iterator, Tuple
+from messenger.attachments import PreparedAttachment
+from messenger.dkim import DkimSigner
+from messenger.mime import create_message, to_crlf
 from utils.loggers import err_logger, logger  # noqa
 
 
-class SingletonMeta(type):
-    """
-    A metaclass for creating a singleton class.
-    """
-    _instances = {}
-
-    def __call__(cls, *args, **kwargs):
-        if cls not in cls._instances:
-            instance = super().__call__(*args, **kwargs)
-            cls._instances[cls] = instance
-        return cls._instances[cls]
-
-class EmailConnection(ContextDecorator, metaclass=SingletonMeta):
+class EmailConnection(ContextDecorator):
     """
     This class is responsible for connecting to the
     email server and sending the email.
     """
 
-    def __init__(self, host: str, port: int, username: str, password: str):
+    def __init__(
+        self, host: str, port: int, username: str, password: str,
+        use_tls: bool = True,
+    ):
         self.host = host
         self.port = port
         self.username = username
         self.password = password
+        self.use_tls = use_tls
         self.connection = None
         self.context = ssl.create_default_context()
-    
+        self.sent = 0
+        self.last_used = time.monotonic()
 
     def __enter__(self):
         if self.connection is not None:
@@ -46,15 +42,45 @@ class EmailConnection(ContextDecorator, metaclass=SingletonMeta):
             )
         else:
             self.connection = smtplib.SMTP(self.host, self.port)
-            self.connection.starttls(context=self.context)
+            if self.use_tls:
+                self.connection.starttls(context=self.context)
         logger.info("Logging into the email server")
         self.connection.login(self.username, self.password)
         logger.info("Successfully logged in")
+        self.sent = 0
+        self.last_used = time.monotonic()
         return self
 
+    def is_alive(self) -> bool:
+        """
+        Check the session with a NOOP command
+
+        :return: True if the server answered
+        :rtype: bool
+        """
+        if self.connection is None:
+            return False
+        try:
+            return self.connection.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
     def __exit__(self, *exc):
         logger.info("Disconnecting from the email server")
-        self.connection.quit()
+        self.close()
+
+    def close(self):
+        """
+        Quit the session, the socket is closed even if the server
+        does not answer
+        """
+        connection, self.connection = self.connection, None
+        if connection is None:
+            return
+        try:
+            connection.quit()
+        except (smtplib.SMTPException, OSError):
+            connection.close()
 
     def send(
         self,
@@ -63,7 +89,8 @@ class EmailConnection(ContextDecorator, metaclass=SingletonMeta):
         text: str,
         sender: str,
         html: str = None,
-        attachments: list[dict[str, bytes | str]] = None,
+        attachments: list[dict[str, bytes | str] | PreparedAttachment] = None,
+        signer: DkimSigner = None,
     ):
         """
         Send email
@@ -78,42 +105,322 @@ class EmailConnection(ContextDecorator, metaclass=SingletonMeta):
         :type sender: str
         :param html: Email html, defaults to None
         :type html: str, optional
-        :param attachments: Email attachments in the form of a list of dictionaries of the form {"filename": str, "data": bytes}, defaults to None
-        :type attachments: list[dict[str, bytes  |  str]], optional
+        :param attachments: Email attachments in the form of a list of dictionaries of the form {"filename": str, "data": bytes} or of prepared attachments, defaults to None
+        :type attachments: list[dict[str, bytes  |  str] | PreparedAttachment], optional
+        :param signer: DKIM signer of the email, defaults to None
+        :type signer: DkimSigner, optional
         :return: True if email is sent successfully else raise exception
         :rtype: bool
         """
-        message = MIMEMultipart("alternative")
-        message["Subject"] = subject
-        message["From"] = sender
-        message["To"] = recipient
-
-        message.attach(MIMEText(text, "plain"))
-        if html is not None:
-            message.attach(MIMEText(html, "html"))
-
-        if attachments is not None:
-            logger.info("Adding attachments to the email")
-            for attachment in attachments:
-                part = MIMEBase("application", "octet-stream")
-                part.set_payload(attachment["data"])
-                encoders.encode_base64(part)
-                filename = attachment["filename"]
-                part.add_header(
-                    "Content-Disposition",
-                    f"attachment; filename= {filename}",
-                )
-                message.attach(part)
+        message = create_message(
+            subject, sender, recipient, text, html=html,
+            attachments=attachments,
+        )
+        if signer is None:
+            self.send_bytes(recipient, message.as_string())
+        else:
+            data = to_crlf(message.as_string()).encode('ascii')
+            self.send_bytes(recipient, signer.sign(data))
+        return True
 
+    def send_bytes(self, recipients: str | list[str], data: bytes | str):
+        """
+        Send a serialized email
+
+        :param recipients: Email recipient or recipients
+        :type recipients: str | list[str]
+        :param data: Email, bytes with CRLF line endings or str
+        :type data: bytes | str
+        :return: refused recipients, as returned by `sendmail`
+        :rtype: dict
+        """
         try:
-            self.connection.sendmail(self.username, recipient, message.as_string())
-            return True
+            refused = self.connection.sendmail(self.username, recipients, data)
+            self.sent += 1
+            self.last_used = time.monotonic()
+            return refused
         except Exception as e:
             err_logger.error(f"Failed to send email: {e}")
             err_logger.exception(e)
             raise e
 
 
+def is_disconnect(error: Exception) -> bool:
+    """
+    Check if the error means the server dropped the session, a 421
+    reply is the server closing the session, e.g. after its per
+    session message limit
+
+    :param error: error raised while sending
+    :type error: Exception
+    :return: True if the session is dead
+    :rtype: bool
+    """
+    if isinstance(error, smtplib.SMTPServerDisconnected):
+        return True
+    if isinstance(error, smtplib.SMTPException):
+        # SMTPException is an OSError too
+        return getattr(error, "smtp_code", None) == 421
+    return isinstance(error, OSError)
+
+
+class SmtpConnectionPool:
+    """
+    Pool of authenticated SMTP sessions to one server account.
+
+    Worker threads check a connection out for each message and give it
+    back after, at most `size` sessions are open at a time and threads
+    wait for a free one once they are all checked out.
+
+    Sessions are recycled after `max_messages` messages or `max_idle`
+    seconds without use, before servers drop them for going over their
+    own limits. Sessions idle for more than `check_after` seconds are
+    checked with a NOOP before they are handed out.
+
+    A retired pool closes the sessions given back to it instead of
+    keeping them idle.
+    """
+
+    check_after = 5
+
+    def __init__(
+        self, host: str, port: int, username: str, password: str,
+        size: int = 1, use_tls: bool = True,
+        max_messages: int = None, max_idle: float = None,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.size = size
+        self.use_tls = use_tls
+        self.max_messages = max_messages
+        self.max_idle = max_idle
+        self.idle: "queue.LifoQueue[EmailConnection]" = queue.LifoQueue()
+        self.slots = threading.BoundedSemaphore(size)
+        self.retired = False
+        self.lock = threading.Lock()
+
+    def is_expired(self, connection: EmailConnection) -> bool:
+        """
+        Check if the session is past its message or idle limit
+
+        :param connection: session
+        :type connection: EmailConnection
+        :return: True if the session should be recycled
+        :rtype: bool
+        """
+        if self.max_messages and connection.sent >= self.max_messages:
+            return True
+        idle = time.monotonic() - connection.last_used
+        return bool(self.max_idle) and idle >= self.max_idle
+
+    def is_usable(self, connection: EmailConnection) -> bool:
+        """
+        Check if an idle session can be handed out
+
+        :param connection: idle session
+        :type connection: EmailConnection
+        :return: True if the session can be used
+        :rtype: bool
+        """
+        if connection.connection is None or self.is_expired(connection):
+            return False
+        if time.monotonic() - connection.last_used < self.check_after:
+            return True
+        return connection.is_alive()
+
+    def acquire(self) -> EmailConnection:
+        """
+        Check out a connected session, waits for one to be released
+        when `size` sessions are checked out
+
+        :return: connected session
+        :rtype: EmailConnection
+        """
+        self.slots.acquire()
+        while True:
+            try:
+                connection = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            if self.is_usable(connection):
+                return connection
+            connection.close()
+        try:
+            return EmailConnection(
+                self.host, self.port, self.username, self.password,
+                use_tls=self.use_tls,
+            ).__enter__()
+        except Exception:
+            self.slots.release()
+            raise
+
+    def release(self, connection: EmailConnection):
+        """
+        Give a session back to the pool, sessions past their message
+        limit or given back to a retired pool are closed
+
+        :param connection: checked out session
+        :type connection: EmailConnection
+        """
+        if self.max_messages and connection.sent >= self.max_messages:
+            self.discard(connection)
+            return
+        with self.lock:
+            retired = self.retired
+            if not retired:
+                self.idle.put(connection)
+        if retired:
+            self.discard(connection)
+            return
+        self.slots.release()
+
+    def discard(self, connection: EmailConnection):
+        """
+        Close a checked out session that can not be used anymore
+
+        :param connection: checked out session
+        :type connection: EmailConnection
+        """
+        try:
+            connection.close()
+        finally:
+            self.slots.release()
+
+    @contextmanager
+    def connection(self) -> Iterator[EmailConnection]:
+        """
+        Check out a session for the duration of the block, the session
+        is closed instead of reused if the server dropped it
+        """
+        connection = self.acquire()
+        try:
+            yield connection
+        except BaseException as e:
+            if is_disconnect(e):
+                self.discard(connection)
+            else:
+                self.release(connection)
+            raise
+        self.release(connection)
+
+    def run(
+        self, func: Callable[[EmailConnection], Any], retries: int = 1
+    ) -> Any:
+        """
+        Call func with a pooled session, when the server dropped the
+        session func is called again with a new session
+
+        :param func: function sending with the session
+        :type func: Callable[[EmailConnection], Any]
+        :param retries: times func is called again after a dropped
+            session, defaults to 1
+        :type retries: int, optional
+        :return: result of func
+        :rtype: Any
+        """
+        for attempt in range(retries + 1):
+            try:
+                with self.connection() as connection:
+                    return func(connection)
+            except Exception as e:
+                if attempt == retries or not is_disconnect(e):
+                    raise
+                logger.info("Session dropped, sending again")
+
+    def send(self, retries: int = 1, **kwargs) -> bool:
+        """
+        Send an email with a pooled session, see `EmailConnection.send`
+
+        :return: True if email is sent successfully else raise exception
+        :rtype: bool
+        """
+        return self.run(
+            lambda connection: connection.send(**kwargs), retries=retries)
+
+    def send_bytes(
+        self, recipients: str | list[str], data: bytes | str,
+        retries: int = 1,
+    ) -> dict:
+        """
+        Send a serialized email with a pooled session,
+        see `EmailConnection.send_bytes`
+
+        :return: refused recipients
+        :rtype: dict
+        """
+        return self.run(
+            lambda connection: connection.send_bytes(recipients, data),
+            retries=retries,
+        )
+
+    def close(self):
+        """
+        Close the idle sessions
+        """
+        while True:
+            try:
+                connection = self.idle.get_nowait()
+            except queue.Empty:
+                return
+            connection.close()
+
+    def retire(self):
+        """
+        Close the idle sessions, sessions still checked out are closed
+        when they are given back
+        """
+        with self.lock:
+            self.retired = True
+        self.close()
+
+
+_pools: Dict[Tuple[str, int, str], SmtpConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(
+    host: str, port: int, username: str, password: str,
+    size: int = 1, use_tls: bool = True,
+    max_messages: int = None, max_idle: float = None,
+) -> SmtpConnectionPool:
+    """
+    Get the connection pool of the server account, managers of the
+    same account share the pool and its open sessions
+
+    :return: connection pool
+    :rtype: SmtpConnectionPool
+    """
+    key = (host, port, username)
+    with _pools_lock:
+        pool = _pools.get(key)
+        options = (password, size, use_tls, max_messages, max_idle)
+        if pool is None or options != (
+            pool.password, pool.size, pool.use_tls,
+            pool.max_messages, pool.max_idle,
+        ):
+            if pool is not None:
+                pool.retire()
+            pool = SmtpConnectionPool(
+                host, port, username, password, size=size, use_tls=use_tls,
+                max_messages=max_messages, max_idle=max_idle,
+            )
+            _pools[key] = pool
+        return pool
+
+
+def close_pools():
+    """
+    Retire every pool and forget the pools
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.retire()
+
+
 def get_connection(host: str, port: int, username: str, password: str):
     connection = EmailConnection(host, port, username, password)
     connection.__enter__()
@@ -0,0 +1,123 @@
+"""
+Message templates with column placeholders
+"""
+
+import re
+from typing import Iterable, List, Mapping, Tuple
+
+
+class MessageTemplate:
+    """
+    Message compiled once into literal and placeholder segments.
+
+    A placeholder is a column name wrapped in underscores, e.g.
+    `_first_name_`. Longer column names are matched first so
+    `_first_name_` is not taken for a `first` column. Rendering a row
+    is a single `str.format` call over the compiled segments.
+    """
+
+    def __init__(self, message: str, columns: Iterable[str]) -> None:
+        """
+        Compile message against the columns of the receiver data
+
+        :param message: message with placeholders
+        :type message: str
+        :param columns: column names that can be used as placeholders
+        :type columns: Iterable[str]
+        """
+        self.__message = message
+        self.__segments = self.compile(message, columns)
+        self.__placeholders: List[str] = list(dict.fromkeys(
+            key for is_placeholder, key in self.__segments if is_placeholder
+        ))
+        positions = {
+            key: index for index, key in enumerate(self.__placeholders)}
+        self.__format = ''.join(
+            '{%d}' % positions[value] if is_placeholder
+            else value.replace('{', '{{').replace('}', '}}')
+            for is_placeholder, value in self.__segments
+        )
+
+    @staticmethod
+    def compile(
+        message: str, columns: Iterable[str]
+    ) -> List[Tuple[bool, str]]:
+        """
+        Splits the message into segments of (is_placeholder, value),
+        value is the column name for placeholders and the text otherwise
+
+        :param message: message with placeholders
+        :type message: str
+        :param columns: column names that can be used as placeholders
+        :type columns: Iterable[str]
+        :return: message segments
+        :rtype: List[Tuple[bool, str]]
+        """
+        columns = sorted(
+            (str(column) for column in columns if str(column)),
+            key=len, reverse=True)
+        if not columns:
+            return [(False, message)] if message else []
+        pattern = re.compile('|'.join(
+            f'_{re.escape(column)}_' for column in columns))
+        segments = []
+        position = 0
+        for match in pattern.finditer(message):
+            if match.start() > position:
+                segments.append((False, message[position:match.start()]))
+            segments.append((True, match.group()[1:-1]))
+            position = match.end()
+        if position < len(message):
+            segments.append((False, message[position:]))
+        return segments
+
+    def get_message(self) -> str:
+        """
+        Returns the message the template was compiled from
+
+        :return: message
+        :rtype: str
+        """
+        return self.__message
+
+    def get_segments(self) -> List[Tuple[bool, str]]:
+        """
+        Returns the compiled message segments
+
+        :return: message segments
+        :rtype: List[Tuple[bool, str]]
+        """
+        return self.__segments
+
+    def get_placeholders(self) -> List[str]:
+        """
+        Returns the columns used in the message, in order of first use
+
+        :return: placeholder columns
+        :rtype: List[str]
+        """
+        return self.__placeholders
+
+    def is_personalized(self) -> bool:
+        """
+        Returns True if the message has any placeholder
+
+        :return: message is personalized
+        :rtype: bool
+        """
+        return bool(self.__placeholders)
+
+    def render(self, data: Mapping[str, object] = None) -> str:
+        """
+        Renders the message with the values of a row
+
+        :param data: row values by column name, defaults to None
+        :type data: Mapping[str, object], optional
+        :raises KeyError: Placeholder column missing in data
+        :return: rendered message
+        :rtype: str
+        """
+        if not self.__placeholders:
+            return self.__message
+        return self.__format.format(
+            *[str(data[key]) for key in self.__placeholders])
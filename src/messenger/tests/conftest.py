@@ -1,10 +1,21 @@
+import json
+import socket
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from typing import Type
 
 import pytest
-from messenger.email_manager import BaseEmailManager
+from messenger.email_manager import (
+    AsyncSendGridEmailManager, AsyncSmtpEmailManager, AsyncZeptoEmailManager,
+    BaseEmailManager, SendGridEmailManager, SmtpEmailManager
+)
 from messenger.messager import BaseMessenger, ExcelMessenger, Managers
 from messenger.messsage_manager import BaseMessageManager, HtmlMessageManager
+from messenger.sessions import session_pool
+from messenger.smtp import close_pools
 
 T = Type[Path]
 M = Type[HtmlMessageManager]
@@ -16,6 +27,9 @@ def use_dummy_template_backend(settings, tmp_path):
     test_path: T = test_template_dir / 'test.html'
     with test_path.open(mode='w') as f:
         f.write('hello world {{ message }} {{ name }}')
+    safe_path: T = test_template_dir / 'safe.html'
+    with safe_path.open(mode='w') as f:
+        f.write('<p>{{ message|safe }}</p> {{ name }}')
 
     settings.TEMPLATES = [
         {
@@ -108,3 +122,289 @@ def excel_messenger_error(
     messenger.set_message_manager(create_manager)
     messenger.set_email_manager(email_manager)
     return messenger
+
+
+@pytest.fixture
+def sender_manager():
+    return BaseEmailManager(
+        sender='test@example.com',
+        block_send=True,
+    )
+
+
+@pytest.fixture
+def large_csv_path(tmp_path):
+    path: T = tmp_path / 'large.csv'
+    with path.open(mode='w') as f:
+        f.write('first_name,email\n')
+        for index in range(250):
+            f.write(f'name{index},user{index}@testing.com\n')
+    return path
+
+
+@pytest.fixture
+def xlsx_path(tmp_path):
+    from openpyxl import Workbook
+
+    path: T = tmp_path / 'receivers.xlsx'
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(['first_name', 'email', 'age'])
+    sheet.append(['ayo', 'ayo@testing.com', 5])
+    sheet.append([None, None, None])
+    sheet.append(['jacob', 'jacob@testing.com', 7.0])
+    for index in range(20):
+        sheet.append([f'name{index}', f'user{index}@testing.com', 1.5])
+    sheet.append([])
+    sheet.append([None, None, None])
+    workbook.save(path)
+    return path
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Stand-in for the email provider APIs, records the posted payloads
+    and fails the request when it is for a recipient in `fail_for`
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def get_recipients(self, data: dict) -> list:
+        recipients = []
+        for personalization in data.get('personalizations', []):
+            recipients += [to['email'] for to in personalization['to']]
+        for to in data.get('to', []):
+            recipients.append(to['email_address']['address'])
+        return recipients
+
+    def do_POST(self):
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        data = json.loads(body)
+        time.sleep(server.delay)
+        recipients = self.get_recipients(data)
+        with server.lock:
+            server.in_flight -= 1
+            server.requests.append(data)
+            server.paths.append(self.path)
+            server.authorizations.append(self.headers['Authorization'])
+        failed = set(recipients) & server.fail_for
+        self.send_response(500 if failed else 202)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.paths = []
+    server.authorizations = []
+    server.in_flight = 0
+    server.max_in_flight = 0
+    server.connections = 0
+    server.delay = 0.02
+    server.fail_for = set()
+    server.url = f'http://127.0.0.1:{server.server_address[1]}/'
+    thread = threading.Thread(
+        target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    session_pool.clear()
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def stub_sendgrid_manager(stub_server):
+    manager = SendGridEmailManager(
+        api_key='test_key',
+        sender='test@example.com',
+        batch_size=1,
+    )
+    manager.get_post_url = lambda: stub_server.url
+    return manager
+
+
+@pytest.fixture
+def stub_async_sendgrid_manager(stub_server):
+    manager = AsyncSendGridEmailManager(
+        api_key='test_key',
+        sender='test@example.com',
+        batch_size=1,
+    )
+    manager.get_post_url = lambda: stub_server.url
+    return manager
+
+
+@pytest.fixture
+def stub_async_zepto_manager(stub_server):
+    manager = AsyncZeptoEmailManager(
+        api_key='test_key',
+        sender='test@example.com',
+        batch_size=1,
+    )
+    manager.get_post_url = lambda: stub_server.url
+    manager.get_batch_post_url = lambda: stub_server.url + 'batch'
+    return manager
+
+
+class StubSmtpHandler(socketserver.StreamRequestHandler):
+    """
+    Minimal SMTP server, accepts any AUTH PLAIN login unless
+    `reject_auth` is set, records the
+    delivered messages and refuses the recipients in `refuse`. Pipelined
+    commands are answered in order, add PIPELINING to `extensions` to
+    advertise it. Sessions
+    are dropped after `max_messages` messages or `idle_timeout` seconds
+    without a command.
+    """
+
+    def reply(self, line: str):
+        self.wfile.write(f'{line}\r\n'.encode())
+
+    def read_data(self) -> bytes:
+        lines = []
+        while True:
+            line = self.rfile.readline()
+            if not line or line == b'.\r\n':
+                return b''.join(lines)
+            lines.append(line)
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+            server.in_session += 1
+            server.max_in_session = max(
+                server.max_in_session, server.in_session)
+        try:
+            self.session()
+        finally:
+            with server.lock:
+                server.in_session -= 1
+
+    def session(self):
+        server = self.server
+        self.reply('220 stub ready')
+        self.connection.settimeout(server.idle_timeout)
+        mail_from, recipients, sent = None, [], 0
+        while True:
+            try:
+                line = self.rfile.readline()
+            except socket.timeout:
+                return
+            if not line:
+                return
+            command = line.decode().strip()
+            verb = command.split(' ', 1)[0].upper()
+            server.commands.append(verb)
+            if verb == 'EHLO':
+                self.reply('250-stub')
+                for extension in server.extensions[:-1]:
+                    self.reply(f'250-{extension}')
+                self.reply(f'250 {server.extensions[-1]}')
+            elif verb == 'HELO':
+                self.reply('250 stub')
+            elif verb == 'AUTH' and server.reject_auth:
+                self.reply('535 authentication failed')
+            elif verb == 'AUTH':
+                self.reply('235 authenticated')
+            elif verb == 'MAIL' and sent == server.max_messages:
+                self.reply('421 too many messages')
+                return
+            elif verb == 'MAIL':
+                mail_from, recipients = command[10:].strip('<>'), []
+                self.reply('250 OK')
+            elif verb == 'RCPT':
+                recipient = command[8:].strip('<>')
+                if recipient in server.refuse:
+                    self.reply('550 no such user')
+                else:
+                    recipients.append(recipient)
+                    self.reply('250 OK')
+            elif verb == 'DATA' and not recipients:
+                self.reply('554 no valid recipients')
+            elif verb == 'DATA':
+                self.reply('354 go ahead')
+                data = self.read_data()
+                time.sleep(server.delay)
+                with server.lock:
+                    server.messages.append((mail_from, recipients, data))
+                sent += 1
+                self.reply('250 OK')
+            elif verb in ('RSET', 'NOOP'):
+                self.reply('250 OK')
+            elif verb == 'QUIT':
+                self.reply('221 bye')
+                return
+            else:
+                self.reply('502 not implemented')
+
+
+class StubSmtpServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+@pytest.fixture
+def smtp_server():
+    server = StubSmtpServer(('127.0.0.1', 0), StubSmtpHandler)
+    server.lock = threading.Lock()
+    server.connections = 0
+    server.in_session = 0
+    server.max_in_session = 0
+    server.commands = []
+    server.messages = []
+    server.refuse = set()
+    server.reject_auth = False
+    server.extensions = ['AUTH PLAIN']
+    server.delay = 0
+    server.max_messages = None
+    server.idle_timeout = None
+    server.port = server.server_address[1]
+    thread = threading.Thread(
+        target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    close_pools()
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def smtp_manager(smtp_server):
+    return SmtpEmailManager(
+        host='127.0.0.1',
+        port=smtp_server.port,
+        username='user',
+        password='password',
+        sender='test@example.com',
+        use_tls=False,
+        pool_size=3,
+    )
+
+
+@pytest.fixture
+def async_smtp_manager(smtp_server):
+    return AsyncSmtpEmailManager(
+        host='127.0.0.1',
+        port=smtp_server.port,
+        username='user',
+        password='password',
+        sender='test@example.com',
+        use_tls=False,
+        pool_size=3,
+    )
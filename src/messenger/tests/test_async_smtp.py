@@ -0,0 +1,263 @@
+import asyncio
+import smtplib
+import time
+
+import pytest
+from messenger.async_smtp import AsyncSmtpClient, AsyncSmtpPool
+
+DATA = b'Subject: hi\r\n\r\n.hello\r\n'
+
+
+def client(smtp_server) -> AsyncSmtpClient:
+    return AsyncSmtpClient(
+        '127.0.0.1', smtp_server.port, 'user', 'password', use_tls=False)
+
+
+def count_writes(monkeypatch) -> list:
+    writes = []
+    write = AsyncSmtpClient.write
+
+    async def counted(self, data):
+        writes.append(data)
+        await write(self, data)
+
+    monkeypatch.setattr(AsyncSmtpClient, 'write', counted)
+    return writes
+
+
+@pytest.mark.parametrize('pipelining, round_trips', [(False, 6), (True, 2)])
+def test_client_sendmail(smtp_server, monkeypatch, pipelining, round_trips):
+    if pipelining:
+        smtp_server.extensions.append('PIPELINING')
+    smtp_server.refuse = {'user1@example.com'}
+    recipients = [f'user{index}@example.com' for index in range(3)]
+
+    async def send():
+        session = await client(smtp_server).connect()
+        writes = count_writes(monkeypatch)
+        refused = await session.sendmail('user', recipients, DATA)
+        round_trips = len(writes)
+        await session.close()
+        return refused, round_trips
+
+    refused, computed = asyncio.run(send())
+    assert list(refused) == ['user1@example.com']
+    assert refused['user1@example.com'][0] == 550
+    # MAIL, RCPT and DATA in one round trip then the message
+    assert computed == round_trips
+    mail_from, accepted, data = smtp_server.messages[0]
+    assert mail_from == 'user'
+    assert accepted == ['user0@example.com', 'user2@example.com']
+    # Leading periods are escaped on the wire
+    assert data == b'Subject: hi\r\n\r\n..hello\r\n'
+
+
+@pytest.mark.parametrize('pipelining', [False, True])
+def test_client_sendmail_all_refused(smtp_server, pipelining):
+    if pipelining:
+        smtp_server.extensions.append('PIPELINING')
+    smtp_server.refuse = {'user0@example.com'}
+
+    async def send():
+        session = await client(smtp_server).connect()
+        with pytest.raises(smtplib.SMTPRecipientsRefused):
+            await session.sendmail('user', ['user0@example.com'], DATA)
+        # The session can still be used
+        refused = await session.sendmail('user', ['user1@example.com'], DATA)
+        await session.close()
+        return refused
+
+    assert asyncio.run(send()) == {}
+    assert 'RSET' in smtp_server.commands
+    assert len(smtp_server.messages) == 1
+
+
+def test_client_is_alive(smtp_server):
+    async def check():
+        session = await client(smtp_server).connect()
+        alive = await session.is_alive()
+        await session.close()
+        return alive, await session.is_alive()
+
+    assert asyncio.run(check()) == (True, False)
+
+
+def test_client_dropped_session(smtp_server):
+    smtp_server.max_messages = 1
+
+    async def send():
+        session = await client(smtp_server).connect()
+        await session.sendmail('user', ['user0@example.com'], DATA)
+        with pytest.raises(smtplib.SMTPSenderRefused) as error:
+            await session.sendmail('user', ['user1@example.com'], DATA)
+        return error.value.smtp_code, session.writer
+
+    assert asyncio.run(send()) == (421, None)
+
+
+def test_pool_drives_sessions_concurrently(smtp_server):
+    smtp_server.delay = 0.1
+    pool = AsyncSmtpPool(
+        '127.0.0.1', smtp_server.port, 'user', 'password',
+        size=10, use_tls=False)
+
+    async def send():
+        try:
+            return await asyncio.gather(*(
+                pool.sendmail('user', [f'user{index}@example.com'], DATA)
+                for index in range(30)
+            ))
+        finally:
+            await pool.close()
+
+    assert asyncio.run(send()) == [{}] * 30
+    assert len(smtp_server.messages) == 30
+    assert smtp_server.max_in_session == 10
+    assert smtp_server.connections == 10
+    assert smtp_server.commands.count('QUIT') == 10
+
+
+def test_pool_resends_after_server_drops_session(smtp_server):
+    smtp_server.max_messages = 2
+    pool = AsyncSmtpPool(
+        '127.0.0.1', smtp_server.port, 'user', 'password', use_tls=False)
+
+    async def send():
+        try:
+            return [
+                await pool.sendmail(
+                    'user', [f'user{index}@example.com'], DATA)
+                for index in range(5)
+            ]
+        finally:
+            await pool.close()
+
+    assert asyncio.run(send()) == [{}] * 5
+    assert len(smtp_server.messages) == 5
+    assert smtp_server.connections == 3
+
+
+def test_pool_recycles_after_max_messages(smtp_server):
+    pool = AsyncSmtpPool(
+        '127.0.0.1', smtp_server.port, 'user', 'password',
+        use_tls=False, max_messages=2)
+
+    async def send():
+        try:
+            for index in range(5):
+                await pool.sendmail(
+                    'user', [f'user{index}@example.com'], DATA)
+        finally:
+            await pool.close()
+
+    asyncio.run(send())
+    assert smtp_server.connections == 3
+    assert 'MAIL' in smtp_server.commands
+    assert smtp_server.commands.count('QUIT') == 3
+
+
+def test_async_smtp_manager_send(smtp_server, async_smtp_manager):
+    async def send():
+        try:
+            return await asyncio.gather(*(
+                async_smtp_manager.send_message_async(
+                    message='hello', recipient=f'user{index}@example.com',
+                    subject='hi')
+                for index in range(6)
+            ))
+        finally:
+            await async_smtp_manager.close_async()
+
+    assert asyncio.run(send()) == [True] * 6
+    assert len(smtp_server.messages) == 6
+    assert smtp_server.max_in_session <= 3
+    mail_from, accepted, data = smtp_server.messages[0]
+    assert b'\r\nSubject: hi\r\n' in data
+
+
+def test_async_smtp_manager_send_failure(smtp_server, async_smtp_manager):
+    smtp_server.refuse = {'user0@example.com'}
+
+    async def send():
+        try:
+            return await async_smtp_manager.send_async(
+                recipient='user0@example.com', subject='hi', message='hello')
+        finally:
+            await async_smtp_manager.close_async()
+
+    assert asyncio.run(send()) is False
+
+
+def test_async_smtp_manager_send_batch(smtp_server, async_smtp_manager):
+    smtp_server.extensions.append('PIPELINING')
+    smtp_server.refuse = {'user1@example.com'}
+    recipients = [f'user{index}@example.com' for index in range(3)]
+
+    async def send():
+        try:
+            return await async_smtp_manager.send_batch_async(
+                recipients=recipients, subject='hi', message='hello')
+        finally:
+            await async_smtp_manager.close_async()
+
+    assert asyncio.run(send()) == [True, False, True]
+    mail_from, accepted, data = smtp_server.messages[0]
+    assert accepted == ['user0@example.com', 'user2@example.com']
+    assert b'\r\nTo: undisclosed-recipients:;\r\n' in data
+
+
+def test_async_smtp_manager_send_batch_substitutions(async_smtp_manager):
+    with pytest.raises(TypeError, match='substitutions'):
+        asyncio.run(async_smtp_manager.send_batch_async(
+            recipients=['user0@example.com'], subject='hi',
+            message='hello', substitutions=[{'name': 'user'}]))
+
+
+def test_pool_discards_cancelled_session(smtp_server):
+    smtp_server.delay = 0.5
+    pool = AsyncSmtpPool(
+        '127.0.0.1', smtp_server.port, 'user', 'password', use_tls=False)
+
+    async def send():
+        try:
+            task = asyncio.ensure_future(
+                pool.sendmail('user', ['user0@example.com'], DATA))
+            await asyncio.sleep(0.2)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            assert pool.idle == []
+            smtp_server.delay = 0
+            # The slot of the cancelled send is free again
+            return await asyncio.wait_for(
+                pool.sendmail('user', ['user1@example.com'], DATA), 5)
+        finally:
+            await pool.close()
+
+    assert asyncio.run(send()) == {}
+    assert smtp_server.connections == 2
+
+
+def test_failed_login_closes_socket(smtp_server):
+    smtp_server.reject_auth = True
+    pool = AsyncSmtpPool(
+        '127.0.0.1', smtp_server.port, 'user', 'password', use_tls=False)
+
+    async def send():
+        session = client(smtp_server)
+        with pytest.raises(smtplib.SMTPAuthenticationError):
+            await session.connect()
+        assert session.writer is None
+        # Every failed login gives its pool slot and socket back
+        for index in range(3):
+            with pytest.raises(smtplib.SMTPAuthenticationError):
+                await asyncio.wait_for(pool.sendmail(
+                    'user', [f'user{index}@example.com'], DATA), 5)
+        await pool.close()
+
+    asyncio.run(send())
+    assert smtp_server.connections == 4
+    deadline = time.monotonic() + 2
+    while smtp_server.in_session and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert smtp_server.in_session == 0
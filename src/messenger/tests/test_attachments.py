@@ -0,0 +1,52 @@
+import base64
+import os
+from email import encoders
+from email.mime.base import MIMEBase
+
+import pytest
+from messenger.attachments import PreparedAttachment, prepare_attachments
+
+
+@pytest.fixture
+def data():
+    return os.urandom(1000)
+
+
+def test_prepared_attachment(data):
+    attachment = PreparedAttachment(
+        filename='report.pdf', data=bytearray(data),
+        mime_type='application/pdf'
+    )
+    assert attachment.get_filename() == 'report.pdf'
+    assert attachment.get_mime_type() == 'application/pdf'
+    assert attachment.get_data() == data
+    assert isinstance(attachment.get_data(), bytes)
+    assert attachment.get_content() == base64.b64encode(data).decode()
+    assert len(attachment) == 1000
+    with pytest.raises(AttributeError):
+        attachment.extra = 1
+
+
+def test_prepared_attachment_part(data):
+    expected = MIMEBase('application', 'octet-stream')
+    expected.set_payload(data)
+    encoders.encode_base64(expected)
+    expected.add_header(
+        'Content-Disposition', 'attachment; filename= report.pdf')
+    attachment = PreparedAttachment(filename='report.pdf', data=data)
+    assert attachment.get_part().as_string() == expected.as_string()
+    # Parts are built on demand, a message never shares its part
+    assert attachment.get_part() is not attachment.get_part()
+
+
+def test_prepare_attachments(data):
+    prepared = PreparedAttachment(filename='a.txt', data=b'a')
+    computed = prepare_attachments([
+        prepared,
+        {'filename': 'b.txt', 'data': data, 'mime_type': 'text/plain'},
+    ])
+    assert computed[0] is prepared
+    assert computed[1].get_filename() == 'b.txt'
+    assert computed[1].get_mime_type() == 'text/plain'
+    assert prepare_attachments(None) == ()
+    assert prepare_attachments([]) == ()
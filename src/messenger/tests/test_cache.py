@@ -0,0 +1,82 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from messenger.cache import ParsedUploadCache
+from messenger.readers import CsvReader
+from utils.general import file_hash
+
+
+@pytest.fixture
+def upload_cache(tmp_path):
+    return ParsedUploadCache(directory=tmp_path / 'cache', max_size=1 << 20)
+
+
+def test_cache_miss(upload_cache):
+    assert upload_cache.get('missing') is None
+
+
+def test_cache_set_get(upload_cache):
+    data = pd.DataFrame({'email': ['a@testing.com', None]})
+    upload_cache.set('key', data)
+    pd.testing.assert_frame_equal(upload_cache.get('key'), data)
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    data = pd.DataFrame({'email': ['a@testing.com'] * 100})
+    upload_cache = ParsedUploadCache(directory=tmp_path, max_size=1 << 20)
+    for key in ['first', 'second', 'third']:
+        upload_cache.set(key, data)
+    size = upload_cache.get_path('first').stat().st_size
+    for index, key in enumerate(['second', 'first', 'third']):
+        os.utime(upload_cache.get_path(key), ns=(index, index))
+
+    ParsedUploadCache(directory=tmp_path, max_size=size * 2).evict()
+    assert not upload_cache.get_path('second').exists()
+    assert upload_cache.get_path('first').exists()
+    assert upload_cache.get_path('third').exists()
+
+
+def test_reader_load_uses_cache(excel_test_csv_path, upload_cache):
+    reader = CsvReader(excel_test_csv_path, cache=upload_cache)
+    expected = reader.load()
+    pd.testing.assert_frame_equal(
+        expected, pd.read_csv(excel_test_csv_path, dtype=str))
+    key = file_hash(excel_test_csv_path)
+    assert upload_cache.get_path(key).exists()
+
+    upload_cache.set(key, expected.head(1))
+    reader = CsvReader(excel_test_csv_path, cache=upload_cache)
+    pd.testing.assert_frame_equal(reader.load(), expected.head(1))
+
+
+def test_cache_keeps_missing_values(upload_cache):
+    data = pd.DataFrame(
+        {'name': ['ayo', np.nan], 'note': [np.nan, np.nan]}, dtype=object)
+    upload_cache.set('key', data)
+    computed = upload_cache.get('key')
+    pd.testing.assert_frame_equal(computed, data)
+    assert isinstance(computed.iloc[1, 0], float)
+
+
+def test_cache_skips_non_string_columns(upload_cache):
+    upload_cache.set('key', pd.DataFrame({1: ['a']}, dtype=object))
+    assert upload_cache.get('key') is None
+
+
+def test_reader_load_is_kept(excel_test_csv_path, upload_cache, monkeypatch):
+    reader = CsvReader(excel_test_csv_path, cache=upload_cache)
+    data = reader.load()
+    monkeypatch.setattr(upload_cache, 'get', None)
+    assert reader.load() is data
+
+
+def test_reader_chunks_skip_cache(excel_test_csv_path, upload_cache):
+    reader = CsvReader(excel_test_csv_path, cache=upload_cache)
+    expected = pd.read_csv(excel_test_csv_path, dtype=str)
+    chunks = list(reader.iter_chunks(2, 1, 3))
+    pd.testing.assert_frame_equal(pd.concat(chunks), expected.loc[1:3])
+    assert reader.count_rows(limit=3) == 3
+    # Streamed files are not loaded whole
+    assert list(upload_cache.get_directory().glob('*')) == []
@@ -0,0 +1,162 @@
+import base64
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from messenger import dkim as signing
+from messenger.dkim import (
+    DkimSigner, get_signer, load_private_key, relaxed_header, simple_body
+)
+from messenger.email_manager import SmtpEmailManager
+from messenger.mime import MimeTemplate
+from messenger.smtp import EmailConnection
+
+
+def dns_record(private_key: str):
+    public_key = load_private_key(private_key).public_key().public_bytes(
+        serialization.Encoding.DER,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    record = b'v=DKIM1; k=rsa; p=' + base64.b64encode(public_key)
+
+    def dnsfunc(name, timeout=5):
+        assert name == b'mail._domainkey.example.com.'
+        return record
+    return dnsfunc
+
+
+def verify(data: bytes, private_key: str) -> bool:
+    # Signatures are checked with dkimpy, only these checks need it
+    dkim = pytest.importorskip('dkim')
+    return dkim.verify(data, dnsfunc=dns_record(private_key))
+
+
+@pytest.fixture
+def signer(dkim_private_key):
+    return DkimSigner('example.com', 'mail', dkim_private_key)
+
+
+@pytest.fixture
+def template():
+    return MimeTemplate('Hello  there', 'Sender <test@example.com>')
+
+
+def test_relaxed_header():
+    field = b'Subject :  Hello \t there\r\n  again  '
+    assert relaxed_header(field) == b'subject:Hello there again\r\n'
+
+
+def test_simple_body():
+    assert simple_body(b'hi\r\n\r\n\r\n') == b'hi\r\n'
+    assert simple_body(b'') == b'\r\n'
+
+
+def test_load_private_key_error():
+    with pytest.raises(TypeError, match='DKIM'):
+        load_private_key('not a key')
+
+
+def test_sign(signer, template, dkim_private_key):
+    data = signer.sign(template.render(
+        'user@example.com', text='hi', html='<p>hi</p>'))
+    assert data.startswith(b'DKIM-Signature: v=1; a=rsa-sha256;')
+    assert b'd=example.com; s=mail;' in data
+    assert verify(data, dkim_private_key)
+
+
+def test_sign_detects_changes(signer, template, dkim_private_key):
+    data = signer.sign(template.render('user@example.com', text='hi'))
+    assert not verify(data.replace(b'user@', b'other@'), dkim_private_key)
+    assert not verify(data.replace(b'hi', b'ho'), dkim_private_key)
+
+
+def test_sign_folded_headers(signer, dkim_private_key):
+    data = (
+        b'From: test@example.com\r\nTo: user@example.com\r\n'
+        b'Subject: a long\r\n\tfolded  subject\r\n\r\nhello\r\n\r\n'
+    )
+    assert verify(signer.sign(data), dkim_private_key)
+
+
+def test_sign_caches_invariant_work(signer, template, monkeypatch):
+    canonicalized = []
+    relaxed = signing.relaxed_header
+
+    def counted(field):
+        canonicalized.append(field)
+        return relaxed(field)
+
+    monkeypatch.setattr(signing, 'relaxed_header', counted)
+    for index in range(5):
+        data = signer.sign(template.render(
+            f'user{index}@example.com', text='hi'))
+        assert data.startswith(b'DKIM-Signature: ')
+    # From, Subject, MIME-Version and Content-Type are canonicalized once
+    fields = [field.split(b':')[0] for field in canonicalized]
+    assert fields.count(b'From') == 1
+    assert fields.count(b'Subject') == 1
+    assert fields.count(b'To') == 5
+
+
+def test_body_hash_reused(signer, monkeypatch):
+    calls = []
+    simple = signing.simple_body
+
+    def counted(body):
+        calls.append(body)
+        return simple(body)
+
+    monkeypatch.setattr(signing, 'simple_body', counted)
+    signer.sign(b'To: a@example.com\r\n\r\nhello\r\n')
+    signer.sign(b'To: b@example.com\r\n\r\nhello\r\n')
+    assert len(calls) == 1
+    signer.sign(b'To: b@example.com\r\n\r\nbye\r\n')
+    assert len(calls) == 2
+
+
+def test_get_signer_loads_key_once(dkim_private_key, monkeypatch):
+    get_signer.cache_clear()
+    loaded = []
+    load = signing.load_private_key
+
+    def counted(private_key):
+        loaded.append(private_key)
+        return load(private_key)
+
+    monkeypatch.setattr(signing, 'load_private_key', counted)
+    signer = get_signer('example.com', 'mail', dkim_private_key)
+    assert get_signer('example.com', 'mail', dkim_private_key) is signer
+    assert len(loaded) == 1
+    get_signer.cache_clear()
+
+
+def test_connection_send_signed(smtp_server, signer, dkim_private_key):
+    with EmailConnection(
+        '127.0.0.1', smtp_server.port, 'user', 'password', use_tls=False
+    ) as connection:
+        connection.send(
+            'hi', 'user@example.com', 'hello', 'test@example.com',
+            signer=signer)
+    mail_from, recipients, data = smtp_server.messages[0]
+    assert verify(data, dkim_private_key)
+
+
+def test_smtp_manager_signs(smtp_server, dkim_private_key):
+    manager = SmtpEmailManager(
+        host='127.0.0.1',
+        port=smtp_server.port,
+        username='user',
+        password='password',
+        sender='test@example.com',
+        use_tls=False,
+        dkim_selector='mail',
+        dkim_private_key=dkim_private_key,
+    )
+    assert manager.get_signer().get_domain() == 'example.com'
+    assert manager.send(
+        recipient='user0@example.com', subject='hi', message='hello')
+    assert manager.send_batch(
+        recipients=['user1@example.com', 'user2@example.com'],
+        subject='hi', message='hello') == [True, True]
+    assert len(smtp_server.messages) == 2
+    for mail_from, recipients, data in smtp_server.messages:
+        assert verify(data, dkim_private_key)
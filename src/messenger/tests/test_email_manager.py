@@ -1,10 +1,18 @@
+import asyncio
+import json
 from contextlib import redirect_stdout
 from io import StringIO
 
 import pytest
 
+from django.conf import settings
 from django.test import SimpleTestCase
-from messenger.email_manager import BaseEmailManager, SendGridEmailManager
+from messenger.email_manager import (
+    AsyncSendGridEmailManager, BaseEmailManager, SendGridEmailManager,
+    ZeptoEmailManager
+)
+from messenger.attachments import prepare_attachments
+from messenger.sessions import session_pool
 
 
 class TestManager(SimpleTestCase):
@@ -174,3 +182,219 @@ class TestSendGridManager(SimpleTestCase):
                 message='hello world',
                 fail=False
             )
+
+
+def test_async_sendgrid_send(stub_server, stub_async_sendgrid_manager):
+    manager = stub_async_sendgrid_manager
+
+    async def send():
+        results = [
+            await manager.send_async(
+                recipient=recipient, subject='testings', message='hi')
+            for recipient in ('me@gmail.com', 'you@gmail.com')
+        ]
+        session = manager.get_async_session()
+        await manager.close_async()
+        return results, session
+
+    stub_server.fail_for = {'you@gmail.com'}
+    computed, session = asyncio.run(send())
+    assert computed == [True, False]
+    assert session.closed
+    assert stub_server.authorizations == ['Bearer test_key'] * 2
+    assert stub_server.requests[0] == manager.get_post_data(
+        'me@gmail.com', 'testings', 'hi')
+
+
+def test_async_zepto_send_message(stub_server, stub_async_zepto_manager):
+    manager = stub_async_zepto_manager
+
+    async def send():
+        sent = await manager.send_message_async(
+            'hi', recipient='me@gmail.com', subject='testings',
+            attachments=[{
+                'filename': 'a.txt', 'data': b'a', 'mime_type': 'text/plain'
+            }]
+        )
+        await manager.close_async()
+        return sent
+
+    assert asyncio.run(send())
+    assert stub_server.authorizations == ['test_key']
+    assert stub_server.requests[0]['attachments'] == [
+        {'name': 'a.txt', 'content': 'YQ==', 'mime_type': 'text/plain'}]
+
+
+def test_async_send_message_block_send(stub_server):
+    manager = AsyncSendGridEmailManager(
+        api_key='test_key', sender='test@example.com', block_send=True)
+    assert asyncio.run(manager.send_message_async(
+        'hi', recipient='me@gmail.com', subject='testings'))
+    assert stub_server.requests == []
+
+
+def test_base_send_message_async_runs_send(sender_manager, monkeypatch):
+    sender_manager.unblock_send()
+    monkeypatch.setattr(
+        sender_manager, 'send', lambda **kwargs: kwargs['recipient'])
+    computed = asyncio.run(sender_manager.send_message_async(
+        'hi', recipient='me@gmail.com'))
+    assert computed == 'me@gmail.com'
+
+
+def test_http_manager_reuses_connections(stub_server, stub_sendgrid_manager):
+    computed = [
+        stub_sendgrid_manager.send(
+            recipient=f'user{index}@gmail.com', subject='testings',
+            message='hi')
+        for index in range(5)
+    ]
+    assert computed == [True] * 5
+    assert len(stub_server.requests) == 5
+    assert stub_server.connections == 1
+
+
+def test_http_manager_shares_session():
+    manager = ZeptoEmailManager(api_key='key', sender='test@example.com')
+    same_key = ZeptoEmailManager(api_key='key', sender='me@example.com')
+    other_key = ZeptoEmailManager(api_key='other', sender='test@example.com')
+    try:
+        assert manager.get_session() is same_key.get_session()
+        assert manager.get_session() is not other_key.get_session()
+        adapter = manager.get_session().get_adapter(manager.get_post_url())
+        assert adapter._pool_maxsize == settings.EMAIL_API_POOL_SIZE
+    finally:
+        session_pool.clear()
+
+
+def test_http_manager_pool_size_and_timeout():
+    manager = SendGridEmailManager(
+        api_key='key', sender='test@example.com',
+        pool_size=3, timeout=(1, 2)
+    )
+    assert manager.get_pool_size() == 3
+    assert manager.get_timeout() == (1, 2)
+    default = SendGridEmailManager(api_key='key', sender='test@example.com')
+    assert default.get_timeout() == (
+        settings.EMAIL_API_CONNECT_TIMEOUT, settings.EMAIL_API_READ_TIMEOUT)
+
+
+def test_sendgrid_get_batch_post_data():
+    manager = SendGridEmailManager(api_key='key', sender='test@example.com')
+    computed = manager.get_batch_post_data(
+        recipients=['me@gmail.com', 'you@gmail.com'],
+        subject='testings',
+        message='hi -name-',
+        substitutions=[{'name': 'me'}, {}],
+    )
+    assert computed['personalizations'] == [
+        {'to': [{'email': 'me@gmail.com'}], 'substitutions': {'-name-': 'me'}},
+        {'to': [{'email': 'you@gmail.com'}]},
+    ]
+    assert computed['content'] == [{'type': 'text/html', 'value': 'hi -name-'}]
+    assert computed['subject'] == 'testings'
+
+
+def test_sendgrid_batch_size():
+    def get_batch_size(**kwargs):
+        return SendGridEmailManager(
+            api_key='key', sender='test@example.com', **kwargs
+        ).get_batch_size()
+
+    assert get_batch_size() == min(settings.EMAIL_API_BATCH_SIZE, 1000)
+    assert get_batch_size(batch_size=5000) == 1000
+    assert get_batch_size(batch_size=0) == 1
+    assert BaseEmailManager(sender='test@example.com').get_batch_size() == 1
+
+
+def test_send_batch_message(stub_server, stub_sendgrid_manager):
+    stub_server.fail_for = {'you@gmail.com'}
+    computed = stub_sendgrid_manager.send_batch_message(
+        'hi', recipients=['me@gmail.com', 'you@gmail.com'],
+        substitutions=[{}, {}], subject='testings'
+    )
+    assert computed == [False, False]
+    assert len(stub_server.requests) == 1
+    stub_sendgrid_manager.block_send()
+    computed = stub_sendgrid_manager.send_batch_message(
+        'hi', recipients=['me@gmail.com', 'you@gmail.com'],
+        substitutions=[{}, {}], subject='testings'
+    )
+    assert computed == [True, True]
+    assert len(stub_server.requests) == 1
+
+
+def test_zepto_get_batch_post_data():
+    manager = ZeptoEmailManager(api_key='key', sender='test@example.com')
+    computed = manager.get_batch_post_data(
+        recipients=['me@gmail.com', 'you@gmail.com'],
+        subject='testings',
+        message='hi {{name}}',
+        substitutions=[{'name': 'me'}, {'name': 'you'}],
+        attachments=[{
+            'filename': 'a.txt', 'data': b'a', 'mime_type': 'text/plain'
+        }]
+    )
+    assert computed['to'] == [
+        {
+            'email_address': {'address': 'me@gmail.com'},
+            'merge_info': {'name': 'me'}
+        },
+        {
+            'email_address': {'address': 'you@gmail.com'},
+            'merge_info': {'name': 'you'}
+        },
+    ]
+    assert computed['htmlbody'] == 'hi {{name}}'
+    assert computed['attachments'] == [
+        {'name': 'a.txt', 'content': 'YQ==', 'mime_type': 'text/plain'}]
+    assert manager.get_substitution_tag('name') == '{{name}}'
+    assert manager.get_batch_post_url() == (
+        'https://api.zeptomail.com/v1.1/email/batch')
+
+
+def test_zepto_batch_size():
+    manager = ZeptoEmailManager(
+        api_key='key', sender='test@example.com', batch_size=1000)
+    assert manager.get_batch_size() == 500
+
+
+@pytest.mark.parametrize('manager_class', [
+    SendGridEmailManager, ZeptoEmailManager
+])
+def test_get_payload(manager_class):
+    manager = manager_class(api_key='key', sender='test@example.com')
+    attachments = prepare_attachments([
+        {'filename': 'a.txt', 'data': b'a', 'mime_type': 'text/plain'}])
+    computed = manager.get_payload(
+        ['me@gmail.com'], 'testings', 'héllo "world"',
+        attachments=attachments)
+    expected = manager.get_batch_post_data(
+        ['me@gmail.com'], 'testings', 'héllo "world"', [{}],
+        attachments=attachments)
+    assert json.loads(computed) == expected
+    assert json.loads(computed) == manager.get_post_data(
+        'me@gmail.com', 'testings', 'héllo "world"',
+        attachments=attachments)
+    computed = manager.get_payload(
+        ['me@gmail.com', 'you@gmail.com'], 'testings', 'hi',
+        [{'name': 'me'}, {'name': 'y\\ou"'}], attachments=attachments)
+    expected = manager.get_batch_post_data(
+        ['me@gmail.com', 'you@gmail.com'], 'testings', 'hi',
+        [{'name': 'me'}, {'name': 'y\\ou"'}], attachments=attachments)
+    assert computed == json.dumps(expected).encode()
+
+
+def test_get_skeleton_reused():
+    manager = ZeptoEmailManager(api_key='key', sender='test@example.com')
+    attachments = prepare_attachments([
+        {'filename': 'a.txt', 'data': b'a', 'mime_type': 'text/plain'}])
+    skeleton = manager.get_skeleton('testings', attachments=attachments)
+    assert skeleton.count('message') == 1
+    assert skeleton.count('recipients') == 1
+    assert manager.get_skeleton(
+        'testings', attachments=attachments) is skeleton
+    assert manager.get_skeleton(
+        'other', attachments=attachments) is not skeleton
+    message = 'hi'
+    assert manager.encode_message(message) is manager.encode_message(message)
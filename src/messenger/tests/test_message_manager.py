@@ -49,3 +49,23 @@ def test_html_manager_render_message_with_context(create_manager: M):
     }
     computed: str = create_manager.render_message(context)
     assert computed == 'hello world python testing'
+
+
+def test_html_manager_render_messages(use_dummy_template_backend):
+    manager = HtmlMessageManager(
+        template_name='safe.html',
+        context={'name': 'testing'}
+    )
+    computed = list(manager.render_messages(['<b>a</b>', 'b & c']))
+    assert computed == [
+        '<p><b>a</b></p> testing',
+        '<p>b & c</p> testing',
+    ]
+
+
+def test_html_manager_render_messages_escaped(create_manager: M):
+    computed = list(create_manager.render_messages(['<b>a</b>', 'b']))
+    assert computed == [
+        'hello world &lt;b&gt;a&lt;/b&gt; testing',
+        'hello world b testing',
+    ]
@@ -3,8 +3,13 @@ from unittest import TestCase
 from pandas import DataFrame
 import pytest
 from pathlib import Path
-from messenger.messager import Managers, BaseMessenger, ExcelMessenger
-from messenger.email_manager import BaseEmailManager
+from messenger.messager import (
+    AsyncExcelMessenger, BaseMessenger, ExcelMessenger, Managers
+)
+from messenger.email_manager import (
+    AsyncSendGridEmailManager, BaseEmailManager, SmtpEmailManager,
+    ZeptoEmailManager
+)
 from messenger.messsage_manager import BaseMessageManager
 
 
@@ -179,7 +184,7 @@ def test_excel_messenger_error_index_stop(excel_test_csv_path):
 
 def test_excel_messenger_get_supported_exts(excel_messenger: G):
     computed = excel_messenger.get_supported_exts()
-    expected = 'xls, xlsx, csv and gz'
+    expected = 'xls, xlsx, csv, gz, bz2, xz, zst, jsonl and parquet'
     assert computed == expected
 
 
@@ -252,3 +257,463 @@ def test_excel_messenger_send_messages(excel_messenger: G):
         with _first_name_ presence of _last_name_."""
     )
     assert 3 == len(list(sents))
+
+
+def test_excel_messenger_streaming_data(large_csv_path):
+    messenger = ExcelMessenger(
+        start=1,
+        stop=250,
+        file_path=large_csv_path,
+        chunksize=100
+    )
+    assert messenger.is_streaming()
+    assert messenger.data is None
+
+
+def test_excel_messenger_streaming_chunks(large_csv_path):
+    messenger = ExcelMessenger(
+        start=11,
+        stop=230,
+        file_path=large_csv_path,
+        chunksize=100
+    )
+    chunks = list(messenger.iter_chunks())
+    assert [len(chunk) for chunk in chunks] == [100, 100, 20]
+    assert chunks[0].index[0] == 10
+    assert chunks[-1].index[-1] == 229
+    assert chunks[0].loc[10, 'email'] == 'user10@testing.com'
+    assert chunks[-1].loc[229, 'email'] == 'user229@testing.com'
+
+
+def test_excel_messenger_streaming_error_index_stop(large_csv_path):
+    with pytest.raises(
+        TypeError, match='Stop index is greater than file max index'
+    ):
+        ExcelMessenger(
+            start=1,
+            stop=251,
+            file_path=large_csv_path,
+            chunksize=100
+        )
+
+
+@pytest.mark.parametrize('chunksize', [0, '10'])
+def test_excel_messenger_streaming_chunksize_error(
+    large_csv_path, chunksize
+):
+    with pytest.raises(TypeError, match='Chunk size'):
+        ExcelMessenger(
+            start=1,
+            stop=10,
+            file_path=large_csv_path,
+            chunksize=chunksize
+        )
+
+
+def test_excel_messenger_streaming_send_messages(
+    large_csv_path, create_manager, sender_manager
+):
+    messenger = ExcelMessenger(
+        start=5,
+        stop=205,
+        file_path=large_csv_path,
+        chunksize=64
+    )
+    messenger.set_message_manager(create_manager)
+    messenger.set_sender_manager(sender_manager)
+    rows = list(messenger.iter_rows())
+    assert len(rows) == 201
+    assert rows[0] == {'first_name': 'name4', 'email': 'user4@testing.com'}
+    sents = messenger.send_messages(subject='Testing', message='hi _first_name_')
+    assert 201 == len(list(sents))
+
+
+def test_excel_messenger_usecols(excel_test_csv_path):
+    messenger = ExcelMessenger(
+        start=1,
+        stop=3,
+        file_path=excel_test_csv_path,
+        recipient_field='email',
+        message='hi _first_name_, how are you'
+    )
+    assert messenger.get_usecols() == ['first_name', 'email']
+    assert list(messenger.data.columns) == ['first_name', 'email']
+
+
+@pytest.mark.parametrize('chunksize', [None, 2])
+def test_excel_messenger_usecols_other_message(
+    excel_test_csv_path, chunksize
+):
+    messenger = ExcelMessenger(
+        start=1,
+        stop=3,
+        file_path=excel_test_csv_path,
+        recipient_field='email',
+        message='hi _first_name_',
+        chunksize=chunksize
+    )
+    template = messenger.get_template('bye _last_name_')
+    assert messenger.get_usecols() == ['last_name', 'email']
+    chunk = next(messenger.iter_chunks())
+    assert messenger.personalize_chunk(template, chunk)[0] == 'bye israel'
+
+
+def test_excel_messenger_usecols_streaming(large_csv_path):
+    messenger = ExcelMessenger(
+        start=1,
+        stop=10,
+        file_path=large_csv_path,
+        recipient_field='email',
+        message='no placeholders',
+        chunksize=4
+    )
+    rows = list(messenger.iter_rows())
+    assert rows[0] == {'email': 'user0@testing.com'}
+
+
+def test_excel_messenger_usecols_without_recipient_field(
+    excel_test_csv_path
+):
+    messenger = ExcelMessenger(
+        start=1,
+        stop=3,
+        file_path=excel_test_csv_path,
+        message='hi _first_name_'
+    )
+    assert messenger.get_usecols() is None
+    assert messenger.data.shape[1] == 3
+
+
+def test_excel_messenger_usecols_recipient_error(excel_test_csv_path_error):
+    with pytest.raises(TypeError, match='Email column not in file'):
+        ExcelMessenger(
+            start=1,
+            stop=3,
+            file_path=excel_test_csv_path_error,
+            recipient_field='email',
+            message='hi _first_name_'
+        )
+
+
+def test_excel_messenger_get_template(excel_test_csv_path):
+    messenger = ExcelMessenger(
+        start=1,
+        stop=3,
+        file_path=excel_test_csv_path,
+        recipient_field='email'
+    )
+    template = messenger.get_template('hi _first_name_ _last_name_')
+    assert template.get_placeholders() == ['first_name', 'last_name']
+
+
+def test_excel_messenger_get_template_error(excel_test_csv_path_error):
+    messenger = ExcelMessenger(
+        start=1,
+        stop=3,
+        file_path=excel_test_csv_path_error,
+        recipient_field='email',
+        chunksize=2
+    )
+    with pytest.raises(TypeError, match='Email column not in file'):
+        messenger.get_template('hi _first_name_')
+
+
+def test_excel_messenger_personalize_chunk(excel_test_csv_path):
+    messenger = ExcelMessenger(
+        start=1,
+        stop=3,
+        file_path=excel_test_csv_path,
+        recipient_field='email'
+    )
+    template = messenger.get_template('hi _first_name_ _last_name_!')
+    computed = messenger.personalize_chunk(template, messenger.data.head(2))
+    assert computed == ['hi ayo israel!', 'hi jacob john!']
+
+
+def test_excel_messenger_render_chunk(
+    excel_test_csv_path, create_manager, sender_manager
+):
+    messenger = ExcelMessenger(
+        start=2,
+        stop=3,
+        file_path=excel_test_csv_path,
+        recipient_field='email'
+    )
+    messenger.set_message_manager(create_manager)
+    messenger.set_sender_manager(sender_manager)
+    template = messenger.get_template('hi _first_name_')
+    chunk = next(messenger.iter_chunks())
+    computed = list(messenger.render_chunk(template, chunk))
+    assert computed == [
+        ('jacob@testing.com', 'hello world hi jacob testing'),
+        ('rita@testing.com', 'hello world hi rita testing'),
+    ]
+
+
+@pytest.mark.parametrize('convert', [False, True])
+def test_excel_messenger_streaming_xlsx(xlsx_path, convert):
+    messenger = ExcelMessenger(
+        start=4,
+        stop=23,
+        file_path=xlsx_path,
+        recipient_field='email',
+        message='hi _first_name_',
+        chunksize=8,
+        convert=convert
+    )
+    rows = list(messenger.iter_rows())
+    assert len(rows) == 20
+    assert rows[0] == {'first_name': 'name0', 'email': 'user0@testing.com'}
+
+
+def test_excel_messenger_engine_error(excel_test_csv_path):
+    with pytest.raises(TypeError, match='Csv engine must be one of'):
+        ExcelMessenger(
+            start=1,
+            stop=3,
+            file_path=excel_test_csv_path,
+            engine='python'
+        )
+
+
+def test_excel_messenger_concurrency_error(excel_test_csv_path):
+    with pytest.raises(TypeError, match='Concurrency must be'):
+        ExcelMessenger(
+            start=1,
+            stop=3,
+            file_path=excel_test_csv_path,
+            concurrency=0
+        )
+
+
+def test_excel_messenger_send_concurrently(
+    large_csv_path, create_manager, stub_server, stub_sendgrid_manager
+):
+    stub_server.fail_for = {'user3@testing.com', 'user17@testing.com'}
+    messenger = ExcelMessenger(
+        start=1,
+        stop=40,
+        file_path=large_csv_path,
+        recipient_field='email',
+        concurrency=5
+    )
+    messenger.set_message_manager(create_manager)
+    messenger.set_sender_manager(stub_sendgrid_manager)
+    computed = list(messenger.send_messages(
+        subject='Testing', message='hi _first_name_'))
+    expected = [index not in (3, 17) for index in range(40)]
+    assert computed == expected
+    assert len(stub_server.requests) == 40
+    assert 1 < stub_server.max_in_flight <= 5
+
+
+def test_excel_messenger_concurrency_not_thread_safe(
+    excel_test_csv_path, sender_manager, monkeypatch
+):
+    messenger = ExcelMessenger(
+        start=1,
+        stop=3,
+        file_path=excel_test_csv_path,
+        concurrency=5
+    )
+    assert messenger.get_concurrency() == 5
+    monkeypatch.setattr(sender_manager, 'is_thread_safe', lambda: False)
+    messenger.set_sender_manager(sender_manager)
+    assert messenger.get_concurrency() == 1
+
+
+def test_async_excel_messenger_send_messages(
+    large_csv_path, create_manager, stub_server, stub_async_sendgrid_manager,
+    monkeypatch
+):
+    get_async_session = stub_async_sendgrid_manager.get_async_session
+    sessions = set()
+    monkeypatch.setattr(
+        stub_async_sendgrid_manager, 'get_async_session',
+        lambda: sessions.add(get_async_session()) or get_async_session())
+    stub_server.fail_for = {'user3@testing.com', 'user17@testing.com'}
+    messenger = AsyncExcelMessenger(
+        start=1,
+        stop=40,
+        file_path=large_csv_path,
+        recipient_field='email',
+        concurrency=5
+    )
+    messenger.set_message_manager(create_manager)
+    messenger.set_sender_manager(stub_async_sendgrid_manager)
+    computed = list(messenger.start_process(
+        subject='Testing', message='hi _first_name_'))
+    expected = [index not in (3, 17) for index in range(40)]
+    assert computed == expected
+    assert len(stub_server.requests) == 40
+    assert 1 < stub_server.max_in_flight <= 5
+    assert len(sessions) == 1
+    assert sessions.pop().closed
+
+
+def test_async_excel_messenger_thread_sender(
+    excel_test_csv_path, create_manager, sender_manager, monkeypatch
+):
+    messenger = AsyncExcelMessenger(
+        start=1,
+        stop=3,
+        file_path=excel_test_csv_path,
+        concurrency=5
+    )
+    messenger.set_message_manager(create_manager)
+    messenger.set_sender_manager(sender_manager)
+    assert messenger.get_concurrency() == 5
+    assert list(messenger.send_messages(
+        subject='Testing', message='hi')) == [True] * 3
+    monkeypatch.setattr(sender_manager, 'is_thread_safe', lambda: False)
+    assert messenger.get_concurrency() == 1
+
+
+def test_async_excel_messenger_native_sender_concurrency(
+    excel_test_csv_path, stub_async_sendgrid_manager, monkeypatch
+):
+    messenger = AsyncExcelMessenger(
+        start=1,
+        stop=3,
+        file_path=excel_test_csv_path,
+        concurrency=5
+    )
+    monkeypatch.setattr(
+        stub_async_sendgrid_manager, 'is_thread_safe', lambda: False)
+    messenger.set_sender_manager(stub_async_sendgrid_manager)
+    assert messenger.get_concurrency() == 5
+
+
+@pytest.mark.parametrize('messenger_class', [
+    ExcelMessenger, AsyncExcelMessenger
+])
+def test_excel_messenger_send_batches(
+    large_csv_path, create_manager, stub_server, messenger_class
+):
+    stub_server.fail_for = {'user17@testing.com'}
+    sender_manager = AsyncSendGridEmailManager(
+        api_key='test_key', sender='test@example.com', batch_size=10)
+    sender_manager.get_post_url = lambda: stub_server.url
+    messenger = messenger_class(
+        start=1,
+        stop=45,
+        file_path=large_csv_path,
+        recipient_field='email',
+        concurrency=2
+    )
+    messenger.set_message_manager(create_manager)
+    messenger.set_sender_manager(sender_manager)
+    computed = list(messenger.start_process(
+        subject='Testing', message='hi _first_name_'))
+    expected = [not 10 <= index < 20 for index in range(45)]
+    assert computed == expected
+    assert len(stub_server.requests) == 5
+    data = min(
+        stub_server.requests,
+        key=lambda data: data['personalizations'][0]['to'][0]['email'])
+    assert len(data['personalizations']) == 10
+    assert data['personalizations'][0] == {
+        'to': [{'email': 'user0@testing.com'}],
+        'substitutions': {'-first_name-': 'name0'}
+    }
+    assert data['content'][0]['value'] == 'hello world hi -first_name- testing'
+
+
+def test_excel_messenger_send_zepto_batches(
+    large_csv_path, create_manager, stub_server
+):
+    stub_server.fail_for = {'user3@testing.com'}
+    sender_manager = ZeptoEmailManager(
+        api_key='test_key', sender='test@example.com', batch_size=10)
+    sender_manager.get_batch_post_url = lambda: stub_server.url + 'batch'
+    messenger = ExcelMessenger(
+        start=1,
+        stop=25,
+        file_path=large_csv_path,
+        recipient_field='email',
+    )
+    messenger.set_message_manager(create_manager)
+    messenger.set_sender_manager(sender_manager)
+    computed = list(messenger.start_process(
+        subject='Testing', message='hi _first_name_'))
+    assert computed == [index >= 10 for index in range(25)]
+    assert stub_server.paths == ['/batch'] * 3
+    data = stub_server.requests[2]
+    assert [to['merge_info'] for to in data['to']] == [
+        {'first_name': f'name{index}'} for index in range(20, 25)]
+    assert data['htmlbody'] == 'hello world hi {{first_name}} testing'
+
+
+def test_excel_messenger_prepares_attachments_once(
+    excel_test_csv_path, create_manager, sender_manager, monkeypatch
+):
+    sent = []
+    monkeypatch.setattr(
+        sender_manager, 'send_message',
+        lambda message, **kwargs: sent.append(kwargs['attachments']) or True)
+    messenger = ExcelMessenger(
+        start=1,
+        stop=3,
+        file_path=excel_test_csv_path,
+    )
+    messenger.set_message_manager(create_manager)
+    messenger.set_sender_manager(sender_manager)
+    attachments = [
+        {'filename': 'a.txt', 'data': b'a', 'mime_type': 'text/plain'}]
+    computed = list(messenger.start_process(
+        subject='Testing', message='hi', attachments=attachments))
+    assert computed == [True] * 3
+    assert sent[0] is sent[1] is sent[2]
+    assert sent[0][0].get_content() == 'YQ=='
+
+
+@pytest.mark.parametrize('message,transactions', [
+    ('hello', 3), ('hello _first_name_', 9)
+])
+def test_excel_messenger_smtp_fanout(
+    large_csv_path, create_manager, smtp_server, message, transactions
+):
+    smtp_server.refuse = {'user5@testing.com'}
+    sender_manager = SmtpEmailManager(
+        host='127.0.0.1',
+        port=smtp_server.port,
+        username='user',
+        password='password',
+        sender='test@example.com',
+        use_tls=False,
+        max_recipients=4,
+    )
+    messenger = ExcelMessenger(
+        start=1,
+        stop=10,
+        file_path=large_csv_path,
+        recipient_field='email',
+    )
+    messenger.set_message_manager(create_manager)
+    messenger.set_sender_manager(sender_manager)
+    computed = list(messenger.start_process(subject='Testing', message=message))
+    assert computed == [index != 5 for index in range(10)]
+    assert len(smtp_server.messages) == transactions
+
+
+def test_async_excel_messenger_smtp(
+    large_csv_path, create_manager, smtp_server, async_smtp_manager
+):
+    smtp_server.extensions.append('PIPELINING')
+    smtp_server.refuse = {'user5@testing.com'}
+    smtp_server.delay = 0.05
+    messenger = AsyncExcelMessenger(
+        start=1,
+        stop=20,
+        file_path=large_csv_path,
+        recipient_field='email',
+        concurrency=10
+    )
+    messenger.set_message_manager(create_manager)
+    messenger.set_sender_manager(async_smtp_manager)
+    computed = list(messenger.start_process(
+        subject='Testing', message='hi _first_name_'))
+    assert computed == [index != 5 for index in range(20)]
+    assert len(smtp_server.messages) == 19
+    assert smtp_server.max_in_session == 3
+    assert smtp_server.commands.count('QUIT') == 3
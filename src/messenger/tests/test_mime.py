@@ -0,0 +1,63 @@
+import os
+import smtplib
+
+import pytest
+from messenger.attachments import prepare_attachments
+from messenger.mime import MimeTemplate, create_message
+
+
+@pytest.fixture
+def attachments():
+    return prepare_attachments([
+        {'filename': 'report.pdf', 'data': os.urandom(3000)}])
+
+
+def serialize(template, recipient, text, html, attachments, subject):
+    message = create_message(
+        subject, 'test@example.com', recipient, text, html=html,
+        attachments=attachments)
+    message.set_boundary(template._MimeTemplate__boundary)
+    return smtplib._fix_eols(message.as_string()).encode('ascii')
+
+
+@pytest.mark.parametrize('subject', ['hello', 'héllo wörld ' * 10])
+@pytest.mark.parametrize('text', [
+    'hi\nthere\r\nyou', 'héllo\n', '.dot\n.', '<p>hi</p>'])
+@pytest.mark.parametrize('html', ['same', None, '<b>é</b>'])
+def test_mime_template_render(subject, text, html, attachments):
+    if html == 'same':
+        html = text
+    template = MimeTemplate(
+        subject, 'test@example.com', html=html is not None,
+        attachments=attachments)
+    computed = template.render('me@example.com', text, html)
+    expected = serialize(
+        template, 'me@example.com', text, html, attachments, subject)
+    assert computed == expected
+
+
+def test_mime_template_fallback(attachments):
+    template = MimeTemplate(
+        'hello', 'test@example.com', attachments=attachments)
+    recipient = 'a' * 100 + '@example.com'
+    assert not template.can_render(recipient, 'hi', 'hi')
+    computed = template.render(recipient, 'hi', 'hi')
+    assert computed.startswith(b'Content-Type: multipart/alternative')
+    assert b'\r\nTo: ' + recipient.encode() in computed
+    assert not template.can_render('me@example.com', 'hi', None)
+
+
+def test_smtp_manager_sends_from_template(
+    smtp_server, smtp_manager, attachments
+):
+    for index in range(2):
+        assert smtp_manager.send(
+            recipient=f'user{index}@example.com', subject='hi',
+            message='hello', attachments=attachments)
+    template = smtp_manager.get_mime_template('hi', attachments)
+    assert smtp_manager.get_mime_template('hi', attachments) is template
+    assert smtp_manager.get_mime_template('other', attachments) is not template
+    mail_from, recipients, data = smtp_server.messages[1]
+    assert recipients == ['user1@example.com']
+    expected = template.render('user1@example.com', 'hello', 'hello')
+    assert data == expected
@@ -0,0 +1,258 @@
+import sys
+from pathlib import Path
+from typing import Type
+
+import numpy as np
+import pandas as pd
+import pytest
+from messenger.readers import (CsvReader, JsonLinesReader, ParquetReader,
+                               RowIndex, XlsxReader, delete_artifacts)
+
+T = Type[Path]
+
+
+@pytest.fixture
+def quoted_csv_path(tmp_path):
+    path: T = tmp_path / 'quoted.csv'
+    path.write_bytes(
+        b'first_name,email,note\r\n'
+        b'ayo,ayo@testing.com,"multi\r\nline"\r\n'
+        b'\r\n'
+        b'jacob,jacob@testing.com,"say ""hi"", bye"\r\n'
+        b'rita,rita@testing.com,\r\n'
+        b'damian,damian@testing.com,plain'
+    )
+    return path
+
+
+def test_row_index_len(quoted_csv_path):
+    assert len(RowIndex(quoted_csv_path)) == 4
+
+
+def test_row_index_stored_next_to_file(quoted_csv_path):
+    row_index = RowIndex(quoted_csv_path)
+    assert row_index.is_stale()
+    row_index.load()
+    assert row_index.get_index_path().exists()
+    assert not row_index.is_stale()
+    row_index.delete()
+    assert not row_index.get_index_path().exists()
+
+
+def test_row_index_read_rows(quoted_csv_path):
+    row_index = RowIndex(quoted_csv_path)
+    assert row_index.read_header() == b'first_name,email,note\r\n'
+    assert row_index.read_rows(2, 3) == (
+        b'rita,rita@testing.com,\r\n'
+        b'damian,damian@testing.com,plain'
+    )
+
+
+@pytest.mark.parametrize(
+    'chunksize, start, stop',
+    [(1, 0, 3), (2, 1, 3), (10, 0, 3), (3, 3, 3)]
+)
+def test_csv_reader_index_chunks(quoted_csv_path, chunksize, start, stop):
+    expected = pd.read_csv(quoted_csv_path, dtype=str).loc[start:stop]
+    chunks = CsvReader(quoted_csv_path).iter_chunks(chunksize, start, stop)
+    pd.testing.assert_frame_equal(pd.concat(list(chunks)), expected)
+
+
+def test_csv_reader_count_rows_limit(quoted_csv_path):
+    reader = CsvReader(quoted_csv_path)
+    assert reader.count_rows() == 4
+    assert reader.count_rows(limit=2) == 2
+
+
+@pytest.mark.parametrize('content', [
+    # Lines of spaces and tabs are blank lines
+    b'first_name,email\n  \nayo,ayo@testing.com\n\t\r\n \n'
+    b'jacob,jacob@testing.com\n" ",\nrita,rita@testing.com\n   ',
+    # Lone CR line endings
+    b'first_name,email\rayo,ayo@testing.com\r\rjacob,jacob@testing.com\r'
+    b'" ",\rrita,rita@testing.com\r',
+    # Mixed line endings, a CR inside quotes is not a row end
+    b'first_name,email\r\nayo,ayo@testing.com\r\r\n'
+    b'jacob,"jacob\r@testing.com"\n" ",\rrita,rita@testing.com',
+])
+@pytest.mark.parametrize('chunksize', [1, 2, 10])
+def test_csv_reader_index_blank_lines(tmp_path, content, chunksize):
+    path: T = tmp_path / 'blank.csv'
+    path.write_bytes(content)
+    expected = pd.read_csv(path, dtype=str)
+    reader = CsvReader(path)
+    assert reader.count_rows() == len(expected) == 4
+    chunks = reader.iter_chunks(chunksize, 1, 3)
+    pd.testing.assert_frame_equal(
+        pd.concat(list(chunks)), expected.loc[1:3])
+
+
+@pytest.mark.parametrize('note', [
+    # A quote inside an unquoted field is text
+    b'5" screen',
+    # So is a quote after a closed quoted field
+    b'"big" 5" screen',
+])
+def test_csv_reader_stray_quotes(tmp_path, note):
+    path: T = tmp_path / 'stray.csv'
+    rows = [b'first_name,email,note'] + [
+        b'user%d,user%d@testing.com,%s' % (
+            index, index, note if index == 2 else b'"a, ""b"""')
+        for index in range(10)
+    ]
+    path.write_bytes(b'\n'.join(rows) + b'\n')
+    expected = pd.read_csv(path, dtype=str)
+    assert len(expected) == 10
+    assert not RowIndex(path).is_indexable()
+    reader = CsvReader(path)
+    assert reader.count_rows() == 10
+    chunks = list(reader.iter_chunks(100, 1, 2))
+    pd.testing.assert_frame_equal(pd.concat(chunks), expected.loc[1:2])
+
+
+def test_row_index_escaped_quotes_across_blocks(tmp_path, monkeypatch):
+    monkeypatch.setattr(RowIndex, 'block_size', 3)
+    path: T = tmp_path / 'escaped.csv'
+    path.write_bytes(b'a,b\n1,"x ""y""\nz"\n"2",""\n')
+    assert RowIndex(path).is_indexable()
+    expected = pd.read_csv(path, dtype=str)
+    pd.testing.assert_frame_equal(
+        pd.concat(list(CsvReader(path).iter_chunks(1, 0, 1))), expected)
+
+
+def test_row_index_blank_lines_across_blocks(tmp_path, monkeypatch):
+    monkeypatch.setattr(RowIndex, 'block_size', 4)
+    path: T = tmp_path / 'blocks.csv'
+    path.write_bytes(b'a,b\r\r\n1,2\r    \r\n\t\r3,"4\r\n"\r\r5,6\r')
+    expected = pd.read_csv(path, dtype=str)
+    pd.testing.assert_frame_equal(
+        pd.concat(list(CsvReader(path).iter_chunks(1, 0, 2))), expected)
+
+
+@pytest.mark.parametrize('convert', [False, True])
+@pytest.mark.parametrize(
+    'chunksize, start, stop', [(1, 0, 22), (5, 1, 20), (50, 22, 22)]
+)
+def test_xlsx_reader_chunks(xlsx_path, convert, chunksize, start, stop):
+    expected = pd.read_excel(xlsx_path, dtype=str).loc[start:stop]
+    reader = XlsxReader(xlsx_path, convert=convert)
+    chunks = list(reader.iter_chunks(chunksize, start, stop))
+    assert max(len(chunk) for chunk in chunks) <= chunksize
+    pd.testing.assert_frame_equal(pd.concat(chunks), expected)
+
+
+@pytest.mark.parametrize('convert', [False, True])
+def test_xlsx_reader_count_rows(xlsx_path, convert):
+    reader = XlsxReader(xlsx_path, convert=convert)
+    assert reader.count_rows() == 23
+    assert reader.count_rows(limit=3) == 3
+
+
+def test_xlsx_reader_usecols(xlsx_path):
+    reader = XlsxReader(xlsx_path, usecols=['email'])
+    chunk = next(reader.iter_chunks(2, 0, 1))
+    assert chunk.to_dict('list') == {
+        'email': ['ayo@testing.com', np.nan]}
+
+
+def test_delete_artifacts(xlsx_path):
+    reader = XlsxReader(xlsx_path, convert=True)
+    reader.count_rows()
+    converted_path = reader.get_converted_path()
+    assert converted_path.exists()
+    delete_artifacts(xlsx_path)
+    assert not converted_path.exists()
+    assert not RowIndex(converted_path).get_index_path().exists()
+
+
+@pytest.mark.parametrize('usecols', [None, ['note', 'first_name']])
+def test_csv_reader_pyarrow_engine(quoted_csv_path, usecols):
+    expected = CsvReader(quoted_csv_path, usecols=usecols).read()
+    reader = CsvReader(quoted_csv_path, usecols=usecols, engine='pyarrow')
+    pd.testing.assert_frame_equal(reader.read(), expected)
+    chunks = reader.iter_chunks(3, 0, 3)
+    pd.testing.assert_frame_equal(pd.concat(list(chunks)), expected)
+
+
+def test_csv_reader_engine_fallback(quoted_csv_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, 'pyarrow', None)
+    reader = CsvReader(quoted_csv_path, engine='pyarrow')
+    assert reader.get_engine() == 'c'
+
+
+def test_csv_reader_engine_error(quoted_csv_path):
+    with pytest.raises(TypeError, match='Csv engine must be one of'):
+        CsvReader(quoted_csv_path, engine='python').get_engine()
+
+
+@pytest.fixture
+def receivers_frame():
+    return pd.DataFrame({
+        'name': [f'name{index}' for index in range(30)],
+        'email': [f'user{index}@testing.com' for index in range(30)],
+        'age': pd.array(
+            [index if index % 3 else None for index in range(30)],
+            dtype='Int64'),
+    })
+
+
+@pytest.mark.parametrize('ext', ['bz2', 'xz', 'zst'])
+def test_csv_reader_compressed(tmp_path, receivers_frame, ext):
+    if ext == 'zst':
+        pytest.importorskip('zstandard')
+    path = tmp_path / f'receivers.csv.{ext}'
+    receivers_frame.to_csv(path, index=False)
+    expected = pd.read_csv(path, dtype=str)
+    reader = CsvReader(path, usecols=['email'])
+    assert reader.get_row_index() is None
+    assert reader.count_rows() == 30
+    chunks = list(reader.iter_chunks(7, 3, 25))
+    pd.testing.assert_frame_equal(
+        pd.concat(chunks), expected.loc[3:25, ['email']])
+
+
+def test_json_lines_reader(tmp_path, receivers_frame):
+    path = tmp_path / 'receivers.jsonl'
+    with path.open(mode='w') as f:
+        f.write(receivers_frame.head(2).to_json(orient='records', lines=True))
+        f.write('\n\n{"name": "rita", "email": "r@testing.com", "age": 1.5}\n')
+    reader = JsonLinesReader(path)
+    assert reader.read_columns() == ['name', 'email', 'age']
+    assert reader.count_rows() == 3
+    expected = pd.DataFrame({
+        'name': ['name0', 'name1', 'rita'],
+        'email': ['user0@testing.com', 'user1@testing.com', 'r@testing.com'],
+        'age': [np.nan, '1', '1.5'],
+    })
+    pd.testing.assert_frame_equal(reader.read(), expected)
+    chunks = list(
+        JsonLinesReader(path, usecols=['email']).iter_chunks(1, 1, 2))
+    assert [chunk.index[0] for chunk in chunks] == [1, 2]
+    assert list(chunks[1].columns) == ['email']
+
+
+@pytest.mark.parametrize(
+    'chunksize, start, stop', [(4, 0, 29), (7, 5, 22), (50, 29, 29)]
+)
+def test_parquet_reader(tmp_path, receivers_frame, chunksize, start, stop):
+    path = tmp_path / 'receivers.parquet'
+    receivers_frame.to_parquet(path, index=False, row_group_size=6)
+    reader = ParquetReader(path, usecols=['name', 'age'])
+    assert reader.read_columns() == ['name', 'email', 'age']
+    assert reader.count_rows() == 30
+    chunks = list(reader.iter_chunks(chunksize, start, stop))
+    assert max(len(chunk) for chunk in chunks) <= chunksize
+    data = pd.concat(chunks)
+    assert list(data.index) == list(range(start, stop + 1))
+    assert data.loc[start, 'name'] == f'name{start}'
+    assert data.loc[stop, 'name'] == f'name{stop}'
+    assert list(data.columns) == ['name', 'age']
+    pd.testing.assert_frame_equal(reader.read().loc[start:stop], data)
+
+
+def test_parquet_reader_values(tmp_path, receivers_frame):
+    path = tmp_path / 'receivers.parquet'
+    receivers_frame.to_parquet(path, index=False)
+    data = ParquetReader(path).read()
+    expected = pd.Series([np.nan, '1', '2'], name='age')
+    pd.testing.assert_series_equal(data.loc[:2, 'age'], expected)
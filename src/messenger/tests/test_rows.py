@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+from messenger.rows import Rows
+
+
+@pytest.fixture
+def rows():
+    data = pd.DataFrame(
+        {
+            'name': ['ayo', 'jacob', np.nan],
+            'email': ['a@t.com', 'j@t.com', 'r@t.com'],
+        },
+        index=[5, 6, 7],
+    )
+    return Rows(data)
+
+
+def test_rows_get(rows):
+    assert rows.get(6) == {'name': 'jacob', 'email': 'j@t.com'}
+
+
+def test_rows_get_missing(rows):
+    with pytest.raises(KeyError):
+        rows.get(0)
+
+
+def test_rows_iter(rows):
+    computed = list(rows)
+    assert len(rows) == 3
+    assert computed[0] == {'name': 'ayo', 'email': 'a@t.com'}
+    assert np.isnan(computed[2]['name'])
+
+
+def test_rows_match_loc(excel_test_csv_path):
+    data = pd.read_csv(excel_test_csv_path, dtype=str)
+    expected = [data.loc[index].to_dict() for index in data.index]
+    assert list(Rows(data)) == expected
@@ -0,0 +1,97 @@
+import pandas as pd
+import pytest
+from messenger.messager import ExcelMessenger
+from messenger.messsage_manager import HtmlMessageManager
+from messenger.segments import (
+    GSM_7, UCS_2, SegmentReport, count_segments, plan_segments,
+    transliterate
+)
+
+
+@pytest.mark.parametrize('message, encoding, length, segments', [
+    ('', GSM_7, 0, 1),
+    ('hello', GSM_7, 5, 1),
+    ('a' * 160, GSM_7, 160, 1),
+    ('a' * 161, GSM_7, 161, 2),
+    ('a' * 307, GSM_7, 307, 3),
+    # Extension characters take two septets
+    ('€' * 80, GSM_7, 160, 1),
+    ('[' * 81, GSM_7, 162, 2),
+    ('é ñ Ü', GSM_7, 5, 1),
+    ('Zoë', UCS_2, 3, 1),
+    ('ë' * 70, UCS_2, 70, 1),
+    ('ë' * 71, UCS_2, 71, 2),
+    # Emojis take two code units
+    ('😀' * 35, UCS_2, 70, 1),
+    ('😀' * 36, UCS_2, 72, 2),
+])
+def test_plan_segments(message, encoding, length, segments):
+    plan = plan_segments(pd.Series([message]))
+    assert plan.to_dict('records') == [
+        {'encoding': encoding, 'length': length, 'segments': segments}]
+    assert count_segments(message) == (encoding, segments)
+
+
+def test_plan_segments_index():
+    messages = pd.Series(['hi', 'hï'], index=[5, 9])
+    plan = plan_segments(messages)
+    assert plan.index.tolist() == [5, 9]
+    assert plan['encoding'].tolist() == [GSM_7, UCS_2]
+
+
+def test_transliterate():
+    messages = pd.Series([
+        '“Hello” – it’s Zoë…', 'Łódź café', 'hi 😀'])
+    assert transliterate(messages).tolist() == [
+        '"Hello" - it\'s Zoe...', 'Lodz café', 'hi 😀']
+    plan = plan_segments(messages, transliterated=True)
+    assert plan['encoding'].tolist() == [GSM_7, GSM_7, UCS_2]
+
+
+def test_segment_report():
+    report = SegmentReport(rate=2)
+    report.add(plan_segments(pd.Series(['hi', 'a' * 200])))
+    report.add(plan_segments(pd.Series(['Zoë'])))
+    assert report.get_rows() == 3
+    assert report.get_total_segments() == 4
+    assert report.get_ucs2_rows() == 1
+    assert report.get_duration() == 2
+    assert str(report) == (
+        '3 messages, 4 segments, 1 sent as UCS-2, about 2 seconds to send')
+    assert SegmentReport().get_duration() is None
+
+
+@pytest.fixture
+def sms_csv_path(tmp_path):
+    path = tmp_path / 'phones.csv'
+    path.write_text(
+        'first_name,phone\n'
+        'Ana,+15550000000\n'
+        'Zoë,+15550000001\n'
+        'Bob 😀,+15550000002\n',
+        encoding='utf-8',
+    )
+    return path
+
+
+def test_excel_messenger_plan_segments(sms_csv_path):
+    messenger = ExcelMessenger(
+        start=1,
+        stop=3,
+        file_path=sms_csv_path,
+        recipient_field='phone',
+    )
+    messenger.set_message_manager(HtmlMessageManager(
+        template_name='mailer/sms_templates/template1.html',
+        context={'subject': 'Hello'},
+    ))
+    message = 'Hi _first_name_, ' + 'x' * 130
+    report = messenger.plan_segments(message, rate=1)
+    # Segments of each row are 1, 3 and 3
+    assert report.get_rows() == 3
+    assert report.get_total_segments() == 7
+    assert report.get_ucs2_rows() == 2
+    assert report.get_duration() == 7
+    transliterated = messenger.plan_segments(message, transliterated=True)
+    assert transliterated.get_total_segments() == 5
+    assert transliterated.get_ucs2_rows() == 1
@@ -0,0 +1,216 @@
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+from messenger import sms_manager as sms
+from messenger.messager import AsyncExcelMessenger
+from messenger.sms_manager import (
+    AsyncSmsManager, RateLimiter, SmsManager, get_client, get_rate_limiter
+)
+from twilio.base.exceptions import TwilioRestException
+from twilio.http import AsyncHttpClient
+from twilio.http.response import Response
+
+
+class StubTwilioHttpClient(AsyncHttpClient):
+    """
+    Answers message creation like twilio after `delay` seconds,
+    failing for the numbers in `fail_for`
+    """
+
+    instances = []
+    delay = 0.05
+    fail_for = set()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(None, is_async=True)
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.closed = False
+        self.instances.append(self)
+
+    async def request(self, method, uri, params=None, data=None, **kwargs):
+        self.requests.append((time.monotonic(), data))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        if data['To'] in self.fail_for:
+            return Response(400, json.dumps(
+                {'code': 21211, 'message': 'Invalid To number'}))
+        return Response(201, json.dumps({
+            'sid': 'SM' + data['To'][1:], 'to': data['To'],
+            'from': data['From'], 'body': data['Body'], 'status': 'queued',
+        }))
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def stub_twilio(monkeypatch):
+    monkeypatch.setattr(StubTwilioHttpClient, 'instances', [])
+    monkeypatch.setattr(StubTwilioHttpClient, 'fail_for', set())
+    monkeypatch.setattr(sms, 'AsyncTwilioHttpClient', StubTwilioHttpClient)
+    return StubTwilioHttpClient
+
+
+def create_async_sms_manager(**kwargs) -> AsyncSmsManager:
+    return AsyncSmsManager(
+        sid='ACtest', token='token', sender='+15550000000', **kwargs)
+
+
+def test_get_client_shared_by_sid():
+    client = get_client('ACtest', 'token')
+    assert get_client('ACtest', 'token') is client
+    assert get_client('ACother', 'token') is not client
+    manager = SmsManager(sid='ACtest', token='token', sender='+15550000000')
+    assert manager.client is client
+
+
+def test_get_rate_limiter_shared_by_number():
+    limiter = get_rate_limiter('+15550000000', 2)
+    assert get_rate_limiter('+15550000000', 2) is limiter
+    assert get_rate_limiter('+15550000001', 2) is not limiter
+    assert limiter.get_rate() == 2
+
+
+def test_rate_limiter_reserve(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(sms.time, 'monotonic', lambda: now[0])
+    limiter = RateLimiter(4)
+    assert [limiter.reserve() for _ in range(3)] == [0, 0.25, 0.5]
+    now[0] += 1
+    assert limiter.reserve() == 0
+
+
+def test_rate_limiter_no_limit():
+    limiter = RateLimiter(0)
+    assert [limiter.reserve() for _ in range(3)] == [0, 0, 0]
+
+
+def test_async_sms_manager_send(stub_twilio):
+    manager = create_async_sms_manager(concurrency=5, rate=0)
+
+    async def send():
+        try:
+            return await asyncio.gather(*(
+                manager.send_message_async(
+                    message='hello', recipient=f'+1555000{index:04d}')
+                for index in range(20)
+            ))
+        finally:
+            await manager.close_async()
+
+    assert asyncio.run(send()) == [True] * 20
+    client, = stub_twilio.instances
+    assert len(client.requests) == 20
+    assert client.max_in_flight == 5
+    assert client.closed
+    sent_at, data = client.requests[0]
+    assert data == {
+        'To': '+15550000000', 'From': '+15550000000', 'Body': 'hello'}
+
+
+def test_async_sms_manager_send_failure(stub_twilio):
+    stub_twilio.fail_for = {'+15550000001'}
+    manager = create_async_sms_manager(rate=0)
+
+    async def send(fail):
+        try:
+            return await manager.send_message_async(
+                message='hello', recipient='+15550000001', fail=fail)
+        finally:
+            await manager.close_async()
+
+    assert asyncio.run(send(True)) is False
+    with pytest.raises(TwilioRestException):
+        asyncio.run(send(False))
+
+
+def test_async_sms_manager_rate_limit(stub_twilio, monkeypatch):
+    stub_twilio.delay = 0
+    # The limiter's clock stands still so each send is spaced out by
+    # its reserved slot alone, the test does not depend on how fast
+    # it runs
+    monkeypatch.setattr(
+        sms, 'time', SimpleNamespace(monotonic=lambda: 100.0))
+    manager = create_async_sms_manager(rate=20)
+    manager.limiter = RateLimiter(20)
+    reserve = manager.limiter.reserve
+    delays = []
+
+    def recorded_reserve(weight=1):
+        delays.append(reserve(weight))
+        return delays[-1]
+
+    monkeypatch.setattr(manager.limiter, 'reserve', recorded_reserve)
+
+    async def send():
+        try:
+            await asyncio.gather(*(
+                manager.send_async(
+                    message='hello', recipient=f'+1555000{index:04d}')
+                for index in range(5)
+            ))
+        finally:
+            await manager.close_async()
+
+    asyncio.run(send())
+    assert delays == pytest.approx([0, 0.05, 0.1, 0.15, 0.2])
+    assert len(stub_twilio.instances[0].requests) == 5
+
+
+def test_async_excel_messenger_sms(large_csv_path, create_manager, stub_twilio):
+    manager = create_async_sms_manager(concurrency=4, rate=0)
+    messenger = AsyncExcelMessenger(
+        start=1,
+        stop=10,
+        file_path=large_csv_path,
+        recipient_field='email',
+        concurrency=10
+    )
+    messenger.set_message_manager(create_manager)
+    messenger.set_sender_manager(manager)
+    computed = list(messenger.start_process(
+        subject='Testing', message='hi _first_name_'))
+    assert computed == [True] * 10
+    client, = stub_twilio.instances
+    assert client.max_in_flight == 4
+    assert client.closed
+
+
+def test_rate_limiter_weight(monkeypatch):
+    monkeypatch.setattr(sms.time, 'monotonic', lambda: 100.0)
+    limiter = RateLimiter(2)
+    assert limiter.reserve(3) == 0
+    assert limiter.reserve() == 1.5
+
+
+def test_async_sms_manager_transliterates(stub_twilio):
+    manager = create_async_sms_manager(rate=0, transliterated=True)
+    assert manager.prepare_message('Zoë – ' + 'x' * 100) == (
+        'Zoe - ' + 'x' * 100, 1)
+
+    async def send():
+        try:
+            await manager.send_async(
+                message='“hi” Zoë', recipient='+15550000001')
+        finally:
+            await manager.close_async()
+
+    asyncio.run(send())
+    sent_at, data = stub_twilio.instances[0].requests[0]
+    assert data['Body'] == '"hi" Zoe'
+
+
+def test_sms_manager_prepare_message():
+    manager = SmsManager(
+        sid='ACtest', token='token', sender='+15550000000', rate=0,
+        transliterated=False)
+    assert manager.prepare_message('Zoë ' + 'x' * 70) == ('Zoë ' + 'x' * 70, 2)
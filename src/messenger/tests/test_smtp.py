@@ -0,0 +1,206 @@
+import smtplib
+import threading
+import time
+
+import pytest
+from messenger.smtp import SmtpConnectionPool, get_pool
+
+
+@pytest.fixture
+def pool(smtp_server):
+    pool = SmtpConnectionPool(
+        '127.0.0.1', smtp_server.port, 'user', 'password',
+        size=2, use_tls=False
+    )
+    yield pool
+    pool.close()
+
+
+def test_pool_reuses_connections(smtp_server, pool):
+    for index in range(3):
+        with pool.connection() as connection:
+            connection.send(
+                subject='hi', recipient=f'user{index}@example.com',
+                text='hello', sender='test@example.com')
+    assert smtp_server.connections == 1
+    assert len(smtp_server.messages) == 3
+    assert smtp_server.messages[0][1] == ['user0@example.com']
+
+
+def test_pool_limits_checked_out_connections(smtp_server, pool):
+    first = pool.acquire()
+    second = pool.acquire()
+    acquired = []
+    thread = threading.Thread(target=lambda: acquired.append(pool.acquire()))
+    thread.start()
+    thread.join(0.2)
+    assert acquired == []
+    pool.release(first)
+    thread.join(1)
+    assert acquired == [first]
+    pool.release(second)
+    pool.release(acquired[0])
+    assert smtp_server.connections == 2
+
+
+def test_pool_discards_dropped_connections(smtp_server, pool):
+    with pytest.raises(OSError):
+        with pool.connection() as connection:
+            raise OSError('dropped')
+    assert connection.connection is None
+    with pool.connection() as other:
+        assert other is not connection
+    assert smtp_server.connections == 2
+
+
+def test_get_pool_keyed_by_account(smtp_server):
+    pool = get_pool('127.0.0.1', smtp_server.port, 'user', 'password', 2,
+                    use_tls=False)
+    assert get_pool('127.0.0.1', smtp_server.port, 'user', 'password', 2,
+                    use_tls=False) is pool
+    assert get_pool('127.0.0.1', smtp_server.port, 'other', 'password', 2,
+                    use_tls=False) is not pool
+
+
+def test_get_pool_retires_replaced_pool(smtp_server):
+    pool = get_pool('127.0.0.1', smtp_server.port, 'user', 'password', 2,
+                    use_tls=False)
+    idle = pool.acquire()
+    busy = pool.acquire()
+    pool.release(idle)
+    replaced = get_pool('127.0.0.1', smtp_server.port, 'user', 'password', 3,
+                        use_tls=False)
+    assert replaced is not pool
+    assert pool.retired
+    assert idle.connection is None
+    # A session given back to the retired pool is quit, not kept idle
+    pool.release(busy)
+    assert busy.connection is None
+    assert pool.idle.empty()
+    assert smtp_server.commands.count('QUIT') == 2
+
+
+def test_smtp_manager_sends_in_parallel(smtp_server, smtp_manager):
+    smtp_server.delay = 0.05
+    results = []
+
+    def send(index):
+        results.append(smtp_manager.send(
+            recipient=f'user{index}@example.com', subject='hi',
+            message='hello'))
+
+    threads = [
+        threading.Thread(target=send, args=(index,)) for index in range(9)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [True] * 9
+    assert len(smtp_server.messages) == 9
+    assert 1 < smtp_server.max_in_session <= 3
+    assert smtp_manager.is_thread_safe()
+
+
+def send(target, index):
+    return target.send(
+        subject='hi', recipient=f'user{index}@example.com',
+        text='hello', sender='test@example.com')
+
+
+def test_pool_resends_after_server_drops_session(smtp_server, pool):
+    smtp_server.max_messages = 2
+    assert [send(pool, index) for index in range(5)] == [True] * 5
+    assert len(smtp_server.messages) == 5
+    assert smtp_server.connections == 3
+
+
+def test_pool_recycles_after_max_messages(smtp_server):
+    smtp_server.max_messages = 2
+    pool = SmtpConnectionPool(
+        '127.0.0.1', smtp_server.port, 'user', 'password',
+        use_tls=False, max_messages=2
+    )
+    assert [send(pool, index) for index in range(5)] == [True] * 5
+    assert smtp_server.connections == 3
+    assert smtp_server.commands.count('QUIT') == 2
+    assert smtp_server.commands.count('MAIL') == 5
+    pool.close()
+
+
+def test_pool_checks_idle_sessions(smtp_server, pool, monkeypatch):
+    monkeypatch.setattr(pool, 'check_after', 0)
+    smtp_server.idle_timeout = 0.1
+    assert send(pool, 0)
+    time.sleep(0.3)
+    assert send(pool, 1)
+    assert smtp_server.commands.count('MAIL') == 2
+    assert smtp_server.connections == 2
+
+
+def test_pool_checks_live_idle_sessions(smtp_server, pool, monkeypatch):
+    monkeypatch.setattr(pool, 'check_after', 0)
+    assert send(pool, 0)
+    assert send(pool, 1)
+    assert smtp_server.commands.count('NOOP') == 1
+    assert smtp_server.connections == 1
+
+
+def test_pool_recycles_idle_sessions(smtp_server):
+    pool = SmtpConnectionPool(
+        '127.0.0.1', smtp_server.port, 'user', 'password',
+        use_tls=False, max_idle=0.1
+    )
+    assert send(pool, 0)
+    time.sleep(0.2)
+    assert send(pool, 1)
+    assert 'NOOP' not in smtp_server.commands
+    assert smtp_server.connections == 2
+    pool.close()
+
+
+def test_pool_does_not_resend_refused_recipients(smtp_server, pool):
+    smtp_server.refuse = {'user0@example.com'}
+    with pytest.raises(smtplib.SMTPRecipientsRefused):
+        send(pool, 0)
+    assert send(pool, 1)
+    assert smtp_server.commands.count('MAIL') == 2
+    assert smtp_server.connections == 1
+
+
+def test_smtp_manager_long_campaign(smtp_server, smtp_manager):
+    smtp_server.max_messages = 3
+    results = [
+        smtp_manager.send(
+            recipient=f'user{index}@example.com', subject='hi',
+            message='hello')
+        for index in range(10)
+    ]
+    assert results == [True] * 10
+
+
+def test_smtp_manager_send_batch(smtp_server, smtp_manager):
+    smtp_server.refuse = {'user1@example.com'}
+    recipients = [f'user{index}@example.com' for index in range(3)]
+    computed = smtp_manager.send_batch(
+        recipients=recipients, subject='hi', message='hello')
+    assert computed == [True, False, True]
+    assert len(smtp_server.messages) == 1
+    mail_from, accepted, data = smtp_server.messages[0]
+    assert accepted == ['user0@example.com', 'user2@example.com']
+    assert b'\r\nTo: undisclosed-recipients:;\r\n' in data
+
+
+def test_smtp_manager_send_batch_all_refused(smtp_server, smtp_manager):
+    smtp_server.refuse = {'user0@example.com', 'user1@example.com'}
+    computed = smtp_manager.send_batch(
+        recipients=['user0@example.com', 'user1@example.com'],
+        subject='hi', message='hello')
+    assert computed == [False, False]
+    assert smtp_server.messages == []
+
+
+def test_smtp_manager_send_batch_substitutions(smtp_manager):
+    with pytest.raises(TypeError, match='substitutions'):
+        smtp_manager.send_batch(
+            recipients=['user0@example.com'], subject='hi',
+            message='hello', substitutions=[{'name': 'user'}])
@@ -0,0 +1,38 @@
+import pytest
+from messenger.template import MessageTemplate
+
+
+def test_template_segments():
+    template = MessageTemplate(
+        'hi _first_name_, _last_ {x}', ['first_name', 'last', 'email'])
+    assert template.get_segments() == [
+        (False, 'hi '), (True, 'first_name'), (False, ', '), (True, 'last'),
+        (False, ' {x}'),
+    ]
+    assert template.get_placeholders() == ['first_name', 'last']
+    assert template.is_personalized()
+
+
+def test_template_longest_column_first():
+    template = MessageTemplate('_first_name_ _first_', ['first', 'first_name'])
+    computed = template.render({'first': 'A', 'first_name': 'B'})
+    assert computed == 'B A'
+
+
+def test_template_render():
+    template = MessageTemplate(
+        '{{ _name_ }} and _name_ owe _amount_', ['name', 'amount'])
+    computed = template.render({'name': 'ayo', 'amount': 1.5})
+    assert computed == '{{ ayo }} and ayo owe 1.5'
+
+
+def test_template_without_placeholders():
+    template = MessageTemplate('hello _world_', ['name'])
+    assert not template.is_personalized()
+    assert template.render() == 'hello _world_'
+
+
+def test_template_render_missing_value():
+    template = MessageTemplate('hi _name_', ['name'])
+    with pytest.raises(KeyError):
+        template.render({'email': 'ayo@testing.com'})
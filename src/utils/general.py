@@ -2,6 +2,8 @@
 
 
 import base64
+import hashlib
+from pathlib import Path
 from typing import Any, Iterable
 
 
@@ -22,3 +24,14 @@ def is_success(code):
 
 def bytes_to_base64_str(data: bytes) -> str:
     return base64.b64encode(data).decode('utf-8')
+
+
+def file_hash(path: Path, block_size: int = 1 << 20) -> str:
+    """
+    Returns the sha256 hex digest of the file content
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
@@ -1,9 +1,10 @@
+import hashlib
 from typing import TypeVar
 from unittest import TestCase
 
 import pytest
 from utils.general import (count_true_in_iter, count_value_in_iter,
-                           filter_value_iter, is_success)
+                           file_hash, filter_value_iter, is_success)
 
 X = TypeVar('X', bound=TestCase)
 
@@ -67,3 +68,11 @@ def test_count_true_in_iter(iter, result):
 def test_is_success(code, expected):
     computed_result = is_success(code)
     assert computed_result == expected
+
+
+def test_file_hash(tmp_path):
+    path = tmp_path / 'file.csv'
+    path.write_bytes(b'email\n')
+    computed = file_hash(path)
+    expected = hashlib.sha256(b'email\n').hexdigest()
+    assert computed == expected